@@ -0,0 +1,3 @@
+from .trajectory import *
+from .route import *
+from .search import *
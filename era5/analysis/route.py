@@ -0,0 +1,306 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+import xarray as xr
+
+import era5
+from era5.util.datetime import datetime_range
+from era5.maths.barometric import isa_pressure
+from era5.maths.bearings import intermediate_coordinates_array, track_bearing_array
+from era5.maths.constants import FEET
+from era5.maths.gcd import great_circle_distance_degrees_array
+from era5.maths.grid import GridInterpolator
+
+
+def ground_speed(u: np.ndarray, v: np.ndarray, sin_bearing: np.ndarray, cos_bearing: np.ndarray,
+                 true_airspeed: np.ndarray) -> np.ndarray:
+    """
+    Solves the wind triangle: the ground speed along a track is the wind along the track plus the part of the true
+    airspeed that is left after crabbing into the wind across the track
+
+    Args:
+        u: the east wind (in m/s)
+        v: the north wind (in m/s)
+        sin_bearing: the sine of the bearing of the track
+        cos_bearing: the cosine of the bearing of the track
+        true_airspeed: the true airspeed (in m/s)
+
+    Returns:
+        the ground speed (in m/s)
+    """
+    along = u * sin_bearing + v * cos_bearing
+    across = u * cos_bearing - v * sin_bearing
+    return along + np.sqrt(np.maximum(true_airspeed ** 2 - across ** 2, 0))
+
+
+class Routes:
+    """
+    A set of flight routes, densified along the great circles between their waypoints into segments of at most
+    max_segment_length, which are sampled at their midpoints.
+
+    The samples of every route are stored in flat arrays (route by route), so the winds of all routes are found with a
+    single interpolation, and the interpolation stencil is kept for every grid the routes are evaluated on.
+    """
+
+    def __init__(self, waypoints: list[np.ndarray], flight_level, max_segment_length: float = 100):
+        """
+        Args:
+            waypoints: the waypoints of each route, each an array of shape (waypoint, 2) of latitudes & longitudes
+                       (in degrees) with at least 2 waypoints
+            flight_level: the flight level (in hundreds of feet) of each route, or of all routes
+            max_segment_length: the maximum length of the densified segments (in kilometers)
+        """
+        waypoints = [np.asarray(route, dtype="float64").reshape(-1, 2) for route in waypoints]
+        if any(len(route) < 2 for route in waypoints):
+            raise ValueError("Every route needs at least 2 waypoints")
+
+        self._n_routes = len(waypoints)
+        start = np.concatenate([route[:-1] for route in waypoints])
+        end = np.concatenate([route[1:] for route in waypoints])
+        route_index = np.repeat(np.arange(self._n_routes), [len(route) - 1 for route in waypoints])
+
+        # split each segment into sub-segments of (at most) the maximum length
+        length = great_circle_distance_degrees_array(start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+        n_parts = np.maximum(np.ceil(length / max_segment_length), 1).astype(int)
+
+        segment = np.repeat(np.arange(len(length)), n_parts)
+        part = np.arange(len(segment)) - np.repeat(np.cumsum(n_parts) - n_parts, n_parts)
+
+        start, end = np.radians(start[segment]), np.radians(end[segment])
+        lat, lon = intermediate_coordinates_array(start[:, 0], start[:, 1], end[:, 0], end[:, 1],
+                                                  (part + 0.5) / n_parts[segment])
+        bearing = track_bearing_array(lat, lon, end[:, 0], end[:, 1])
+
+        self._route = route_index[segment]
+        self._starts = np.flatnonzero(np.diff(self._route, prepend=-1))
+        self._length = length[segment] / n_parts[segment]
+        self._latitude = np.degrees(lat)
+        self._longitude = np.mod(np.degrees(lon), 360)
+        self._sin_bearing = np.sin(bearing)
+        self._cos_bearing = np.cos(bearing)
+
+        flight_level = np.broadcast_to(np.asarray(flight_level, dtype="float64"), (self._n_routes,))
+        self._pressure = isa_pressure(flight_level[self._route] * 100 * FEET) / 100  # hPa
+
+        self._interpolators: dict[tuple, GridInterpolator] = {}
+
+    def interpolator(self, coordinates: list[np.ndarray], method: str = "linear") -> GridInterpolator:
+        """
+        The (cached) interpolator of a (level, latitude, longitude) grid at the samples of the routes
+        """
+        key = (method, *(tuple(np.asarray(c).tolist()) for c in coordinates))
+        if key not in self._interpolators:
+            self._interpolators[key] = GridInterpolator(coordinates, [self._pressure, self._latitude, self._longitude],
+                                                        method, [None, None, 360.0], [True, False, False])
+        return self._interpolators[key]
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sums values of shape (..., sample) over the samples of each route
+
+        Returns:
+            an array of shape (..., route)
+        """
+        return np.add.reduceat(values, self._starts, axis=-1)
+
+    def performance(self, u: np.ndarray, v: np.ndarray, true_airspeed) -> dict[str, np.ndarray]:
+        """
+        Computes the ground speed, wind component & block time of each route from the wind at its samples
+
+        Args:
+            u: the east wind (in m/s) at each sample, of shape (..., sample)
+            v: the north wind (in m/s) at each sample, of shape (..., sample)
+            true_airspeed: the true airspeed (in m/s) of each route, or of all routes
+
+        Returns:
+            the distance (km), block time (hours), mean ground speed (m/s) & wind component (m/s, positive for
+            tailwinds) of each route, each of shape (..., route)
+        """
+        true_airspeed = np.broadcast_to(np.asarray(true_airspeed, dtype="float64"), (self._n_routes,))
+        tas = true_airspeed[self._route]
+
+        speed = ground_speed(u, v, self._sin_bearing, self._cos_bearing, tas)
+
+        with np.errstate(divide="ignore"):
+            seconds = np.where(speed > 0, self._length * 1000 / speed, np.inf)
+
+        distance = self.sum(self._length)
+        time = self.sum(seconds) / 3600
+        mean_ground_speed = distance * 1000 / (time * 3600)
+
+        return {"distance": np.broadcast_to(distance, time.shape), "time": time, "ground_speed": mean_ground_speed,
+                "wind_component": mean_ground_speed - true_airspeed}
+
+    @property
+    def n_routes(self) -> int:
+        return self._n_routes
+
+    @property
+    def n_samples(self) -> int:
+        return len(self._route)
+
+    @property
+    def latitude(self) -> np.ndarray:
+        return self._latitude
+
+    @property
+    def pressure(self) -> np.ndarray:
+        return self._pressure
+
+    @property
+    def longitude(self) -> np.ndarray:
+        return self._longitude
+
+
+class RouteEvaluator:
+    """
+    Evaluates the winds along many flight routes against a resident timestep of the wind field.
+
+    Examples:
+        .. code-block:: python
+
+            routes = Routes([[(51.47, -0.45), (40.64, -73.78)], [(40.64, -73.78), (51.47, -0.45)]], flight_level=350)
+            evaluator = RouteEvaluator("TAVG-01-01 00:00")
+
+            performance = evaluator.evaluate(routes, true_airspeed=250)
+            performance["time"]
+    """
+
+    def __init__(self, time=None, method: str = "linear", level=None):
+        """
+        Args:
+            time: the datetime of the wind field to load
+            method: the spatial interpolation method, see GridInterpolator
+            level: level index of the wind field (defaults to all levels)
+        """
+        self._method = method
+        self._level = level
+        self._variables = [era5.UWind(), era5.VWind()]
+
+        self._wind = None
+        self._coordinates = None
+        if time is not None:
+            self.load(time)
+
+    def _read(self, time, level) -> tuple[np.ndarray, list[np.ndarray]]:
+        fields = []
+        for variable in self._variables:
+            data = variable[time, level][variable.name].transpose("level", "latitude", "longitude")
+            fields.append(data.values)
+
+        coordinates = [data[dim].values.astype("float64") for dim in ("level", "latitude", "longitude")]
+        return np.stack(fields), coordinates
+
+    def read(self, time) -> np.ndarray:
+        """
+        Reads the (component, level, latitude, longitude) wind at a time
+        """
+        fields, coordinates = self._read(time, self._level)
+        if self._coordinates is None:
+            self._coordinates = coordinates
+        return fields
+
+    def load(self, time) -> None:
+        """
+        Reads the wind at a time, which routes are evaluated against until another time is loaded
+        """
+        self._wind = self.read(time)
+
+    def wind(self, routes: Routes, fields: np.ndarray | None = None) -> np.ndarray:
+        """
+        Interpolates the wind at the samples of the routes
+
+        Args:
+            routes: the routes
+            fields: wind fields of shape (..., component, level, latitude, longitude), defaults to the loaded wind
+
+        Returns:
+            the (u, v) at each sample, of shape (..., component, sample)
+        """
+        return routes.interpolator(self._coordinates, self._method)(self._wind if fields is None else fields)
+
+    def evaluate(self, routes: Routes, true_airspeed) -> xr.Dataset:
+        """
+        Evaluates the routes against the loaded wind
+
+        Args:
+            routes: the routes
+            true_airspeed: the true airspeed (in m/s) of each route, or of all routes
+
+        Returns:
+            the distance (km), block time (hours), mean ground speed (m/s) & wind component (m/s, positive for
+            tailwinds) of each route
+        """
+        u, v = self.wind(routes)
+        performance = routes.performance(u, v, true_airspeed)
+        return xr.Dataset({name: ("route", values) for name, values in performance.items()},
+                          coords={"route": np.arange(routes.n_routes)})
+
+    def sweep(self, routes: Routes, true_airspeed, time: slice | None = None) -> xr.Dataset:
+        """
+        Evaluates the routes departing at every timestep of a time slice in a single pass through the data.
+
+        Only the levels bracketing the flight levels of the routes are read, the next timestep is read while the
+        current one is evaluated, and the interpolation stencil of the samples of the routes is computed once. Each
+        departure is evaluated against the wind at its departure time.
+
+        Args:
+            routes: the routes
+            true_airspeed: the true airspeed (in m/s) of each route, or of all routes
+            time: slice of departure times (defaults to every hour of the TAVG year)
+
+        Returns:
+            the block time (hours) & wind component (m/s, positive for tailwinds) of each route at each departure time,
+            of dimensions (route, departure)
+        """
+        if time is None:
+            time = slice("TAVG-01-01 00:00", "TAVG-12-31 23:00")
+        departures = list(datetime_range(time.start, time.stop, time.step if time.step else timedelta(hours=1)))
+
+        # the first timestep is read in full, to find the levels the routes need
+        fields, coordinates = self._read(departures[0], self._level)
+        levels = coordinates[0]
+        ascending = np.sort(levels)
+
+        # the levels either side of the flight levels, and one more on each side for the cubic methods
+        lower = max(np.searchsorted(ascending, routes.pressure.min(), side="right") - 2, 0)
+        upper = np.searchsorted(ascending, routes.pressure.max(), side="left") + 2
+
+        subset = np.isin(levels, ascending[lower:upper])
+        fields = fields[:, subset]
+        coordinates[0] = levels[subset]
+        level = coordinates[0].tolist()
+
+        interpolator = routes.interpolator(coordinates, self._method)
+        block_time = np.empty((routes.n_routes, len(departures)))
+        wind_component = np.empty((routes.n_routes, len(departures)))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = None
+            for i in range(len(departures)):
+                if i + 1 < len(departures):
+                    future = executor.submit(self._read, departures[i + 1], level)
+
+                u, v = interpolator(fields)
+                performance = routes.performance(u, v, true_airspeed)
+                block_time[:, i] = performance["time"]
+                wind_component[:, i] = performance["wind_component"]
+
+                if i + 1 < len(departures):
+                    fields, _ = future.result()
+
+        dims = ("route", "departure")
+        return xr.Dataset({"time": (dims, block_time), "wind_component": (dims, wind_component)},
+                          coords={"route": np.arange(routes.n_routes), "departure": departures})
+
+    @property
+    def coordinates(self) -> list[np.ndarray]:
+        return self._coordinates
+
+    @property
+    def wind_fields(self) -> np.ndarray:
+        return self._wind
+
+
+__all__ = ["Routes", "RouteEvaluator", "ground_speed"]
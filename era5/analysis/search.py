@@ -0,0 +1,245 @@
+import heapq
+import math
+
+import numpy as np
+import xarray as xr
+
+from era5.maths.barometric import isa_pressure
+from era5.maths.bearings import intermediate_coordinates_array, track_bearing_array
+from era5.maths.constants import FEET
+from era5.maths.gcd import great_circle_distance_degrees_array
+from era5.maths.grid import GridInterpolator
+from .route import RouteEvaluator, Routes, ground_speed
+
+
+class RouteGraph:
+    """
+    Finds minimum-time routes at a flight level with A* search over a latitude/longitude lattice.
+
+    Each node of the lattice is connected to the nodes within `connectivity` rows & columns of it (skipping moves that
+    repeat a shorter move), so tracks are not restricted to the 8 compass directions. The geometry of every edge is
+    computed once; loading a timestep interpolates the wind at the midpoints of all edges at once to give the flight
+    time of every edge, which is then reused for any number of origin-destination pairs. The wind is frozen at the
+    loaded timestep.
+
+    The heuristic is the great circle distance to the destination at the fastest ground speed of any edge, so it never
+    overestimates and A* returns the minimum-time path on the lattice.
+
+    Examples:
+        .. code-block:: python
+
+            graph = RouteGraph(flight_level=350, true_airspeed=250, resolution=1)
+            graph.load("TAVG-01-01 00:00")
+
+            route = graph.solve((51.47, -0.45), (40.64, -73.78))
+            route.attrs["time"], route.attrs["great_circle_time"]
+    """
+
+    def __init__(self, flight_level: float, true_airspeed: float, resolution: float = 2,
+                 latitude_range: tuple[float, float] = (-80, 80), connectivity: int = 2, method: str = "linear",
+                 level=None):
+        """
+        Args:
+            flight_level: the flight level (in hundreds of feet)
+            true_airspeed: the true airspeed (in m/s)
+            resolution: the spacing of the lattice (in degrees)
+            latitude_range: the southern & northern limits of the lattice (in degrees)
+            connectivity: the number of rows & columns each node is connected across
+            method: the spatial interpolation method, see GridInterpolator
+            level: level index of the wind field (defaults to all levels)
+        """
+        self._flight_level = flight_level
+        self._true_airspeed = true_airspeed
+        self._method = method
+        self._evaluator = RouteEvaluator(method=method, level=level)
+
+        latitude = np.arange(latitude_range[0], latitude_range[1] + resolution / 2, resolution)
+        longitude = np.arange(0, 360, resolution)
+        n_lat, n_lon = len(latitude), len(longitude)
+
+        self._latitude = np.repeat(latitude, n_lon)
+        self._longitude = np.tile(longitude, n_lat)
+
+        offsets = np.array([(i, j) for i in range(-connectivity, connectivity + 1)
+                            for j in range(-connectivity, connectivity + 1) if math.gcd(i, j) == 1])
+
+        # the edges of every node, of shape (node, offset)
+        row = np.arange(n_lat).repeat(n_lon)[:, None] + offsets[:, 0]
+        column = np.mod(np.tile(np.arange(n_lon), n_lat)[:, None] + offsets[:, 1], n_lon)
+        self._valid = (row >= 0) & (row < n_lat)
+        self._target = np.where(self._valid, np.clip(row, 0, n_lat - 1) * n_lon + column, 0)
+
+        lat1, lon1 = np.radians(self._latitude)[:, None], np.radians(self._longitude)[:, None]
+        lat2, lon2 = np.radians(self._latitude[self._target]), np.radians(self._longitude[self._target])
+
+        mid_lat, mid_lon = intermediate_coordinates_array(lat1, lon1, lat2, lon2, 0.5)
+        bearing = track_bearing_array(mid_lat, mid_lon, lat2, lon2)
+
+        self._length = great_circle_distance_degrees_array(self._latitude[:, None], self._longitude[:, None],
+                                                           self._latitude[self._target],
+                                                           self._longitude[self._target])
+        self._mid_latitude = np.degrees(mid_lat)
+        self._mid_longitude = np.mod(np.degrees(mid_lon), 360)
+        self._sin_bearing = np.sin(bearing)
+        self._cos_bearing = np.cos(bearing)
+
+        self._interpolator: GridInterpolator | None = None
+        self._cost: np.ndarray | None = None
+        self._max_ground_speed = None
+
+    def load(self, time) -> None:
+        """
+        Loads the wind at a time and computes the flight time of every edge
+        """
+        self._evaluator.load(time)
+
+        if self._interpolator is None:
+            pressure = np.full(self._mid_latitude.shape, isa_pressure(self._flight_level * 100 * FEET) / 100)
+            self._interpolator = GridInterpolator(self._evaluator.coordinates,
+                                                  [pressure, self._mid_latitude, self._mid_longitude], self._method,
+                                                  [None, None, 360.0], [True, False, False])
+
+        u, v = self._interpolator(self._evaluator.wind_fields)
+        speed = ground_speed(u, v, self._sin_bearing, self._cos_bearing, self._true_airspeed)
+        speed = np.where(self._valid & (speed > 0), speed, np.nan)
+
+        with np.errstate(invalid="ignore"):
+            self._cost = np.where(np.isnan(speed), np.inf, self._length * 1000 / speed)
+        self._max_ground_speed = np.nanmax(speed)
+
+    def nearest_node(self, latitude: float, longitude: float) -> int:
+        """
+        The index of the node of the lattice closest to a coordinate (in degrees)
+        """
+        return int(np.argmin(great_circle_distance_degrees_array(latitude, longitude, self._latitude,
+                                                                 self._longitude)))
+
+    def shortest_path(self, origin: int, destination: int) -> tuple[list[int], float]:
+        """
+        Finds the minimum-time path between two nodes with A*
+
+        Returns:
+            the nodes of the path, and its flight time (in seconds)
+        """
+        if self._cost is None:
+            raise RuntimeError("No wind has been loaded")
+
+        heuristic = great_circle_distance_degrees_array(self._latitude, self._longitude, self._latitude[destination],
+                                                        self._longitude[destination]) * 1000 / self._max_ground_speed
+
+        n_nodes = len(self._latitude)
+        cost = np.full(n_nodes, np.inf)
+        previous = np.full(n_nodes, -1)
+        closed = np.zeros(n_nodes, dtype=bool)
+
+        cost[origin] = 0
+        queue = [(heuristic[origin], origin)]
+
+        while queue:
+            _, node = heapq.heappop(queue)
+            if closed[node]:
+                continue
+            if node == destination:
+                break
+            closed[node] = True
+
+            # relax all the edges of the node at once
+            targets = self._target[node]
+            new_cost = cost[node] + self._cost[node]
+            improved = (new_cost < cost[targets]) & ~closed[targets]
+
+            for target, target_cost in zip(targets[improved], new_cost[improved]):
+                cost[target] = target_cost
+                previous[target] = node
+                heapq.heappush(queue, (target_cost + heuristic[target], target))
+
+        if not np.isfinite(cost[destination]):
+            raise ValueError("The destination is not reachable")
+
+        path = [destination]
+        while path[-1] != origin:
+            path.append(previous[path[-1]])
+        return path[::-1], float(cost[destination])
+
+    def _shortcut(self, nodes: list[int]) -> np.ndarray:
+        """
+        Straightens a lattice path by replacing runs of edges with a great circle wherever that is no slower, so the
+        route is not restricted to the directions of the lattice
+
+        Returns:
+            the latitude & longitude of the remaining waypoints, of shape (waypoint, 2)
+        """
+        nodes = np.asarray(nodes)
+        waypoints = np.stack([self._latitude[nodes], self._longitude[nodes]], axis=-1)
+        if len(nodes) < 2:
+            return waypoints
+
+        # the edges are timed with the same sampling as the great circles they are compared with (rather than with the
+        # single midpoint of their cost), so that equally fast routes are not rejected due to sampling differences
+        edges = Routes([waypoints[[k, k + 1]] for k in range(len(nodes) - 1)], self._flight_level)
+        u, v = self._evaluator.wind(edges)
+        elapsed = np.concatenate([[0], np.cumsum(edges.performance(u, v, self._true_airspeed)["time"] * 3600)])
+
+        keep = [0]
+        while keep[-1] < len(nodes) - 1:
+            i = keep[-1]
+            candidates = np.arange(i + 1, len(nodes))
+
+            routes = Routes([waypoints[[i, j]] for j in candidates], self._flight_level)
+            u, v = self._evaluator.wind(routes)
+            seconds = routes.performance(u, v, self._true_airspeed)["time"] * 3600
+
+            faster = np.flatnonzero(seconds <= (elapsed[candidates] - elapsed[i]) * (1 + 1e-9))
+            keep.append(candidates[faster[-1]] if len(faster) else i + 1)
+
+        return waypoints[keep]
+
+    def solve(self, origin: tuple[float, float], destination: tuple[float, float]) -> xr.Dataset:
+        """
+        Finds the minimum-time route between two coordinates, via the lattice nodes nearest them. The lattice path is
+        then straightened where great circles between its nodes are no slower, and the great circle route is returned
+        instead if it is still faster (e.g. when the lattice is coarse compared to the route)
+
+        Args:
+            origin: the latitude & longitude of the origin (in degrees)
+            destination: the latitude & longitude of the destination (in degrees)
+
+        Returns:
+            the latitude & longitude of each waypoint of the route, with the block time (in hours) of the route and of
+            the great circle route as attributes
+        """
+        nodes, _ = self.shortest_path(self.nearest_node(*origin), self.nearest_node(*destination))
+        shortcut = self._shortcut(nodes)
+
+        # the origin & destination are only added if they are not already the first & last nodes
+        start = [origin] if great_circle_distance_degrees_array(*origin, *shortcut[0]) > 1e-3 else []
+        end = [destination] if great_circle_distance_degrees_array(*destination, *shortcut[-1]) > 1e-3 else []
+        waypoints = np.concatenate([np.reshape(start, (-1, 2)), shortcut, np.reshape(end, (-1, 2))])
+        great_circle = np.array([origin, destination], dtype="float64")
+
+        routes = Routes([waypoints, great_circle], self._flight_level)
+        u, v = self._evaluator.wind(routes)
+        time = routes.performance(u, v, self._true_airspeed)["time"]
+
+        if time[1] <= time[0]:
+            waypoints = great_circle
+
+        return xr.Dataset({"latitude": ("waypoint", waypoints[:, 0]), "longitude": ("waypoint", waypoints[:, 1])},
+                          attrs={"time": min(time), "great_circle_time": time[1]})
+
+    def solve_many(self, pairs: list[tuple[tuple[float, float], tuple[float, float]]]) -> list[xr.Dataset]:
+        """
+        Finds the minimum-time routes between many (origin, destination) pairs against the loaded wind
+        """
+        return [self.solve(origin, destination) for origin, destination in pairs]
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self._latitude)
+
+    @property
+    def n_edges(self) -> int:
+        return int(self._valid.sum())
+
+
+__all__ = ["RouteGraph"]
@@ -0,0 +1,165 @@
+import math
+from datetime import timedelta
+
+import numpy as np
+import xarray as xr
+
+import era5
+from era5.util.datetime import DateTime, parse_datetime
+from era5.maths.bearings import coordinates_from_bearing_degrees_array
+from era5.maths.grid import GridInterpolator
+
+
+class TrajectoryIntegrator:
+    """
+    Integrates the trajectories of air parcels through the (u, v, vertical velocity) wind field with 4th order
+    Runge-Kutta, advancing every parcel at once.
+
+    The wind is interpolated in space (log-pressure, latitude & periodic longitude) with a single stencil per stage for
+    all three components, and linearly in time between the two hourly timesteps bracketing the stage. Only those two
+    timesteps are held in memory, and the next one is read as the parcels pass it. Horizontal steps follow great
+    circles along the bearing of the wind, and the pressure of parcels is clamped to the levels of the data.
+
+    Examples:
+        .. code-block:: python
+
+            integrator = TrajectoryIntegrator(step=timedelta(minutes=10))
+            trajectories = integrator.run("TAVG-01-01 00:00", hours=48, latitude=[51.5, 40.6],
+                                          longitude=[-0.5, -73.8], pressure=[250, 300])
+
+            # back trajectories
+            trajectories = integrator.run("TAVG-01-03 00:00", hours=-48, latitude=lat, longitude=lon, pressure=p)
+    """
+
+    def __init__(self, step: timedelta = timedelta(minutes=15), method: str = "linear", level=None):
+        """
+        Args:
+            step: the length of each Runge-Kutta step, which should divide an hour
+            method: the spatial interpolation method, see GridInterpolator
+            level: level index of the wind field (defaults to all levels)
+        """
+        self._step = step.total_seconds()
+        self._method = method
+        self._level = level
+        self._variables = [era5.UWind(), era5.VWind(), era5.VerticalVelocity()]
+
+        self._start: DateTime | None = None
+        self._resident: dict[int, np.ndarray] = {}
+        self._coordinates = None
+
+    def _read(self, hour: int) -> np.ndarray:
+        dt = self._start + timedelta(hours=hour)
+        fields = None
+        for i, variable in enumerate(self._variables):
+            data = variable[dt, self._level][variable.name].transpose("level", "latitude", "longitude")
+
+            # the components are written straight into one buffer, rather than stacked
+            if fields is None:
+                fields = np.empty((len(self._variables), *data.shape), dtype=data.dtype)
+            fields[i] = data.values
+
+            if self._coordinates is None:
+                self._coordinates = [data[dim].values.astype("float64") for dim in ("level", "latitude", "longitude")]
+        return fields
+
+    def _fields(self, hour: int, count: int) -> list[np.ndarray]:
+        """
+        The (component, level, latitude, longitude) wind of `count` consecutive hours, reading hours that are not
+        resident and evicting the hours that are no longer needed. The resident arrays are returned as they are, so
+        that no stage copies them.
+        """
+        hours = range(hour, hour + count)
+        for h in list(self._resident):
+            if h not in hours:
+                del self._resident[h]
+        for h in hours:
+            if h not in self._resident:
+                self._resident[h] = self._read(h)
+        return [self._resident[h] for h in hours]
+
+    def _wind(self, seconds: float, latitude: np.ndarray, longitude: np.ndarray,
+              pressure: np.ndarray) -> np.ndarray:
+        """
+        The (u, v, vertical velocity) of each parcel, of shape (3, parcel)
+        """
+        hour = math.floor(seconds / 3600)
+        weight = seconds / 3600 - hour
+        fields = self._fields(hour, 1 if weight == 0 else 2)
+
+        interpolator = GridInterpolator(self._coordinates, [pressure, latitude, longitude], self._method,
+                                        [None, None, 360.0], [True, False, False])
+        values = [interpolator(field) for field in fields]
+
+        if weight == 0:
+            return values[0]
+        return (1 - weight) * values[0] + weight * values[1]
+
+    def _displace(self, latitude: np.ndarray, longitude: np.ndarray, pressure: np.ndarray, wind: np.ndarray,
+                  seconds: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        u, v, w = wind
+        latitude, longitude = coordinates_from_bearing_degrees_array(np.degrees(np.arctan2(u, v)),
+                                                                     np.hypot(u, v) * seconds, latitude, longitude)
+
+        levels = self._coordinates[0]
+        pressure = np.clip(pressure + w * seconds / 100, levels.min(), levels.max())  # Pa/s to hPa
+        return latitude, np.mod(longitude, 360), pressure
+
+    def run(self, start, hours: float, latitude, longitude, pressure, output_every: int = 1) -> xr.Dataset:
+        """
+        Integrates the trajectories of parcels
+
+        Args:
+            start: the datetime the parcels are released at, on the hour
+            hours: the duration of the trajectories, negative for back trajectories
+            latitude: the initial latitudes of the parcels (in degrees)
+            longitude: the initial longitudes of the parcels (in degrees)
+            pressure: the initial pressures of the parcels (in hPa)
+            output_every: the number of steps between the outputted positions
+
+        Returns:
+            the latitude, longitude & pressure of each parcel, of dimensions (hours, parcel), where hours is the time
+            since the start
+        """
+        self._start = parse_datetime(start)
+        self._resident = {}
+        self._coordinates = None
+
+        latitude, longitude, pressure = np.broadcast_arrays(*(np.asarray(x, dtype="float64").reshape(-1)
+                                                               for x in (latitude, longitude, pressure)))
+        longitude = np.mod(longitude, 360)
+
+        n_steps = round(abs(hours) * 3600 / self._step)
+        h = math.copysign(self._step, hours)
+
+        # the grid coordinates are only known after the first read
+        self._fields(0, 1)
+        levels = self._coordinates[0]
+        pressure = np.clip(pressure, levels.min(), levels.max())
+
+        times = [0.0]
+        positions = [(latitude, longitude, pressure)]
+
+        for i in range(n_steps):
+            t = i * h
+            position = (latitude, longitude, pressure)
+
+            k1 = self._wind(t, *position)
+            k2 = self._wind(t + h / 2, *self._displace(*position, k1, h / 2))
+            k3 = self._wind(t + h / 2, *self._displace(*position, k2, h / 2))
+            k4 = self._wind(t + h, *self._displace(*position, k3, h))
+
+            latitude, longitude, pressure = self._displace(*position, (k1 + 2 * k2 + 2 * k3 + k4) / 6, h)
+
+            if (i + 1) % output_every == 0 or i == n_steps - 1:
+                times.append((t + h) / 3600)
+                positions.append((latitude, longitude, pressure))
+
+        self._resident = {}
+        lat, lon, p = (np.stack(x) for x in zip(*positions))
+        dims = ("hours", "parcel")
+        return xr.Dataset({"latitude": (dims, lat), "longitude": (dims, lon), "pressure": (dims, p)},
+                          coords={"hours": times, "parcel": np.arange(lat.shape[1])},
+                          attrs={"start": str(self._start)})
+
+
+__all__ = ["TrajectoryIntegrator"]
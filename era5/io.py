@@ -90,20 +90,22 @@ def open_dataset(datetime, folder: str = ERA5, datalevel: str = "hour") -> xr.Da
 
     filepath = f"{folder}/{era5_filename(datetime, datalevel=datalevel)}"
 
-    if filepath in datasets_cache:
-        return datasets_cache[filepath]
+    if filepath not in datasets_cache:
+        ds = xr.open_dataset(filepath)
+        if datalevel == "hour":
+            ds.coords["time"] = datetime
+        datasets_cache[filepath] = ds
 
-    ds = xr.open_dataset(filepath)
+    ds = datasets_cache[filepath]
     if datalevel == "hour":
-        ds.coords["time"] = datetime
-    else:
-        try:
-            ds = ds.sel(time=datetime)
-        except TypeError:
-            print(ds)
-            raise
-    datasets_cache[filepath] = ds
-    return ds
+        return ds
+
+    # files holding several timesteps are cached whole, and the timestep is selected on each call
+    try:
+        return ds.sel(time=datetime)
+    except TypeError:
+        print(ds)
+        raise
 
 
 def open_variable(variable: str | list[str], datetime, folder: str = ERA5, datalevel: str = "day") -> xr.Dataset:
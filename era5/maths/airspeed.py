@@ -1,8 +1,8 @@
 """Airspeed related functions"""
 
-import math
+import numpy as np
 
-from barometric import isa_pressure, PRESSURE_SEA_LEVEL, isa_density, DENSITY_SEA_LEVEL
+from .barometric import isa_pressure, PRESSURE_SEA_LEVEL, isa_density, DENSITY_SEA_LEVEL
 
 SONIC_SPEED_SEA_LEVEL = 340.29  # m/s
 
@@ -24,8 +24,8 @@ def mach_number(speed: float,
     @param altitude: the altitude in meters (below 20000 m)
     @return: the mach number, or ratio of the speed to the speed of sound at that altitude
     """
-    return math.sqrt(5 * ((impact_pressure(speed=speed) /
-                           isa_pressure(altitude=altitude) + 1) ** 0.28571428571 - 1))
+    return np.sqrt(5 * ((impact_pressure(speed=speed) /
+                         isa_pressure(altitude=altitude) + 1) ** 0.28571428571 - 1))
 
 
 def expected_airspeed(calibrated_airspeed: float,
@@ -36,7 +36,7 @@ def expected_airspeed(calibrated_airspeed: float,
     @param altitude: the altitude of the aircraft in meters (below 20000 m)
     @return: the expected airspeed (EAS) in meters/second
     """
-    return SONIC_SPEED_SEA_LEVEL * mach_number(speed=calibrated_airspeed, altitude=altitude) * math.sqrt(
+    return SONIC_SPEED_SEA_LEVEL * mach_number(speed=calibrated_airspeed, altitude=altitude) * np.sqrt(
         isa_pressure(altitude=altitude) / PRESSURE_SEA_LEVEL)
 
 
@@ -48,7 +48,7 @@ def true_airspeed_from_calibrated_airspeed(calibrated_airspeed: float,
     @param altitude: the altitude of the aircraft in meters (below 20000 m)
     @return: the true airspeed (TAS) in meters/second
     """
-    return expected_airspeed(calibrated_airspeed=calibrated_airspeed, altitude=altitude) * math.sqrt(
+    return expected_airspeed(calibrated_airspeed=calibrated_airspeed, altitude=altitude) * np.sqrt(
         DENSITY_SEA_LEVEL / isa_density(altitude=altitude))
 
 
@@ -60,20 +60,9 @@ def calibrated_airspeed_from_true_airspeed(true_airspeed: float,
     @param altitude: the altitude of the aircraft in meters (below 20000 m)
     @return: the calibrated airspeed (CAS) in meters/second
     """
-    pressure = isa_pressure(altitude=altitude)
-
-    true_airspeed **= 2
-    true_airspeed *= isa_density(altitude=altitude) / (7 * pressure)
-    true_airspeed += 1
-    true_airspeed **= 3.5
-    true_airspeed -= 1
-    true_airspeed *= pressure / PRESSURE_SEA_LEVEL
-    true_airspeed += 1
-    true_airspeed **= 2 / 7
-    true_airspeed -= 1
-    true_airspeed *= 7 * PRESSURE_SEA_LEVEL / DENSITY_SEA_LEVEL
-
-    return true_airspeed ** 0.5
+    return calibrated_airspeed_(true_airspeed=true_airspeed,
+                                air_density=isa_density(altitude=altitude),
+                                atmospheric_pressure=isa_pressure(altitude=altitude))
 
 
 tas_from_cas = true_airspeed_from_calibrated_airspeed
@@ -89,7 +78,7 @@ def mach_number_(speed: float,
     @param atmospheric_pressure: the pressure of the atmosphere around the aircraft (in Pascals)
     @return: the mach number, or ratio of the speed to the speed of sound at that altitude
     """
-    return math.sqrt(5 * ((impact_pressure(speed=speed) / atmospheric_pressure + 1) ** 0.28571428571 - 1))
+    return np.sqrt(5 * ((impact_pressure(speed=speed) / atmospheric_pressure + 1) ** 0.28571428571 - 1))
 
 
 def expected_airspeed_(calibrated_airspeed: float,
@@ -102,7 +91,7 @@ def expected_airspeed_(calibrated_airspeed: float,
     @return: the expected airspeed (EAS) in meters/second
     """
     return SONIC_SPEED_SEA_LEVEL * mach_number_(speed=calibrated_airspeed,
-                                                atmospheric_pressure=atmospheric_pressure) * math.sqrt(
+                                                atmospheric_pressure=atmospheric_pressure) * np.sqrt(
         atmospheric_pressure / PRESSURE_SEA_LEVEL)
 
 
@@ -117,10 +106,24 @@ def true_airspeed_(calibrated_airspeed: float,
     @return: the true airspeed (TAS) in meters/second
     """
     return expected_airspeed_(calibrated_airspeed=calibrated_airspeed,
-                              atmospheric_pressure=atmospheric_pressure) * math.sqrt(
+                              atmospheric_pressure=atmospheric_pressure) * np.sqrt(
         DENSITY_SEA_LEVEL / air_density)
 
 
+def calibrated_airspeed_(true_airspeed: float,
+                         air_density: float,
+                         atmospheric_pressure: float) -> float:
+    """Calculates the calibrated airspeed (CAS) from the true airspeed (TAS)
+
+    @param true_airspeed: the true airspeed (TAS) in meters/second
+    @param air_density: the density of the air around the aircraft (in kg/m3)
+    @param atmospheric_pressure: the pressure of the atmosphere around the aircraft (in Pascals)
+    @return: the calibrated airspeed (CAS) in meters/second
+    """
+    impact = ((true_airspeed ** 2 * air_density / (7 * atmospheric_pressure) + 1) ** 3.5 - 1) * atmospheric_pressure
+    return np.sqrt(((impact / PRESSURE_SEA_LEVEL + 1) ** (2 / 7) - 1) * 7 * PRESSURE_SEA_LEVEL / DENSITY_SEA_LEVEL)
+
+
 def expected_airspeed_from_mach(mach: float,
                                 altitude: float) -> float:
     """Calculates the expected airspeed (EAS) from the MACH number
@@ -129,7 +132,7 @@ def expected_airspeed_from_mach(mach: float,
     @param altitude: the altitude of the aircraft in meters (below 20000 m)
     @return: the expected airspeed (EAS) in meters/second
     """
-    return SONIC_SPEED_SEA_LEVEL * mach * math.sqrt(isa_pressure(altitude=altitude) / PRESSURE_SEA_LEVEL)
+    return SONIC_SPEED_SEA_LEVEL * mach * np.sqrt(isa_pressure(altitude=altitude) / PRESSURE_SEA_LEVEL)
 
 
 def true_airspeed_from_mach(mach: float,
@@ -140,7 +143,7 @@ def true_airspeed_from_mach(mach: float,
     @param altitude: the altitude of the aircraft in meters (below 20000 m)
     @return: the true airspeed (TAS) in meters/second
     """
-    return expected_airspeed_from_mach(mach=mach, altitude=altitude) * math.sqrt(
+    return expected_airspeed_from_mach(mach=mach, altitude=altitude) * np.sqrt(
         DENSITY_SEA_LEVEL / isa_density(altitude=altitude))
 
 
@@ -152,5 +155,5 @@ def calibrated_airspeed_from_mach(mach: float,
     @param altitude: the altitude of the aircraft in meters (below 20000 m)
     @return: the calibrated airspeed (CAS) in meters/second
     """
-    return math.sqrt(5 * (((((mach ** 2) / 5 + 1) ** 3.5 - 1) * isa_pressure(altitude=altitude) /
-                           PRESSURE_SEA_LEVEL + 1) ** 0.2857142857142857 - 1)) * SONIC_SPEED_SEA_LEVEL
+    return np.sqrt(5 * (((((mach ** 2) / 5 + 1) ** 3.5 - 1) * isa_pressure(altitude=altitude) /
+                         PRESSURE_SEA_LEVEL + 1) ** 0.2857142857142857 - 1)) * SONIC_SPEED_SEA_LEVEL
@@ -3,6 +3,8 @@
 
 import math
 
+import numpy as np
+
 
 _UPPER_ATMOSPHERE = 10972  # meters, start of the Tropopause
 
@@ -20,6 +22,7 @@ UNIVERSAL_GAS_CONSTANT = 8.3144598  # J/(mol K)
 GRAVITATIONAL_ACCELERATION = 9.80665  # m/s^2
 AIR_MOLAR_MASS = 0.0289644  # kg/mol
 IDEAL_GAS_LAW_COEFF = AIR_MOLAR_MASS / UNIVERSAL_GAS_CONSTANT
+DRY_AIR_GAS_CONSTANT = UNIVERSAL_GAS_CONSTANT / AIR_MOLAR_MASS  # J/(kg K)
 
 PRESSURE_POWER = -GRAVITATIONAL_ACCELERATION * AIR_MOLAR_MASS / \
                                (UNIVERSAL_GAS_CONSTANT * TEMPERATURE_LAPSE_RATE_SEA_LEVEL)
@@ -35,77 +38,80 @@ DENSITY_11000_METERS_ALTITUDE_OFFSET = 11000 + math.log(DENSITY_11000_METERS, BA
 
 def isa_pressure(altitude: float) -> float:
     """
-    Calculates the Atmospheric Pressure, P, at the Altitude given
+    Calculates the Atmospheric Pressure, P, at the Altitude(s) given
 
-    @param altitude: the altitude in meters (below 20000 m)
-    @return: the atmospheric pressure, in Pascals, at the altitude
+    @param altitude: the altitude(s) in meters (below 20000 m)
+    @return: the atmospheric pressure, in Pascals, at the altitude(s)
     """
-    if altitude < 11000:
-        return PRESSURE_SEA_LEVEL * (BAROMETRIC_SEA_LEVEL_COEFF * altitude + 1) ** PRESSURE_POWER
-    else:
-        return PRESSURE_11000_METERS * math.exp(BAROMETRIC_EXP_COEFF * (altitude - 11000))
+    altitude = np.asarray(altitude, dtype="float64")
+
+    with np.errstate(invalid="ignore"):  # the branch that is not selected may be out of its domain
+        return np.where(altitude < 11000,
+                        PRESSURE_SEA_LEVEL * (BAROMETRIC_SEA_LEVEL_COEFF * altitude + 1) ** PRESSURE_POWER,
+                        PRESSURE_11000_METERS * np.exp(BAROMETRIC_EXP_COEFF * (altitude - 11000)))[()]
 
 
 def isa_temperature(altitude: float) -> float:
     """Calculates the Air Temperature, T, at the Altitude given
 
-    @param altitude: the altitude in meters (below 20000 m)
-    @return: the air temperature (K) at the altitude
+    @param altitude: the altitude(s) in meters (below 20000 m)
+    @return: the air temperature (K) at the altitude(s)
     """
-    if altitude < 11000:
-        return TEMPERATURE_SEA_LEVEL + altitude * TEMPERATURE_LAPSE_RATE_SEA_LEVEL
-    else:
-        return TEMPERATURE_11000_METERS
+    altitude = np.asarray(altitude, dtype="float64")
+
+    return np.where(altitude < 11000,
+                    TEMPERATURE_SEA_LEVEL + altitude * TEMPERATURE_LAPSE_RATE_SEA_LEVEL,
+                    TEMPERATURE_11000_METERS)[()]
 
 
 def isa_temperature_celsius(altitude: float) -> float:
     """Calculates the Air Temperature, T, at the Altitude given
 
-    @param altitude: the altitude in meters (below 20000 m)
-    @return: the air temperature (°C) at the altitude
+    @param altitude: the altitude(s) in meters (below 20000 m)
+    @return: the air temperature (°C) at the altitude(s)
     """
-    if altitude < 11000:
-        return TEMPERATURE_SEA_LEVEL + altitude * TEMPERATURE_LAPSE_RATE_SEA_LEVEL - 273.15
-    else:
-        return TEMPERATURE_11000_METERS - 273.15
+    return isa_temperature(altitude) - 273.15
 
 
 def isa_density(altitude: float) -> float:
     """Calculates the Atmospheric Density, ρ, at the Altitude given
 
-    @param altitude: the altitude in meters (below 20000 m)
-    @return: the atmospheric density, in kilograms/meter cubed, at the altitude
+    @param altitude: the altitude(s) in meters (below 20000 m)
+    @return: the atmospheric density, in kilograms/meter cubed, at the altitude(s)
     """
-    if altitude < 11000:
-        return DENSITY_SEA_LEVEL * (BAROMETRIC_SEA_LEVEL_COEFF * altitude + 1) ** DENSITY_POWER
-    else:
-        return DENSITY_11000_METERS * math.exp(BAROMETRIC_EXP_COEFF * (altitude - 11000))
+    altitude = np.asarray(altitude, dtype="float64")
+
+    with np.errstate(invalid="ignore"):
+        return np.where(altitude < 11000,
+                        DENSITY_SEA_LEVEL * (BAROMETRIC_SEA_LEVEL_COEFF * altitude + 1) ** DENSITY_POWER,
+                        DENSITY_11000_METERS * np.exp(BAROMETRIC_EXP_COEFF * (altitude - 11000)))[()]
 
 
 def height_from_pressure(pressure: float) -> float:
     """
     Calculates the inverse of the get_isa_pressure() function
 
-    @param pressure: the pressure (in Pascals)
-    @return: the altitude (in meters)
+    @param pressure: the pressure(s) (in Pascals)
+    @return: the altitude(s) (in meters)
     """
-    if pressure > PRESSURE_11000_METERS:
-        return ((pressure / PRESSURE_SEA_LEVEL) ** (1 / PRESSURE_POWER) - 1) / BAROMETRIC_SEA_LEVEL_COEFF
-    else:
-        return 11000 + math.log(pressure / PRESSURE_11000_METERS) / BAROMETRIC_EXP_COEFF
+    pressure = np.asarray(pressure, dtype="float64")
+
+    return np.where(pressure > PRESSURE_11000_METERS,
+                    ((pressure / PRESSURE_SEA_LEVEL) ** (1 / PRESSURE_POWER) - 1) / BAROMETRIC_SEA_LEVEL_COEFF,
+                    11000 + np.log(pressure / PRESSURE_11000_METERS) / BAROMETRIC_EXP_COEFF)[()]
 
 
 def height_from_temperature(temperature: float) -> float:
     """
     Calculates the inverse of the get_isa_temperature() function
 
-    @param temperature: the temperature (in Kelvin)
-    @return: the altitude (in meters)
+    @param temperature: the temperature(s) (in Kelvin)
+    @return: the altitude(s) (in meters)
     """
-    if temperature == TEMPERATURE_11000_METERS:
-        return 11000
-    else:
-        return (temperature - TEMPERATURE_SEA_LEVEL) / TEMPERATURE_LAPSE_RATE_SEA_LEVEL
+    temperature = np.asarray(temperature, dtype="float64")
+
+    return np.where(temperature == TEMPERATURE_11000_METERS, 11000,
+                    (temperature - TEMPERATURE_SEA_LEVEL) / TEMPERATURE_LAPSE_RATE_SEA_LEVEL)[()]
 
 
 def density_from_ideal_gas_law(temperature: float,
@@ -118,3 +124,96 @@ def density_from_ideal_gas_law(temperature: float,
     @return:
     """
     return IDEAL_GAS_LAW_COEFF * pressure / temperature
+
+
+def hypsometric_height(temperature: np.ndarray,
+                       pressure: np.ndarray,
+                       axis: int = 0,
+                       reference_height: float | np.ndarray | None = None) -> np.ndarray:
+    """
+    Calculates the height of each pressure level by integrating the hypsometric equation up each column, using the
+    mean temperature of each layer between adjacent levels
+
+    @param temperature: the temperature (in Kelvin) at each level, of any shape with a level axis
+    @param pressure: the pressure (in Pascals) of each level
+    @param axis: the level axis of the temperature
+    @param reference_height: the height (in meters) of the highest pressure level, which the other heights are
+                             integrated from. Defaults to its ISA height
+    @return: the height (in meters) of each level, with the same shape as the temperature
+    """
+    temperature = np.moveaxis(np.asarray(temperature), axis, 0)
+    pressure = np.asarray(pressure, dtype="float64")
+
+    # integrate upwards, from the highest pressure
+    order = np.argsort(pressure)[::-1]
+    temperature = temperature[order]
+    pressure = pressure[order]
+
+    if reference_height is None:
+        reference_height = height_from_pressure(pressure[0])
+
+    log_ratio = np.log(pressure[:-1] / pressure[1:]).reshape(-1, *(1,) * (temperature.ndim - 1))
+    thickness = DRY_AIR_GAS_CONSTANT / GRAVITATIONAL_ACCELERATION * (temperature[1:] + temperature[:-1]) / 2 * log_ratio
+
+    heights = np.empty(temperature.shape, dtype=np.result_type(temperature, "float32"))
+    heights[0] = reference_height
+    heights[1:] = heights[0] + np.cumsum(thickness, axis=0)
+
+    unsorted = np.empty_like(heights)
+    unsorted[order] = heights
+    return np.moveaxis(unsorted, 0, axis)
+
+
+def height_bracket(heights: np.ndarray,
+                   altitude: float | np.ndarray,
+                   axis: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the pair of levels either side of an altitude in each column, e.g. from hypsometric_height()
+
+    Within each layer, the hypsometric equation makes height linear in log-pressure, so the weight also interpolates
+    in log-pressure. Altitudes outside a column are clamped to its top or bottom level.
+
+    @param heights: the height (in meters) of each level, of any shape with a level axis along which heights are
+                    monotonic
+    @param altitude: the altitude (in meters), broadcastable to the shape of the columns
+    @param axis: the level axis of the heights
+    @return: the indices of the lower & upper levels, and the weight of the upper level
+    """
+    heights = np.moveaxis(np.asarray(heights), axis, 0)
+    n = len(heights)
+
+    descending = bool(np.all(heights[0] >= heights[-1]))
+    if descending:
+        heights = heights[::-1]
+
+    n_below = (heights <= altitude).sum(axis=0)
+    lower = np.clip(n_below - 1, 0, n - 2)
+    upper = lower + 1
+
+    lower_height = np.take_along_axis(heights, lower[None], axis=0)[0]
+    upper_height = np.take_along_axis(heights, upper[None], axis=0)[0]
+    weight = np.clip((altitude - lower_height) / (upper_height - lower_height), 0, 1)
+
+    if descending:
+        lower, upper = n - 1 - lower, n - 1 - upper
+
+    return lower, upper, weight
+
+
+def pressure_at_height(heights: np.ndarray,
+                       pressure: np.ndarray,
+                       altitude: float | np.ndarray,
+                       axis: int = 0) -> np.ndarray:
+    """
+    Calculates the pressure at an altitude in each column by interpolating in log-pressure between levels
+
+    @param heights: the height (in meters) of each level, e.g. from hypsometric_height()
+    @param pressure: the pressure (in Pascals) of each level
+    @param altitude: the altitude (in meters), broadcastable to the shape of the columns
+    @param axis: the level axis of the heights
+    @return: the pressure (in Pascals) in each column
+    """
+    lower, upper, weight = height_bracket(heights, altitude, axis)
+    log_pressure = np.log(np.asarray(pressure, dtype="float64"))
+    return np.exp((1 - weight) * log_pressure[lower] + weight * log_pressure[upper])
+
@@ -3,6 +3,8 @@
 
 import math
 
+import numpy as np
+
 from .constants import EARTH_MEAN_RADIUS
 
 
@@ -118,3 +120,139 @@ def coordinates_from_bearing_(distance: float,
     lat2 = math.asin(sin_lat * cos_s + cos_lat_times_cos_bearing * sin_s)
 
     return lat2, lon + math.atan2(cos_lat_times_sin_bearing * sin_s, cos_s - sin_lat * math.sin(lat2))
+
+
+# Array versions of the formulae above, which broadcast over arrays of coordinates
+def bearing_degrees_array(lat1: np.ndarray,
+                          lon1: np.ndarray,
+                          lat2: np.ndarray,
+                          lon2: np.ndarray) -> np.ndarray:
+    """
+    Array version of bearing_degrees()
+
+    @param lat1: 1st latitudes in degrees
+    @param lon1: 1st longitudes in degrees
+    @param lat2: 2nd latitudes in degrees
+    @param lon2: 2nd longitudes in degrees
+    @return: the bearings between each pair of coordinates in degrees
+    """
+    return np.degrees(get_bearing_array(np.radians(lat1), np.radians(lon1), np.radians(lat2), np.radians(lon2)))
+
+
+def get_bearing_array(lat1: np.ndarray,
+                      lon1: np.ndarray,
+                      lat2: np.ndarray,
+                      lon2: np.ndarray) -> np.ndarray:
+    """
+    Array version of get_bearing()
+
+    @param lat1: 1st latitudes in radians
+    @param lon1: 1st longitudes in radians
+    @param lat2: 2nd latitudes in radians
+    @param lon2: 2nd longitudes in radians
+    @return: the bearings between each pair of coordinates in radians
+    """
+    dlon = np.abs(lon2 - lon1)
+    cos_lat2 = np.cos(lat2)
+
+    return np.arctan2(cos_lat2 * np.sin(dlon), np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * cos_lat2 * np.cos(dlon))
+
+
+def coordinates_from_bearing_array(bearing: np.ndarray,
+                                   distance: np.ndarray,
+                                   lat: np.ndarray,
+                                   lon: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Array version of coordinates_from_bearing()
+
+    @param bearing: the bearings (in radians) of the paths
+    @param distance: the lengths (in meters) of the paths
+    @param lat: latitudes (in radians) to calculate coordinates from
+    @param lon: longitudes (in radians) to calculate coordinates from
+    @return: the 2nd coordinates, in radians
+    """
+    sigma = np.asarray(distance) / (EARTH_MEAN_RADIUS * 1000)
+    sin_s = np.sin(sigma)
+    cos_s = np.cos(sigma)
+    sin_l = np.sin(lat)
+    cos_l = np.cos(lat)
+
+    lat2 = np.arcsin(np.clip(sin_l * cos_s + cos_l * sin_s * np.cos(bearing), -1, 1))
+
+    return lat2, lon + np.arctan2(np.sin(bearing) * sin_s * cos_l, cos_s - sin_l * np.sin(lat2))
+
+
+def coordinates_from_bearing_degrees_array(bearing: np.ndarray,
+                                           distance: np.ndarray,
+                                           lat: np.ndarray,
+                                           lon: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Array version of coordinates_from_bearing_degrees()
+
+    @param bearing: the bearings (in degrees) of the paths
+    @param distance: the lengths (in meters) of the paths
+    @param lat: latitudes (in degrees) to calculate coordinates from
+    @param lon: longitudes (in degrees) to calculate coordinates from
+    @return: the 2nd coordinates, in degrees
+    """
+    lat, lon = coordinates_from_bearing_array(bearing=np.radians(bearing),
+                                              distance=distance,
+                                              lat=np.radians(lat),
+                                              lon=np.radians(lon))
+
+    return np.degrees(lat), np.degrees(lon)
+
+
+def track_bearing_array(lat1: np.ndarray,
+                        lon1: np.ndarray,
+                        lat2: np.ndarray,
+                        lon2: np.ndarray) -> np.ndarray:
+    """
+    Calculates the initial bearing of the great circle from each 1st coordinate to each 2nd coordinate.
+    Unlike get_bearing_array(), the bearing is signed, so westward tracks have negative bearings
+
+    @param lat1: 1st latitudes in radians
+    @param lon1: 1st longitudes in radians
+    @param lat2: 2nd latitudes in radians
+    @param lon2: 2nd longitudes in radians
+    @return: the bearings (from -pi to pi, clockwise from north) in radians
+    """
+    dlon = lon2 - lon1
+    cos_lat2 = np.cos(lat2)
+
+    return np.arctan2(cos_lat2 * np.sin(dlon), np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * cos_lat2 * np.cos(dlon))
+
+
+def intermediate_coordinates_array(lat1: np.ndarray,
+                                   lon1: np.ndarray,
+                                   lat2: np.ndarray,
+                                   lon2: np.ndarray,
+                                   fraction: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the coordinates some fraction of the way along the great circle between pairs of coordinates
+
+    @param lat1: 1st latitudes in radians
+    @param lon1: 1st longitudes in radians
+    @param lat2: 2nd latitudes in radians
+    @param lon2: 2nd longitudes in radians
+    @param fraction: the fractions of the distance from the 1st to the 2nd coordinates
+    @return: the intermediate coordinates, in radians
+    """
+    lat1, lon1, lat2, lon2, fraction = np.broadcast_arrays(lat1, lon1, lat2, lon2, fraction)
+    cos_lat1 = np.cos(lat1)
+    cos_lat2 = np.cos(lat2)
+
+    # spherical linear interpolation of the unit vectors of the coordinates
+    p1 = np.stack([cos_lat1 * np.cos(lon1), cos_lat1 * np.sin(lon1), np.sin(lat1)])
+    p2 = np.stack([cos_lat2 * np.cos(lon2), cos_lat2 * np.sin(lon2), np.sin(lat2)])
+
+    angle = np.arccos(np.clip((p1 * p2).sum(axis=0), -1, 1))
+    sin_angle = np.sin(angle)
+    coincident = sin_angle < 1e-12
+    sin_angle = np.where(coincident, 1, sin_angle)
+
+    a = np.where(coincident, 1 - fraction, np.sin((1 - fraction) * angle) / sin_angle)
+    b = np.where(coincident, fraction, np.sin(fraction * angle) / sin_angle)
+    x, y, z = a * p1 + b * p2
+
+    return np.arctan2(z, np.hypot(x, y)), np.arctan2(y, x)
@@ -1 +1,2 @@
 EARTH_MEAN_RADIUS = 6372.165
+FEET = 0.3048  # meters
@@ -32,3 +32,164 @@ def rmse(data, prediction) -> float:
 
 def r2(data, prediction):
     return 1 - ((data - prediction) ** 2).sum() / ((data - data.mean()) ** 2).sum()
+
+
+class MetricAccumulator:
+    """
+    Computes all the error metrics above in a single pass over chunks of data, using running sums.
+    The variance of the data (for R²) is accumulated with Welford's algorithm, merged chunk-wise (Chan et al.)
+
+    Examples:
+        .. code-block:: python
+
+            metrics = MetricAccumulator()
+            for model in models:
+                metrics.update(model.data(), model.predict())
+            print(metrics.rmse, metrics.r2)
+    """
+
+    def __init__(self, chunk_size: int = 2 ** 20):
+        """
+        Args:
+            chunk_size: the number of elements to process at once, bounding the size of temporary arrays
+        """
+        self._chunk_size = chunk_size
+
+        self.n = 0
+        self._sum_error = 0.0
+        self._sum_abs_error = 0.0
+        self._sum_sq_error = 0.0
+        self._sum_abs_pct_error = 0.0
+        self._sum_sym_pct_error = 0.0
+        self._sum_abs_data = 0.0
+
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = np.inf
+        self._max = -np.inf
+
+    def update(self, data, prediction) -> "MetricAccumulator":
+        """
+        Adds a chunk of data & predictions of any (equal) shape to the running metrics
+        """
+        data, prediction = np.broadcast_arrays(data, prediction)
+        data = data.reshape(-1)
+        prediction = prediction.reshape(-1)
+
+        for i in range(0, len(data), self._chunk_size):
+            self._update(data[i:i + self._chunk_size], prediction[i:i + self._chunk_size])
+
+        return self
+
+    def _update(self, data: np.ndarray, prediction: np.ndarray) -> None:
+        n = len(data)
+        if n == 0:
+            return
+
+        data = data.astype("float64")
+        error = data - prediction
+
+        self._sum_error += error.sum()
+        self._sum_sq_error += np.dot(error, error)
+
+        np.abs(error, out=error)
+        self._sum_abs_error += error.sum()
+
+        abs_data = np.abs(data)
+        self._sum_abs_data += abs_data.sum()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._sum_abs_pct_error += (error / abs_data).sum()
+
+        denominator = abs_data + np.abs(prediction)
+        self._sum_sym_pct_error += np.divide(error, denominator, out=np.zeros_like(error), where=denominator != 0).sum()
+
+        # Welford's update, merging the statistics of this chunk with the running ones
+        chunk_mean = data.mean()
+        data -= chunk_mean
+        chunk_m2 = np.dot(data, data)
+
+        total = self.n + n
+        delta = chunk_mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += chunk_m2 + delta ** 2 * self.n * n / total
+        self.n = total
+
+        self._min = min(self._min, data.min() + chunk_mean)
+        self._max = max(self._max, data.max() + chunk_mean)
+
+    def merge(self, other: "MetricAccumulator") -> "MetricAccumulator":
+        """
+        Combines the running metrics of another accumulator into this one
+        """
+        if other.n == 0:
+            return self
+
+        total = self.n + other.n
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta ** 2 * self.n * other.n / total
+        self._mean += delta * other.n / total
+        self.n = total
+
+        self._sum_error += other._sum_error
+        self._sum_abs_error += other._sum_abs_error
+        self._sum_sq_error += other._sum_sq_error
+        self._sum_abs_pct_error += other._sum_abs_pct_error
+        self._sum_sym_pct_error += other._sum_sym_pct_error
+        self._sum_abs_data += other._sum_abs_data
+
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        return self
+
+    @property
+    def me(self) -> float:
+        return self._sum_error / self.n
+
+    @property
+    def mae(self) -> float:
+        return self._sum_abs_error / self.n
+
+    @property
+    def mape(self) -> float:
+        return self._sum_abs_pct_error / self.n
+
+    @property
+    def wmape(self) -> float:
+        return self._sum_abs_error / self._sum_abs_data
+
+    @property
+    def smape(self) -> float:
+        return self._sum_sym_pct_error / self.n
+
+    @property
+    def mse(self) -> float:
+        return self._sum_sq_error / self.n
+
+    @property
+    def rmse(self) -> float:
+        return self.mse ** 0.5
+
+    @property
+    def r2(self) -> float:
+        return 1 - self._sum_sq_error / self._m2
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def var(self) -> float:
+        return self._m2 / self.n
+
+    @property
+    def std(self) -> float:
+        return self.var ** 0.5
+
+    @property
+    def min(self) -> float:
+        return self._min
+
+    @property
+    def max(self) -> float:
+        return self._max
@@ -3,6 +3,8 @@
 
 import math
 
+import numpy as np
+
 from .constants import EARTH_MEAN_RADIUS
 
 
@@ -116,3 +118,99 @@ def vincenty_great_circle_distance(lat1: float,
     return EARTH_MEAN_RADIUS * math.atan(math.hypot(cos_lat2 * math.sin(lat_difference),
                                                     cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * cos_lat_difference)
                                          / (sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_lat_difference))
+
+
+# Array versions of the formulae above, which broadcast over arrays of coordinates
+def great_circle_distance_degrees_array(lat1: np.ndarray,
+                                        lon1: np.ndarray,
+                                        lat2: np.ndarray,
+                                        lon2: np.ndarray) -> np.ndarray:
+    """Array version of great_circle_distance_degrees()
+
+    @param lat1: latitudes of coordinate 1 (in degrees)
+    @param lon1: longitudes of coordinate 1 (in degrees)
+    @param lat2: latitudes of coordinate 2 (in degrees)
+    @param lon2: longitudes of coordinate 2 (in degrees)
+
+    @return: the distances in kilometers between each pair of coordinates
+    """
+    return great_circle_distance_array(lat1=np.radians(lat1),
+                                       lon1=np.radians(lon1),
+                                       lat2=np.radians(lat2),
+                                       lon2=np.radians(lon2))
+
+
+def great_circle_distance_array(lat1: np.ndarray,
+                                lon1: np.ndarray,
+                                lat2: np.ndarray,
+                                lon2: np.ndarray) -> np.ndarray:
+    """Array version of great_circle_distance()
+
+    @param lat1: latitudes of coordinate 1 (in radians)
+    @param lon1: longitudes of coordinate 1 (in radians)
+    @param lat2: latitudes of coordinate 2 (in radians)
+    @param lon2: longitudes of coordinate 2 (in radians)
+
+    @return: the distances in kilometers between each pair of coordinates
+    """
+    # rounding can push the cosine of (nearly) coincident or antipodal points just outside [-1, 1]
+    cos_angle = np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) * np.cos(np.abs(lon1 - lon2))
+    return EARTH_MEAN_RADIUS * np.arccos(np.clip(cos_angle, -1, 1))
+
+
+def great_circle_distance_array_(sin_lat1: np.ndarray,
+                                 cos_lat1: np.ndarray,
+                                 lon1: np.ndarray,
+                                 lat2: np.ndarray,
+                                 lon2: np.ndarray) -> np.ndarray:
+    """Array version of great_circle_distance_()
+
+    @param sin_lat1: sines of the latitudes of coordinate 1
+    @param cos_lat1: cosines of the latitudes of coordinate 1
+    @param lon1: longitudes of coordinate 1 (in degrees)
+    @param lat2: latitudes of coordinate 2 (in radians)
+    @param lon2: longitudes of coordinate 2 (in degrees)
+
+    @return: the distances in kilometers between each pair of coordinates
+    """
+    cos_angle = sin_lat1 * np.sin(lat2) + cos_lat1 * np.cos(lat2) * np.cos(np.radians(np.abs(lon1 - lon2)))
+    return EARTH_MEAN_RADIUS * np.arccos(np.clip(cos_angle, -1, 1))
+
+
+def haversine_great_circle_distance_array(lat1: np.ndarray,
+                                          lon1: np.ndarray,
+                                          lat2: np.ndarray,
+                                          lon2: np.ndarray) -> np.ndarray:
+    """Array version of haversine_great_circle_distance()
+
+    @param lat1: latitudes of coordinate 1 (in degrees)
+    @param lon1: longitudes of coordinate 1 (in degrees)
+    @param lat2: latitudes of coordinate 2 (in degrees)
+    @param lon2: longitudes of coordinate 2 (in degrees)
+
+    @return: the distances in kilometers between each pair of coordinates
+    """
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+
+    return 12742 * np.arcsin(np.sqrt(np.sin(np.abs(lat1 - lat2) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) *
+                                     np.sin(np.radians(np.abs(lon1 - lon2) / 2)) ** 2))
+
+
+def pairwise_distances(lat1: np.ndarray,
+                       lon1: np.ndarray,
+                       lat2: np.ndarray,
+                       lon2: np.ndarray,
+                       distance=great_circle_distance_degrees_array) -> np.ndarray:
+    """Finds the distance between every coordinate of one set and every coordinate of another
+
+    @param lat1: latitudes of the 1st set of coordinates (in degrees)
+    @param lon1: longitudes of the 1st set of coordinates (in degrees)
+    @param lat2: latitudes of the 2nd set of coordinates (in degrees)
+    @param lon2: longitudes of the 2nd set of coordinates (in degrees)
+    @param distance: an array distance function taking coordinates in degrees, e.g. vincenty_inverse_array
+
+    @return: a matrix of shape (len(lat1), len(lat2)) of distances in kilometers
+    """
+    return distance(np.asarray(lat1)[:, None], np.asarray(lon1)[:, None],
+                    np.asarray(lat2)[None, :], np.asarray(lon2)[None, :])
@@ -0,0 +1,211 @@
+"""Interpolation of Gridded Data at Arbitrary Points"""
+
+import numpy as np
+import xarray as xr
+
+from .interpolation import INTERPOLATION_WEIGHTS
+
+
+# Methods that only need the 2 points either side of the query
+_TWO_POINT_METHODS = ("nearest", "linear", "cosine")
+
+# Default treatment of the ERA5 dimensions: longitude wraps around & pressure is interpolated in log-pressure
+_PERIODS = {"longitude": 360.0}
+_LOG_AXES = ("level",)
+
+
+def _axis_stencil(coordinates: np.ndarray, points: np.ndarray, method: str, period: float | None, log: bool,
+                  tension, bias) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the stencil indices & weights of a set of points along a single axis
+
+    @param coordinates: the coordinates of the axis, in ascending or descending order
+    @param points: the coordinates of the points to interpolate at
+    @param method: a key of INTERPOLATION_WEIGHTS
+    @param period: the period of a periodic axis (e.g. 360 for longitude), or None to clamp points to the axis
+    @param log: interpolate in the logarithm of the coordinates?
+    @param tension: the tension of the hermite method
+    @param bias: the bias of the hermite method
+    @return: the indices & weights, each of shape (*points.shape, stencil)
+    """
+    coordinates = np.asarray(coordinates, dtype="float64")
+    points = np.asarray(points, dtype="float64")
+    n = len(coordinates)
+
+    if log:
+        coordinates = np.log(coordinates)
+        points = np.log(points)
+
+    # descending axes (e.g. latitude) are searched in their negated coordinates
+    if n > 1 and coordinates[0] > coordinates[-1]:
+        coordinates = -coordinates
+        points = -points
+
+    if n == 1:
+        index = np.zeros(points.shape, dtype=int)
+        t = np.zeros(points.shape)
+    elif period is not None:
+        points = coordinates[0] + np.mod(points - coordinates[0], period)
+        extended = np.append(coordinates, coordinates[0] + period)
+        index = np.clip(np.searchsorted(extended, points, side="right") - 1, 0, n - 1)
+        t = (points - extended[index]) / (extended[index + 1] - extended[index])
+    else:
+        points = np.clip(points, coordinates[0], coordinates[-1])
+        index = np.clip(np.searchsorted(coordinates, points, side="right") - 1, 0, n - 2)
+        t = (points - coordinates[index]) / (coordinates[index + 1] - coordinates[index])
+
+    if method == "hermite":
+        weights = INTERPOLATION_WEIGHTS[method](t, tension, bias)
+    else:
+        weights = INTERPOLATION_WEIGHTS[method](t)
+
+    offsets = np.arange(-1, 3)
+    if method in _TWO_POINT_METHODS:
+        offsets = offsets[1:3]
+        weights = weights[..., 1:3]
+
+    indices = index[..., None] + offsets
+    indices = np.mod(indices, n) if period is not None else np.clip(indices, 0, n - 1)
+
+    return indices, weights
+
+
+class GridInterpolator:
+    """
+    Interpolates gridded data at arbitrary points, with a method per axis.
+
+    The stencil (the flat indices of the surrounding grid points) and the weights of every point are computed once,
+    then any number of fields on the same grid are interpolated with a single gather and weighted sum. Longitude wraps
+    around, and points beyond the poles (or the ends of any other non-periodic axis) are clamped to the grid.
+
+    Examples:
+        .. code-block:: python
+
+            ds = era5.UWind()["TAVG-01-01 00:00"]
+            interpolator = GridInterpolator.from_dataset(ds, methods={"latitude": "cubic", "longitude": "cubic"},
+                                                         level=[300, 250], latitude=[51.5, 40.6],
+                                                         longitude=[-0.5, -73.8])
+            uwind = interpolator(ds["u_component_of_wind"])
+
+            # the same weights are reused for every timestep
+            for dt, data in era5.UWind().stream(slice("TAVG-01-01 00:00", "TAVG-01-31 23:00")):
+                uwind = interpolator(data)
+    """
+
+    def __init__(self, coordinates: list[np.ndarray], points: list[np.ndarray], methods: list[str] | str = "linear",
+                 periods: list[float | None] | None = None, log: list[bool] | None = None, tension=0, bias=0,
+                 dims: list[str] | None = None):
+        """
+        Args:
+            coordinates: the coordinates of each interpolated axis, which are the last axes of the fields
+            points: the coordinates of the points along each axis, which are broadcast together
+            methods: the method of each axis: 'nearest', 'linear', 'cosine', 'cubic', 'catmull_rom' or 'hermite'
+            periods: the period of each axis, or None for a non-periodic axis
+            log: interpolate each axis in the logarithm of its coordinates (e.g. log-pressure)?
+            tension: the tension of hermite axes
+            bias: the bias of hermite axes
+            dims: the names of the axes, used to order the dimensions of DataArrays
+        """
+        n_axes = len(coordinates)
+        if isinstance(methods, str):
+            methods = [methods] * n_axes
+        if periods is None:
+            periods = [None] * n_axes
+        if log is None:
+            log = [False] * n_axes
+
+        points = np.broadcast_arrays(*(np.asarray(p, dtype="float64") for p in points))
+        self._shape = points[0].shape
+        self._grid_shape = tuple(len(c) for c in coordinates)
+        self._dims = dims
+
+        flat_indices = np.zeros((*self._shape, 1), dtype="int64")
+        weights = np.ones((*self._shape, 1))
+
+        # the stencil of each point is the outer product of the stencils of each axis
+        for size, coords, p, method, period, is_log in zip(self._grid_shape, coordinates, points, methods, periods,
+                                                           log):
+            indices, axis_weights = _axis_stencil(coords, p, method, period, is_log, tension, bias)
+
+            flat_indices = (flat_indices[..., :, None] * size + indices[..., None, :]).reshape(*self._shape, -1)
+            weights = (weights[..., :, None] * axis_weights[..., None, :]).reshape(*self._shape, -1)
+
+        self._indices = flat_indices
+        self._weights = weights.astype("float32")
+
+    @classmethod
+    def from_dataset(cls, ds: xr.Dataset | xr.DataArray, methods: dict[str, str] | None = None, tension=0, bias=0,
+                     **points) -> "GridInterpolator":
+        """
+        Creates an interpolator for the grid of a dataset, longitude being periodic and level being interpolated in
+        log-pressure
+
+        Args:
+            ds: the dataset whose grid to interpolate
+            methods: the method of each dimension (defaults to linear)
+            tension: the tension of hermite dimensions
+            bias: the bias of hermite dimensions
+            **points: the coordinates of the points along each interpolated dimension
+        """
+        methods = methods if methods else {}
+        dims = list(points)
+
+        return cls([ds[dim].values for dim in dims], [points[dim] for dim in dims],
+                   [methods.get(dim, "linear") for dim in dims], [_PERIODS.get(dim) for dim in dims],
+                   [dim in _LOG_AXES for dim in dims], tension, bias, dims)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the stencils & weights, so they need not be computed again
+        """
+        np.savez(path, indices=self._indices, weights=self._weights, grid_shape=np.array(self._grid_shape),
+                 dims=np.array(self._dims if self._dims else [], dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> "GridInterpolator":
+        """
+        Loads an interpolator written by save()
+        """
+        with np.load(path) as archive:
+            interpolator = cls.__new__(cls)
+            interpolator._indices = archive["indices"]
+            interpolator._weights = archive["weights"]
+            interpolator._grid_shape = tuple(archive["grid_shape"].tolist())
+            interpolator._dims = archive["dims"].tolist() or None
+            interpolator._shape = interpolator._indices.shape[:-1]
+        return interpolator
+
+    def __call__(self, field: np.ndarray | xr.DataArray) -> np.ndarray:
+        """
+        Interpolates a field at the points
+
+        Args:
+            field: an array of shape (..., *grid), or a DataArray with the interpolated dimensions
+
+        Returns:
+            an array of shape (..., *points)
+        """
+        if isinstance(field, xr.DataArray):
+            field = field.transpose(..., *self._dims).values if self._dims else field.values
+
+        n_leading = field.ndim - len(self._grid_shape)
+        if field.shape[n_leading:] != self._grid_shape:
+            raise ValueError(f"Field of shape {field.shape} does not end in the grid shape {self._grid_shape}")
+
+        flat = field.reshape(*field.shape[:n_leading], -1)
+        return (flat[..., self._indices] * self._weights).sum(axis=-1)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._shape
+
+    @property
+    def stencil_size(self) -> int:
+        return self._indices.shape[-1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._indices.nbytes + self._weights.nbytes
+
+
+__all__ = ["GridInterpolator"]
@@ -3,6 +3,8 @@
 
 import math
 
+import numpy as np
+
 
 def linear_interpolate(values, index: int, t: float):
     return values[index] * (1 - t) + values[index + 1] * t
@@ -120,3 +122,156 @@ def fit_kochanek_bartels_spline(data, values, index: int, t: float, learning_rat
         tension -= learning_rate * dt
 
     return best_tension, best_bias
+
+
+# Vectorised weights of the 4 points (index - 1, index, index + 1, index + 2) used by the functions above, so that
+# interpolating is a weighted sum: (weights * [p0, p1, p2, p3]).sum(-1)
+def linear_weights(t: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype="float64")
+    zeros = np.zeros_like(t)
+    return np.stack([zeros, 1 - t, t, zeros], axis=-1)
+
+
+def cosine_weights(t: np.ndarray) -> np.ndarray:
+    return linear_weights((1 - np.cos(np.asarray(t) * np.pi)) / 2)
+
+
+def nearest_weights(t: np.ndarray) -> np.ndarray:
+    return linear_weights(np.asarray(t) >= 0.5)
+
+
+def cubic_weights(t: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype="float64")
+    t2 = t * t
+    t3 = t2 * t
+    return np.stack([-t3 + 2 * t2 - t, t3 - 2 * t2 + 1, -t3 + t2 + t, t3 - t2], axis=-1)
+
+
+def catmull_rom_weights(t: np.ndarray) -> np.ndarray:
+    t = np.asarray(t, dtype="float64")
+    t2 = t * t
+    t3 = t2 * t
+    return np.stack([-0.5 * t3 + t2 - 0.5 * t,
+                     1.5 * t3 - 2.5 * t2 + 1,
+                     -1.5 * t3 + 2 * t2 + 0.5 * t,
+                     0.5 * t3 - 0.5 * t2], axis=-1)
+
+
+def hermite_weights(t: np.ndarray, tension: float | np.ndarray = 0, bias: float | np.ndarray = 0) -> np.ndarray:
+    t = np.asarray(t, dtype="float64")
+    t2 = t * t
+    t3 = t2 * t
+
+    a0 = 2 * t3 - 3 * t2 + 1
+    a1 = (t3 - 2 * t2 + t) / 2 * (1 - tension)
+    a2 = (t3 - t2) / 2 * (1 - tension)
+    a3 = -2 * t3 + 3 * t2
+
+    return np.stack([-a1 * (1 + bias),
+                     a0 + 2 * bias * a1 - (1 + bias) * a2,
+                     a3 + (1 - bias) * a1 + 2 * bias * a2,
+                     a2 * (1 - bias)], axis=-1)
+
+
+INTERPOLATION_WEIGHTS = {
+    "nearest": nearest_weights,
+    "linear": linear_weights,
+    "cosine": cosine_weights,
+    "cubic": cubic_weights,
+    "catmull_rom": catmull_rom_weights,
+    "hermite": hermite_weights,
+}
+
+
+def _kochanek_bartels_stencils(coarse: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The points (index - 1, index, index + 1, index + 2) of every interval along the first axis, clamped at the ends
+    """
+    padded = np.concatenate([coarse[:1], coarse, coarse[-1:]])
+    n = len(coarse) - 1
+    return padded[:n], padded[1:n + 1], padded[2:n + 2], padded[3:n + 3]
+
+
+def fit_kochanek_bartels(data: np.ndarray, factor: int, axis: int = 0,
+                         regularisation: float = 1e-3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fits the tension & bias of a Kochanek-Bartels (hermite) spline through every factor-th value along an axis, so that
+    it best reproduces the values in between, independently for every cell of the other axes.
+
+    The interpolated values are linear in (1 - tension) and (1 - tension) * bias, so the least squares fit of every cell
+    is the closed-form solution of a 2x2 system, solved for all cells at once. The regularisation pulls the fit towards
+    tension = bias = 0 (a catmull-rom spline) in cells where the intermediate values barely constrain it.
+
+    @param data: the full-resolution values, whose axis has a length of (n - 1) * factor + 1 for n coarse values
+    @param factor: the ratio of the full & coarse resolutions (e.g. 24 to fit daily values to hourly ones)
+    @param axis: the axis (e.g. time) along which the data is upsampled
+    @param regularisation: the strength of the pull towards tension = bias = 0, relative to the data
+    @return: the tension & bias of every cell, clipped to [-1, 1], with the shape of the data without the axis
+    """
+    data = np.moveaxis(np.asarray(data), axis, 0)
+    if (len(data) - 1) % factor or len(data) <= factor:
+        raise ValueError(f"Expected an axis of length (n - 1) * {factor} + 1, with n > 1, got {len(data)}")
+
+    p0, p1, p2, p3 = (p[:, None] for p in _kochanek_bartels_stencils(data[::factor].astype("float64")))
+    fine = data[:-1].reshape(len(data) // factor, factor, *data.shape[1:])[:, 1:]
+
+    t = np.arange(1, factor, dtype="float64").reshape(-1, *[1] * (data.ndim - 1)) / factor
+    t2 = t * t
+    t3 = t2 * t
+    a1 = (t3 - 2 * t2 + t) / 2
+    a2 = (t3 - t2) / 2
+
+    # data = const + (1 - tension) * a + (1 - tension) * bias * c
+    residual = fine - (2 * t3 - 3 * t2 + 1) * p1 - (-2 * t3 + 3 * t2) * p2
+    a = a1 * (p2 - p0) + a2 * (p3 - p1)
+    c = a1 * (2 * p1 - p0 - p2) + a2 * (2 * p2 - p1 - p3)
+
+    aa = (a * a).sum((0, 1))
+    ac = (a * c).sum((0, 1))
+    cc = (c * c).sum((0, 1))
+    ar = (a * residual).sum((0, 1))
+    cr = (c * residual).sum((0, 1))
+
+    # ridge towards (1 - tension, (1 - tension) * bias) = (1, 0)
+    ridge = regularisation * (aa + cc) / 2
+    aa += ridge
+    cc += ridge
+    ar += ridge
+
+    # cells whose values are constant don't constrain the fit at all
+    determinant = aa * cc - ac * ac
+    constrained = determinant > 0
+    determinant = np.where(constrained, determinant, 1)
+    x = np.where(constrained, (ar * cc - cr * ac) / determinant, 1)
+    y = np.where(constrained, (cr * aa - ar * ac) / determinant, 0)
+
+    tension = np.clip(1 - x, -1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bias = np.clip(np.where(np.abs(x) > 1e-6, y / x, 0), -1, 1)
+
+    dtype = np.result_type(data.dtype, np.float32)
+    return tension.astype(dtype), bias.astype(dtype)
+
+
+def upsample_kochanek_bartels(coarse: np.ndarray, factor: int, tension: float | np.ndarray = 0,
+                              bias: float | np.ndarray = 0, axis: int = 0) -> np.ndarray:
+    """
+    Upsamples values along an axis with a Kochanek-Bartels (hermite) spline, with a tension & bias per cell (e.g. from
+    fit_kochanek_bartels)
+
+    @param coarse: the coarse values
+    @param factor: the number of upsampled values per coarse interval
+    @param tension: the tension, either a scalar or per cell, with the shape of the coarse values without the axis
+    @param bias: the bias, either a scalar or per cell, with the shape of the coarse values without the axis
+    @param axis: the axis (e.g. time) along which the values are upsampled
+    @return: the upsampled values, whose axis has a length of (n - 1) * factor + 1 for n coarse values
+    """
+    coarse = np.moveaxis(np.asarray(coarse), axis, 0)
+    p0, p1, p2, p3 = (p[:, None] for p in _kochanek_bartels_stencils(coarse))
+
+    t = np.arange(factor, dtype="float64").reshape(-1, *[1] * (coarse.ndim - 1)) / factor
+    weights = hermite_weights(t, tension, bias).astype(np.result_type(coarse.dtype, np.float32))
+
+    fine = weights[..., 0] * p0 + weights[..., 1] * p1 + weights[..., 2] * p2 + weights[..., 3] * p3
+    fine = np.concatenate([fine.reshape(-1, *coarse.shape[1:]), coarse[-1:]])
+    return np.moveaxis(fine, 0, axis)
@@ -0,0 +1,129 @@
+"""Kinematic Diagnostics of Wind Fields on the Sphere"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import EARTH_MEAN_RADIUS
+
+
+_RADIUS = EARTH_MEAN_RADIUS * 1000  # meters
+
+
+class SphericalGrid:
+    """
+    The metric factors of a regular latitude/longitude grid, for centred finite differences on the sphere
+
+    Fields have latitude & longitude as their last two axes, with any number of leading axes (e.g. time & level), so
+    whole blocks are differentiated at once. Longitude is periodic, and the latitude derivative is one-sided at the
+    ends of the grid. At the poles, where the zonal derivatives are singular, diagnostics are set to the mean of the
+    adjacent row.
+    """
+
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray):
+        """
+        @param latitude: the latitudes of the grid (in degrees)
+        @param longitude: the equally spaced longitudes of the grid (in degrees), covering the whole globe
+        """
+        self._phi = np.radians(np.asarray(latitude, dtype="float64"))
+        d_lambda = np.radians(abs(float(longitude[1]) - float(longitude[0])))
+
+        cos_phi = np.cos(self._phi)
+        self._poles = np.isclose(cos_phi, 0, atol=1e-8)
+        cos_phi[self._poles] = 0
+
+        # the singular polar rows are NaN until they are filled
+        sec_phi = np.full_like(cos_phi, np.nan)
+        np.divide(1, cos_phi, out=sec_phi, where=~self._poles)
+
+        self._cos_phi = cos_phi[:, None]
+        self._sec_phi = sec_phi[:, None]
+        self._dx = (sec_phi / (2 * d_lambda * _RADIUS))[:, None]  # 1 / (2 a cos(φ) Δλ)
+        self._tan_phi_by_a = (np.tan(self._phi) / _RADIUS)[:, None]
+
+    def ddx(self, field: np.ndarray) -> np.ndarray:
+        """
+        @param field: array of shape (..., latitude, longitude)
+        @return: the eastward derivative, per meter
+        """
+        return (np.roll(field, -1, axis=-1) - np.roll(field, 1, axis=-1)) * self._dx
+
+    def ddy(self, field: np.ndarray) -> np.ndarray:
+        """
+        @param field: array of shape (..., latitude, longitude)
+        @return: the northward derivative, per meter
+        """
+        return np.gradient(field, self._phi, axis=-2) / _RADIUS
+
+    def _fill_poles(self, field: np.ndarray) -> np.ndarray:
+        for i in np.flatnonzero(self._poles):
+            neighbour = 1 if i == 0 else i - 1
+            field[..., i, :] = field[..., neighbour, :].mean(axis=-1, keepdims=True)
+        return field
+
+    def divergence(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        @param u: the eastward wind (in m/s)
+        @param v: the northward wind (in m/s)
+        @return: the horizontal divergence, 1/(a cos φ) (∂u/∂λ + ∂(v cos φ)/∂φ), in 1/s
+        """
+        return self._fill_poles(self.ddx(u) + self.ddy(v * self._cos_phi) * self._sec_phi)
+
+    def vorticity(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        @param u: the eastward wind (in m/s)
+        @param v: the northward wind (in m/s)
+        @return: the relative vorticity, 1/(a cos φ) (∂v/∂λ - ∂(u cos φ)/∂φ), in 1/s
+        """
+        return self._fill_poles(self.ddx(v) - self.ddy(u * self._cos_phi) * self._sec_phi)
+
+    def stretching_deformation(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        @param u: the eastward wind (in m/s)
+        @param v: the northward wind (in m/s)
+        @return: the stretching deformation, ∂u/∂x - ∂v/∂y - v tan(φ) / a, in 1/s
+        """
+        return self._fill_poles(self.ddx(u) - self.ddy(v) - v * self._tan_phi_by_a)
+
+    def shearing_deformation(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        @param u: the eastward wind (in m/s)
+        @param v: the northward wind (in m/s)
+        @return: the shearing deformation, ∂v/∂x + ∂u/∂y + u tan(φ) / a, in 1/s
+        """
+        return self._fill_poles(self.ddx(v) + self.ddy(u) + u * self._tan_phi_by_a)
+
+    def total_deformation(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        @param u: the eastward wind (in m/s)
+        @param v: the northward wind (in m/s)
+        @return: the magnitude of the deformation, in 1/s
+        """
+        return np.hypot(self.stretching_deformation(u, v), self.shearing_deformation(u, v))
+
+    def advection(self, u: np.ndarray, v: np.ndarray, scalar: np.ndarray) -> np.ndarray:
+        """
+        @param u: the eastward wind (in m/s)
+        @param v: the northward wind (in m/s)
+        @param scalar: the advected field
+        @return: the advection of the scalar, -(u ∂s/∂x + v ∂s/∂y), in its units per second
+        """
+        return self._fill_poles(-(u * self.ddx(scalar) + v * self.ddy(scalar)))
+
+
+@lru_cache(maxsize=8)
+def _spherical_grid(latitude: tuple[float, ...], longitude: tuple[float, ...]) -> SphericalGrid:
+    return SphericalGrid(np.array(latitude), np.array(longitude))
+
+
+def spherical_grid(latitude: np.ndarray, longitude: np.ndarray) -> SphericalGrid:
+    """
+    Gets the (cached) metric factors of a grid
+
+    @param latitude: the latitudes of the grid (in degrees)
+    @param longitude: the longitudes of the grid (in degrees)
+    """
+    return _spherical_grid(tuple(np.asarray(latitude).tolist()), tuple(np.asarray(longitude).tolist()))
+
+
+__all__ = ["SphericalGrid", "spherical_grid"]
@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 _PI_BY_4 = math.pi / 4
 _PI_BY_2 = math.pi / 2
 
@@ -207,3 +209,83 @@ def lcc_projection_to_coord(x: float,
             return lat, math.atan(x / (1 - y)) / n + math.pi / n
     else:
         return lat, math.atan(x / (1 - y)) / n
+
+
+# Array versions of the projection, which broadcast over arrays of coordinates
+def lcc_projection_constants(phi1: float,
+                             phi2: float,
+                             phi0: float = 0) -> tuple[float, float, float]:
+    """Returns the n-, F- and rho0-values for the Lambert Conformal Conic Projection
+
+    @param phi1: principal latitude 1 (radians)
+    @param phi2: principal latitude 2 (radians)
+    @param phi0: latitude of the origin (radians)
+    @return: the n, F and rho0 values
+    """
+    if math.isclose(phi1, phi2):  # tangent cone
+        n = math.sin(phi1)
+    else:
+        n = lcc_projection_n(phi1=phi1, phi2=phi2)
+
+    f = math.cos(phi1) * math.tan(_PI_BY_4 + phi1 / 2) ** n / n
+    return n, f, f * math.tan(_PI_BY_4 + phi0 / 2) ** -n
+
+
+def lcc_projection_array(latitude: np.ndarray,
+                         longitude: np.ndarray,
+                         phi1: float,
+                         phi2: float,
+                         lambda0: float = 0,
+                         phi0: float = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the x, y values for coordinates in the Lambert Conformal Conic Projection, on a unit sphere
+
+    With the default origin, this is the same as lcc_projection()
+
+    @param latitude: latitudes of the coordinates (radians)
+    @param longitude: longitudes of the coordinates (radians)
+    @param phi1: principal latitude 1 (radians)
+    @param phi2: principal latitude 2 (radians)
+    @param lambda0: central longitude (radians)
+    @param phi0: latitude of the origin (radians)
+    @return: the x, y values of the coordinates
+    """
+    n, f, rho0 = lcc_projection_constants(phi1=phi1, phi2=phi2, phi0=phi0)
+
+    rho = f * np.tan(_PI_BY_4 + np.asarray(latitude) / 2) ** -n
+    theta = n * (np.mod(np.asarray(longitude) - lambda0 + math.pi, 2 * math.pi) - math.pi)
+
+    return rho * np.sin(theta), rho0 - rho * np.cos(theta)
+
+
+def lcc_projection_to_coord_array(x: np.ndarray,
+                                  y: np.ndarray,
+                                  phi1: float,
+                                  phi2: float,
+                                  lambda0: float = 0,
+                                  phi0: float = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the coordinates for x, y values in the Lambert Conformal Conic Projection, on a unit sphere
+
+    Inverse of lcc_projection_array()
+
+    @param x: x values in projection
+    @param y: y values in projection
+    @param phi1: principal latitude 1 (radians)
+    @param phi2: principal latitude 2 (radians)
+    @param lambda0: central longitude (radians)
+    @param phi0: latitude of the origin (radians)
+    @return: the latitudes, longitudes of the coordinates (radians)
+    """
+    n, f, rho0 = lcc_projection_constants(phi1=phi1, phi2=phi2, phi0=phi0)
+    sign = math.copysign(1, n)
+
+    x = np.asarray(x)
+    dy = rho0 - np.asarray(y)
+
+    rho = sign * np.hypot(x, dy)
+    theta = np.arctan2(sign * x, sign * dy)
+
+    # rho = 0 is the pole at the apex of the cone
+    with np.errstate(divide="ignore"):
+        latitude = 2 * np.arctan((f / rho) ** (1 / n)) - _PI_BY_2
+
+    return latitude, theta / n + lambda0
@@ -0,0 +1,133 @@
+"""Reprojection of Latitude/Longitude Grids onto Lambert Conformal Conic Rasters"""
+
+import hashlib
+import math
+import os
+
+import numpy as np
+import xarray as xr
+
+from .constants import EARTH_MEAN_RADIUS
+from .grid import GridInterpolator
+from .projections import lcc_projection_array, lcc_projection_to_coord_array
+
+
+CACHE_FOLDER = "~/.cache/era5/reprojection"
+
+
+class LambertConformalReprojector:
+    """
+    Reprojects fields on a latitude/longitude grid onto a regular x/y raster in a Lambert Conformal Conic projection.
+
+    The source stencil & weights of every raster cell are computed once per (projection, raster, source grid, method)
+    and cached on disk, so reprojecting any field or timestep afterwards is a single gather.
+
+    Examples:
+        .. code-block:: python
+
+            ds = era5.UWind()["TAVG-01-01 00:00", 250]
+            reprojector = LambertConformalReprojector.from_extent(ds["latitude"], ds["longitude"],
+                                                                  phi1=33, phi2=45, lambda0=-96, phi0=39,
+                                                                  extent=(-2500, 2500, -1800, 1800), resolution=25)
+            raster = reprojector(ds["u_component_of_wind"])
+    """
+
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray, phi1: float, phi2: float, lambda0: float,
+                 phi0: float, x: np.ndarray, y: np.ndarray, method: str = "linear",
+                 cache_folder: str | None = CACHE_FOLDER):
+        """
+        Args:
+            latitude: the latitudes of the source grid (in degrees)
+            longitude: the longitudes of the source grid (in degrees)
+            phi1: principal latitude 1 (in degrees)
+            phi2: principal latitude 2 (in degrees)
+            lambda0: central longitude (in degrees)
+            phi0: latitude of the origin (in degrees)
+            x: the x coordinates of the raster columns (in kilometers)
+            y: the y coordinates of the raster rows (in kilometers)
+            method: the interpolation method of both axes, see GridInterpolator
+            cache_folder: the folder to cache the weights in, or None to not cache them
+        """
+        self._params = (phi1, phi2, lambda0, phi0)
+        self._x = np.asarray(x, dtype="float64")
+        self._y = np.asarray(y, dtype="float64")
+
+        latitude = np.asarray(latitude, dtype="float64")
+        longitude = np.asarray(longitude, dtype="float64")
+
+        key = hashlib.sha1()
+        for array in (np.array([*self._params]), self._x, self._y, latitude, longitude):
+            key.update(array.tobytes())
+        key.update(method.encode())
+
+        path = None
+        if cache_folder is not None:
+            folder = os.path.expanduser(cache_folder)
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"lcc-{key.hexdigest()}.npz")
+
+        if path is not None and os.path.exists(path):
+            self._interpolator = GridInterpolator.load(path)
+        else:
+            lat, lon = self.coordinates()
+            self._interpolator = GridInterpolator([latitude, longitude], [lat, lon], method, [None, 360.0],
+                                                  dims=["latitude", "longitude"])
+            if path is not None:
+                self._interpolator.save(path)
+
+    @classmethod
+    def from_extent(cls, latitude: np.ndarray, longitude: np.ndarray, phi1: float, phi2: float, lambda0: float,
+                    phi0: float, extent: tuple[float, float, float, float], resolution: float, method: str = "linear",
+                    cache_folder: str | None = CACHE_FOLDER) -> "LambertConformalReprojector":
+        """
+        Creates a reprojector onto a raster covering an extent of the projection
+
+        Args:
+            extent: the (x min, x max, y min, y max) of the raster (in kilometers from the origin)
+            resolution: the size of each raster cell (in kilometers)
+        """
+        x_min, x_max, y_min, y_max = extent
+        x = np.arange(x_min, x_max + resolution / 2, resolution)
+        y = np.arange(y_max, y_min - resolution / 2, -resolution)
+        return cls(latitude, longitude, phi1, phi2, lambda0, phi0, x, y, method, cache_folder)
+
+    def _radians(self) -> tuple[float, ...]:
+        return tuple(map(math.radians, self._params))
+
+    def coordinates(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The latitude & longitude (in degrees) of each raster cell, each of shape (y, x)
+        """
+        x, y = np.meshgrid(self._x / EARTH_MEAN_RADIUS, self._y / EARTH_MEAN_RADIUS)
+        lat, lon = lcc_projection_to_coord_array(x, y, *self._radians())
+        return np.degrees(lat), np.degrees(lon)
+
+    def project(self, latitude: np.ndarray, longitude: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Projects coordinates (in degrees) onto the raster's x/y coordinates (in kilometers), e.g. to overlay routes
+        """
+        x, y = lcc_projection_array(np.radians(latitude), np.radians(longitude), *self._radians())
+        return x * EARTH_MEAN_RADIUS, y * EARTH_MEAN_RADIUS
+
+    def __call__(self, field: np.ndarray | xr.DataArray) -> np.ndarray:
+        """
+        Reprojects a field
+
+        Args:
+            field: an array of shape (..., latitude, longitude), or a DataArray with latitude & longitude dimensions
+
+        Returns:
+            an array of shape (..., y, x)
+        """
+        return self._interpolator(field)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y
+
+
+__all__ = ["LambertConformalReprojector", "CACHE_FOLDER"]
@@ -0,0 +1,111 @@
+"""Sampling of Gridded Data along Great Circle Paths"""
+
+import numpy as np
+import xarray as xr
+
+from .bearings import intermediate_coordinates_array
+from .gcd import great_circle_distance_degrees_array
+from .grid import GridInterpolator
+
+
+class GreatCirclePath:
+    """
+    A path along the great circles between waypoints, densified into equally spaced points, at which fields are
+    sampled to give vertical cross-sections.
+
+    The interpolation weights of the points are computed once per latitude/longitude grid and reused for every level
+    and timestep of the fields, so a cross-section costs a single gather.
+
+    Examples:
+        .. code-block:: python
+
+            path = GreatCirclePath([51.47, 40.64], [-0.45, -73.78], spacing=25)
+
+            ds = era5.Temperature()["TAVG-01-01 00:00"]
+            section = path(ds["temperature"])  # (level, distance)
+    """
+
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray, spacing: float = 50, n_points: int | None = None):
+        """
+        @param latitude: the latitudes of the waypoints (in degrees)
+        @param longitude: the longitudes of the waypoints (in degrees)
+        @param spacing: the maximum distance between points (in kilometers)
+        @param n_points: the number of points, overriding the spacing
+        """
+        latitude = np.asarray(latitude, dtype="float64")
+        longitude = np.asarray(longitude, dtype="float64")
+        if len(latitude) < 2 or len(latitude) != len(longitude):
+            raise ValueError("A path needs at least 2 waypoints, each with a latitude & longitude")
+
+        length = great_circle_distance_degrees_array(latitude[:-1], longitude[:-1], latitude[1:], longitude[1:])
+        cumulative = np.concatenate([[0], np.cumsum(length)])
+        total = cumulative[-1]
+
+        if n_points is None:
+            n_points = max(int(np.ceil(total / spacing)), 1) + 1
+        distance = np.linspace(0, total, n_points)
+
+        # the segment of each point, and how far along the segment it is
+        segment = np.clip(np.searchsorted(cumulative, distance, side="right") - 1, 0, len(length) - 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fraction = np.nan_to_num(np.clip((distance - cumulative[segment]) / length[segment], 0, 1))
+
+        lat, lon = intermediate_coordinates_array(np.radians(latitude[segment]), np.radians(longitude[segment]),
+                                                  np.radians(latitude[segment + 1]),
+                                                  np.radians(longitude[segment + 1]), fraction)
+
+        self._distance = distance
+        self._latitude = np.degrees(lat)
+        self._longitude = np.degrees(lon)
+        self._waypoints = np.stack([latitude, longitude], axis=-1)
+        self._interpolators: dict[tuple, GridInterpolator] = {}
+
+    def interpolator(self, latitude: np.ndarray, longitude: np.ndarray, method: str = "linear") -> GridInterpolator:
+        """
+        Gets the (cached) interpolator of a latitude/longitude grid at the points of the path
+
+        @param latitude: the latitudes of the grid (in degrees)
+        @param longitude: the longitudes of the grid (in degrees)
+        @param method: the interpolation method, see GridInterpolator
+        """
+        key = (method, tuple(np.asarray(latitude).tolist()), tuple(np.asarray(longitude).tolist()))
+        if key not in self._interpolators:
+            self._interpolators[key] = GridInterpolator([latitude, longitude], [self._latitude, self._longitude],
+                                                        method, [None, 360.0], dims=["latitude", "longitude"])
+        return self._interpolators[key]
+
+    def __call__(self, field: xr.DataArray, method: str = "linear") -> xr.DataArray:
+        """
+        Samples a field along the path
+
+        @param field: a DataArray with latitude & longitude dimensions, and any others (e.g. level & time)
+        @param method: the interpolation method, see GridInterpolator
+        @return: a DataArray whose latitude & longitude dimensions are replaced by the distance along the path
+        """
+        values = self.interpolator(field["latitude"].values, field["longitude"].values, method)(field)
+        dims = [dim for dim in field.dims if dim not in ("latitude", "longitude")]
+
+        coords = {name: coord for name, coord in field.coords.items()
+                  if not {"latitude", "longitude"} & {name, *coord.dims}}
+        coords |= {"distance": self._distance, "latitude": ("distance", self._latitude),
+                   "longitude": ("distance", self._longitude)}
+        return xr.DataArray(values, dims=[*dims, "distance"], coords=coords, name=field.name, attrs=field.attrs)
+
+    @property
+    def distance(self) -> np.ndarray:
+        return self._distance
+
+    @property
+    def latitude(self) -> np.ndarray:
+        return self._latitude
+
+    @property
+    def longitude(self) -> np.ndarray:
+        return self._longitude
+
+    @property
+    def waypoints(self) -> np.ndarray:
+        return self._waypoints
+
+
+__all__ = ["GreatCirclePath"]
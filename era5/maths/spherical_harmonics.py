@@ -0,0 +1,156 @@
+"""Spherical Harmonic Transform"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def legendre_offsets(lmax: int, mmax: int) -> np.ndarray:
+    """
+    The index of the first (l = m) coefficient of each order m in a packed table, followed by the table's length
+
+    @param lmax: the maximum degree
+    @param mmax: the maximum order
+    """
+    lengths = lmax + 1 - np.arange(mmax + 1)
+    return np.concatenate([[0], np.cumsum(lengths)])
+
+
+@lru_cache(maxsize=8)
+def _legendre_table(lmax: int, mmax: int, sin_latitudes: tuple[float, ...]) -> tuple[np.ndarray, ...]:
+    mu = np.array(sin_latitudes)
+    sin_theta = np.sqrt(1 - mu ** 2)
+    offsets = legendre_offsets(lmax, mmax)
+
+    table = np.empty((offsets[-1], len(mu)), dtype="float32")
+
+    # sectoral functions, P(m, m), by cumulative product over m
+    m = np.arange(1, mmax + 1)
+    factors = np.sqrt((2 * m + 1) / (2 * m))[:, None] * sin_theta
+    sectoral = np.concatenate([np.full((1, len(mu)), 2 ** -0.5), factors])
+    sectoral = np.cumprod(sectoral, axis=0)
+
+    # recurrence in degree l, vectorised over the orders m
+    prev2 = None
+    prev1 = None
+    for l in range(lmax + 1):
+        n_m = min(l, mmax) + 1
+        current = np.empty((n_m, len(mu)))
+
+        if l <= mmax:
+            current[l] = sectoral[l]
+        if 0 < l <= mmax + 1:
+            current[l - 1] = np.sqrt(2 * l + 1) * mu * sectoral[l - 1]
+        if l >= 2:
+            m = np.arange(min(l - 2, mmax) + 1)[:, None]
+            a = np.sqrt((4 * l ** 2 - 1) / (l ** 2 - m ** 2))
+            b = np.sqrt(((l - 1) ** 2 - m ** 2) / (4 * (l - 1) ** 2 - 1))
+            current[:len(m)] = a * (mu * prev1[:len(m)] - b * prev2[:len(m)])
+
+        table[offsets[:n_m] + l - np.arange(n_m)] = current
+        prev2, prev1 = prev1, current
+
+    table.setflags(write=False)
+    return tuple(table[offsets[m]:offsets[m + 1]] for m in range(mmax + 1))
+
+
+def legendre_table(lmax: int, mmax: int, latitudes: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    Computes the orthonormal associated Legendre functions at a set of latitudes. Tables are cached.
+
+    @param lmax: the maximum degree
+    @param mmax: the maximum order
+    @param latitudes: the latitudes (in degrees)
+    @return: a tuple with an array of shape (lmax - m + 1, latitude) for each order m, normalised so that the
+             integral of P(l, m)² over sin(latitude) from -1 to 1 is 1
+    """
+    return _legendre_table(lmax, mmax, tuple(np.sin(np.radians(latitudes)).tolist()))
+
+
+def quadrature_weights(latitudes: np.ndarray, grid: str = "regular") -> np.ndarray:
+    """
+    Computes the weights to integrate over sin(latitude) on a grid of latitudes
+
+    @param latitudes: the latitudes (in degrees)
+    @param grid: 'regular' for equally spaced latitudes including both poles (Clenshaw-Curtis quadrature) or
+                 'gaussian' for Gaussian latitudes (Gauss-Legendre quadrature)
+    @return: the weight of each latitude, which sum to 2
+    """
+    latitudes = np.asarray(latitudes, dtype="float64")
+    n = len(latitudes) - 1
+
+    if grid == "gaussian":
+        nodes, weights = np.polynomial.legendre.leggauss(len(latitudes))
+        order = np.argsort(np.argsort(np.sin(np.radians(latitudes))))
+        if not np.allclose(np.sin(np.radians(latitudes)), nodes[order], atol=1e-6):
+            raise ValueError("Latitudes are not a Gaussian grid")
+        return weights[order]
+
+    if grid != "regular":
+        raise ValueError(f"Unknown grid '{grid}'")
+
+    colatitudes = np.radians(90 - latitudes)
+    if not np.allclose(np.abs(np.diff(colatitudes)), np.pi / n):
+        raise ValueError("Latitudes must be equally spaced and include both poles")
+
+    k = np.arange(1, n // 2 + 1)
+    b = np.where(2 * k == n, 1, 2)
+    c = np.full(n + 1, 2.0)
+    c[[0, -1]] = 1
+
+    return c / n * (1 - np.cos(2 * np.outer(colatitudes, k)) @ (b / (4 * k ** 2 - 1)))
+
+
+def spherical_harmonic_analysis(data: np.ndarray, latitudes: np.ndarray, lmax: int,
+                                grid: str = "regular") -> np.ndarray:
+    """
+    Computes the spherical harmonic coefficients of data on a latitude/longitude grid
+
+    @param data: array of shape (..., latitude, longitude), with longitudes equally spaced around the globe
+    @param latitudes: the latitudes (in degrees) of the data
+    @param lmax: the maximum degree of the transform
+    @param grid: the type of latitude grid, see quadrature_weights()
+    @return: complex array of shape (..., coefficient), packed by order m then degree l (see legendre_index())
+    """
+    mmax = min(lmax, data.shape[-1] // 2)
+    table = legendre_table(lmax, mmax, latitudes)
+
+    fourier = np.fft.rfft(data, axis=-1, norm="forward")
+    fourier *= quadrature_weights(latitudes, grid)[:, None]
+
+    return np.concatenate([fourier[..., m] @ table[m].T for m in range(mmax + 1)], axis=-1)
+
+
+def spherical_harmonic_synthesis(coefficients: np.ndarray, latitudes: np.ndarray, n_longitudes: int,
+                                 lmax: int) -> np.ndarray:
+    """
+    Evaluates spherical harmonic coefficients on a latitude/longitude grid
+
+    @param coefficients: the output of spherical_harmonic_analysis()
+    @param latitudes: the latitudes (in degrees) to evaluate at
+    @param n_longitudes: the number of equally spaced longitudes to evaluate at
+    @param lmax: the maximum degree of the coefficients
+    @return: array of shape (..., latitude, longitude)
+    """
+    mmax = min(lmax, n_longitudes // 2)
+    table = legendre_table(lmax, mmax, latitudes)
+    offsets = legendre_offsets(lmax, mmax)
+
+    fourier = np.zeros((*coefficients.shape[:-1], len(latitudes), n_longitudes // 2 + 1), dtype="complex128")
+    for m in range(mmax + 1):
+        fourier[..., m] = coefficients[..., offsets[m]:offsets[m + 1]] @ table[m]
+
+    return np.fft.irfft(fourier, n_longitudes, axis=-1, norm="forward")
+
+
+def legendre_index(lmax: int, mmax: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The degree l and order m of each packed spherical harmonic coefficient
+
+    @param lmax: the maximum degree
+    @param mmax: the maximum order
+    @return: the degrees and orders
+    """
+    m = np.concatenate([np.full(lmax + 1 - m, m) for m in range(mmax + 1)])
+    l = np.concatenate([np.arange(m, lmax + 1) for m in range(mmax + 1)])
+    return l, m
@@ -0,0 +1,124 @@
+"""Clear-Air Turbulence Diagnostics of Atmospheric Columns"""
+
+import numpy as np
+
+from .barometric import DRY_AIR_GAS_CONSTANT, GRAVITATIONAL_ACCELERATION
+
+
+SPECIFIC_HEAT_DRY_AIR = 1004.  # J/(kg K), at constant pressure
+POISSON_CONSTANT = DRY_AIR_GAS_CONSTANT / SPECIFIC_HEAT_DRY_AIR
+REFERENCE_PRESSURE = 100000  # Pascals
+
+
+def _level_shape(pressure: np.ndarray, ndim: int, axis: int) -> np.ndarray:
+    shape = [1] * ndim
+    shape[axis] = -1
+    return np.asarray(pressure, dtype="float64").reshape(shape)
+
+
+def vertical_derivative(field: np.ndarray, heights: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    Differentiates a field with respect to height, from the differences between adjacent levels of each column.
+
+    The derivative at each level is the mean of the slopes of the layers above & below it, each weighted by the
+    thickness of the other, which is the centred difference on unevenly spaced levels. The highest & lowest levels take
+    the slope of their only layer.
+
+    @param field: the field at each level, of any shape with a level axis
+    @param heights: the geometric height (in meters) of each level, with the same shape as the field
+    @param axis: the level axis
+    @return: the derivative (per meter) at each level, with the same shape as the field
+    """
+    field = np.moveaxis(np.asarray(field), axis, 0)
+    heights = np.moveaxis(np.asarray(heights), axis, 0)
+
+    thickness = np.diff(heights, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.diff(field, axis=0) / thickness
+
+    thickness = np.abs(thickness)
+    derivative = np.empty(np.broadcast_shapes(field.shape, heights.shape), dtype=slopes.dtype)
+    derivative[0] = slopes[0]
+    derivative[-1] = slopes[-1]
+    derivative[1:-1] = ((thickness[1:] * slopes[:-1] + thickness[:-1] * slopes[1:]) /
+                        (thickness[1:] + thickness[:-1]))
+    return np.moveaxis(derivative, 0, axis)
+
+
+def potential_temperature(temperature: np.ndarray, pressure: np.ndarray) -> np.ndarray:
+    """
+    Calculates the potential temperature, θ, of air brought adiabatically to a pressure of 1000 hPa
+
+    @param temperature: the temperature (in Kelvin)
+    @param pressure: the pressure (in Pascals), broadcastable against the temperature
+    @return: the potential temperature (in Kelvin)
+    """
+    return temperature * (REFERENCE_PRESSURE / np.asarray(pressure)) ** POISSON_CONSTANT
+
+
+def vertical_wind_shear(u: np.ndarray, v: np.ndarray, heights: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    Calculates the magnitude of the vertical shear of the horizontal wind, |∂V/∂z|
+
+    @param u: the eastward wind (in m/s) at each level
+    @param v: the northward wind (in m/s) at each level
+    @param heights: the geometric height (in meters) of each level
+    @param axis: the level axis
+    @return: the vertical wind shear (in s⁻¹) at each level
+    """
+    return np.hypot(vertical_derivative(u, heights, axis), vertical_derivative(v, heights, axis))
+
+
+def brunt_vaisala_frequency_squared(temperature: np.ndarray, pressure: np.ndarray, heights: np.ndarray,
+                                    axis: int = 0) -> np.ndarray:
+    """
+    Calculates the square of the Brunt-Väisälä frequency, N² = g/θ ∂θ/∂z, the static stability of each column
+
+    @param temperature: the temperature (in Kelvin) at each level
+    @param pressure: the pressure (in Pascals) of each level, along the level axis
+    @param heights: the geometric height (in meters) of each level
+    @param axis: the level axis
+    @return: N² (in s⁻²) at each level
+    """
+    theta = potential_temperature(temperature, _level_shape(pressure, np.ndim(temperature), axis))
+    return GRAVITATIONAL_ACCELERATION / theta * vertical_derivative(theta, heights, axis)
+
+
+def richardson_number(u: np.ndarray, v: np.ndarray, temperature: np.ndarray, pressure: np.ndarray,
+                      heights: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    Calculates the gradient Richardson number, Ri = N² / |∂V/∂z|², the ratio of static stability to wind shear.
+    Values below 1/4 indicate dynamically unstable layers (Kelvin-Helmholtz instability), and are associated with
+    clear-air turbulence.
+
+    @param u: the eastward wind (in m/s) at each level
+    @param v: the northward wind (in m/s) at each level
+    @param temperature: the temperature (in Kelvin) at each level
+    @param pressure: the pressure (in Pascals) of each level, along the level axis
+    @param heights: the geometric height (in meters) of each level
+    @param axis: the level axis
+    @return: the (dimensionless) Richardson number at each level, infinite where there is no shear
+    """
+    shear = vertical_wind_shear(u, v, heights, axis)
+    stability = brunt_vaisala_frequency_squared(temperature, pressure, heights, axis)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return stability / shear ** 2
+
+
+def ellrod_index(shear: np.ndarray, deformation: np.ndarray, divergence: np.ndarray | None = None) -> np.ndarray:
+    """
+    Calculates the Ellrod turbulence index, TI1 = VWS × DEF, or TI2 = VWS × (DEF + CVG) if the divergence is given
+
+    @param shear: the vertical wind shear (in s⁻¹)
+    @param deformation: the total deformation of the horizontal wind (in s⁻¹)
+    @param divergence: the divergence of the horizontal wind (in s⁻¹), whose negative is the convergence
+    @return: the turbulence index (in s⁻²)
+    """
+    if divergence is None:
+        return shear * deformation
+    return shear * (deformation - divergence)
+
+
+__all__ = ["vertical_derivative", "potential_temperature", "vertical_wind_shear",
+           "brunt_vaisala_frequency_squared", "richardson_number", "ellrod_index"]
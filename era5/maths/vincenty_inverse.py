@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 
 # Correction factor as used by DEFRA
 # see https://www.eci.ox.ac.uk/research/energy/downloads/jardine09-carboninflights.pdf for comparisons
@@ -127,3 +129,103 @@ def __vincenty_inverse(longitude_difference, aux_lat2, sin_aux_lat1, cos_aux_lat
                                                             * (4 * sin_sigma ** 2 - 3) * (2 * cos4_sigma_m - 3)))
 
     return POLAR_RADIUS * (1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))) * (sigma - delta_sig)
+
+
+# Array version of vincenty_inverse(), which broadcasts over arrays of coordinates
+def vincenty_inverse_array(lat1: np.ndarray,
+                           lon1: np.ndarray,
+                           lat2: np.ndarray,
+                           lon2: np.ndarray,
+                           iterations: int = 200,
+                           tol: float = 10 ** -12) -> np.ndarray:
+    """Finds the length of the shortest path, in kilometers, along the surface of an oblate sphere between each pair of
+    coordinates
+
+    Each pair stops iterating as soon as it converges, and coincident coordinates have a distance of 0
+
+    @param lat1: latitudes of coordinate 1 (in degrees)
+    @param lon1: longitudes of coordinate 1 (in degrees)
+    @param lat2: latitudes of coordinate 2 (in degrees)
+    @param lon2: longitudes of coordinate 2 (in degrees)
+
+    @param iterations: the maximum number of times to iterate the function
+    @param tol: the tolerance level at which to stop iteration
+
+    @return: the distances in kilometers between each pair of coordinates
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(*(np.asarray(x, dtype="float64") for x in (lat1, lon1, lat2, lon2)))
+
+    aux_lat1 = np.arctan(FLATTENING_INVERSE * np.tan(np.radians(lat1)))
+    aux_lat2 = np.arctan(FLATTENING_INVERSE * np.tan(np.radians(lat2)))
+
+    longitude_difference = np.radians(lon2 - lon1)
+
+    distance = __vincenty_inverse_array(longitude_difference.reshape(-1), aux_lat2.reshape(-1),
+                                        np.sin(aux_lat1).reshape(-1), np.cos(aux_lat1).reshape(-1), iterations, tol)
+    return distance.reshape(lat1.shape)[()]
+
+
+def __vincenty_inverse_array(longitude_difference, aux_lat2, sin_aux_lat1, cos_aux_lat1, iterations, tol):
+    lambda_ = longitude_difference.copy()
+
+    sin_aux_lat2 = np.sin(aux_lat2)
+    cos_aux_lat2 = np.cos(aux_lat2)
+
+    sin_aux_lat1_times_sin_aux_lat2 = sin_aux_lat1 * sin_aux_lat2
+    cos_aux_lat1_times_cos_aux_lat2 = cos_aux_lat1 * cos_aux_lat2
+    cos_aux_lat1_times_sin_aux_lat2 = cos_aux_lat1 * sin_aux_lat2
+    cos_aux_lat2_times_sin_aux_lat1 = cos_aux_lat2 * sin_aux_lat1
+
+    sigma = np.zeros_like(lambda_)
+    cos_sq_alpha = np.zeros_like(lambda_)
+    cos2_sigma_m = np.zeros_like(lambda_)
+    sin_sigma = np.zeros_like(lambda_)
+    cos_sigma = np.zeros_like(lambda_)
+
+    # the indices of the pairs that have not converged yet
+    active = np.arange(len(lambda_))
+
+    for i in range(iterations):
+        lam = lambda_[active]
+        sin_lambda = np.sin(lam)
+        cos_lambda = np.cos(lam)
+
+        sin_sig = np.hypot(sin_lambda * cos_aux_lat2[active], cos_aux_lat1_times_sin_aux_lat2[active]
+                           - cos_aux_lat2_times_sin_aux_lat1[active] * cos_lambda)
+        cos_sig = sin_aux_lat1_times_sin_aux_lat2[active] + cos_aux_lat1_times_cos_aux_lat2[active] * cos_lambda
+
+        sig = np.arctan2(sin_sig, cos_sig)
+
+        # coincident points have no azimuth
+        sin_alpha = np.divide(cos_aux_lat1_times_cos_aux_lat2[active] * sin_lambda, sin_sig,
+                              out=np.zeros_like(sin_sig), where=sin_sig != 0)
+        cos_sq_alp = 1 - sin_alpha ** 2
+
+        # lines along the equator have cos²(alpha) = 0
+        cos2_sig_m = cos_sig - np.divide(2 * sin_aux_lat1_times_sin_aux_lat2[active], cos_sq_alp,
+                                         out=np.zeros_like(cos_sig), where=cos_sq_alp != 0)
+        cos2_sig_m[cos_sq_alp == 0] = 0
+
+        c = EARTH_FLATTENING / 16 * cos_sq_alp * (EARTH_FLATTENING + 4) * (4 - 3 * cos_sq_alp)
+
+        lambda_[active] = longitude_difference[active] + (1 - c) * EARTH_FLATTENING * sin_alpha * (
+                sig + c * sin_sig * (cos2_sig_m + c * cos_sig * (-1 + 2 * cos2_sig_m ** 2)))
+
+        sigma[active] = sig
+        sin_sigma[active] = sin_sig
+        cos_sigma[active] = cos_sig
+        cos_sq_alpha[active] = cos_sq_alp
+        cos2_sigma_m[active] = cos2_sig_m
+
+        active = active[np.abs(lam - lambda_[active]) >= tol]
+        if not len(active):  # successful convergence of every pair
+            break
+
+    u_sq = cos_sq_alpha * RADIUS_QUOTIENT
+    b = (u_sq / 1024) * (256 + u_sq * (u_sq * (74 - 47 * u_sq) - 128))
+
+    cos4_sigma_m = 2 * cos2_sigma_m ** 2
+    delta_sig = b * sin_sigma * (cos2_sigma_m + 0.25 * b * (cos_sigma * (cos4_sigma_m - 1) - 0.16667 * b * cos2_sigma_m
+                                                            * (4 * sin_sigma ** 2 - 3) * (2 * cos4_sigma_m - 3)))
+
+    return POLAR_RADIUS * (1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))) * (sigma - delta_sig)
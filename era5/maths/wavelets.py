@@ -0,0 +1,135 @@
+"""Discrete Wavelet Transforms by Lifting"""
+
+import numpy as np
+
+
+# Each lifting step is (type, coefficient of left neighbour, coefficient of right neighbour), followed by the scaling
+_WAVELETS = {
+    "haar": ([("predict", -1, 0), ("update", 0, 0.5)], 2 ** 0.5),
+    "cdf97": ([("predict", -1.586134342059924, -1.586134342059924),
+               ("update", -0.052980118572961, -0.052980118572961),
+               ("predict", 0.882911075530934, 0.882911075530934),
+               ("update", 0.443506852043971, 0.443506852043971)], 1.149604398860241),
+}
+
+
+def _lift(even: np.ndarray, odd: np.ndarray, steps, inverse: bool) -> None:
+    for step, left, right in (reversed(steps) if inverse else steps):
+        sign = -1 if inverse else 1
+
+        # missing neighbours at the boundaries are mirrored (symmetric extension)
+        if step == "predict":  # odd samples are predicted from their even neighbours
+            even_right = np.concatenate([even[1:], even[-1:]])[:len(odd)]
+            odd += sign * (left * even[:len(odd)] + right * even_right)
+        else:  # even samples are updated from their odd neighbours
+            odd_left = np.concatenate([odd[:1], odd])[:len(even)]
+            odd_right = np.concatenate([odd, odd[-1:]])[:len(even)]
+            even += sign * (left * odd_left + right * odd_right)
+
+
+def dwt(data: np.ndarray, axis: int = -1, wavelet: str = "cdf97") -> tuple[np.ndarray, np.ndarray]:
+    """
+    Single level discrete wavelet transform along an axis of any length
+
+    @param data: the array to transform
+    @param axis: the axis along which to transform
+    @param wavelet: 'haar' or 'cdf97' (the biorthogonal Cohen-Daubechies-Feauveau 9/7 wavelet)
+    @return: the approximation & detail coefficients, with ceil(n / 2) and floor(n / 2) samples along the axis
+    """
+    steps, scale = _WAVELETS[wavelet]
+
+    data = np.moveaxis(np.asarray(data, dtype="float64"), axis, 0)
+    even = data[0::2].copy()
+    odd = data[1::2].copy()
+
+    if len(odd):
+        _lift(even, odd, steps, inverse=False)
+
+    return (np.ascontiguousarray(np.moveaxis(even * scale, 0, axis)),
+            np.ascontiguousarray(np.moveaxis(odd / scale, 0, axis)))
+
+
+def idwt(approx: np.ndarray, detail: np.ndarray, axis: int = -1, wavelet: str = "cdf97") -> np.ndarray:
+    """
+    Inverse of dwt()
+
+    @param approx: the approximation coefficients
+    @param detail: the detail coefficients
+    @param axis: the axis along which to transform
+    @param wavelet: 'haar' or 'cdf97'
+    @return: the reconstructed array
+    """
+    steps, scale = _WAVELETS[wavelet]
+
+    even = np.moveaxis(approx, axis, 0) / scale
+    odd = np.moveaxis(detail, axis, 0) * scale
+
+    if len(odd):
+        _lift(even, odd, steps, inverse=True)
+
+    data = np.empty((len(even) + len(odd), *even.shape[1:]), dtype=np.result_type(even, odd))
+    data[0::2] = even
+    data[1::2] = odd
+    return np.ascontiguousarray(np.moveaxis(data, 0, axis))
+
+
+def wavedec2(data: np.ndarray, levels: int, wavelet: str = "cdf97") -> list[np.ndarray]:
+    """
+    Multi-level 2D discrete wavelet transform over the last two axes
+
+    @param data: array of shape (..., rows, columns)
+    @param levels: the number of decomposition levels
+    @param wavelet: 'haar' or 'cdf97'
+    @return: the coefficient bands ordered from coarse to fine: the approximation, then the (LH, HL, HH) detail bands
+             of each level from the coarsest to the finest
+    """
+    bands = []
+    approx = data
+
+    for _ in range(levels):
+        low, high = dwt(approx, -1, wavelet)
+        approx, lh = dwt(low, -2, wavelet)
+        hl, hh = dwt(high, -2, wavelet)
+        bands = [lh, hl, hh] + bands
+
+    return [approx] + bands
+
+
+def waverec2(bands: list[np.ndarray], wavelet: str = "cdf97") -> np.ndarray:
+    """
+    Inverse of wavedec2(). Passing only the first 1 + 3 * k bands reconstructs a preview at the resolution of the k-th
+    coarsest level.
+
+    @param bands: the coefficient bands ordered from coarse to fine
+    @param wavelet: 'haar' or 'cdf97'
+    @return: the reconstructed array
+    """
+    approx = bands[0]
+
+    for i in range(1, len(bands), 3):
+        lh, hl, hh = bands[i:i + 3]
+        low = idwt(approx, lh, -2, wavelet)
+        high = idwt(hl, hh, -2, wavelet)
+        approx = idwt(low, high, -1, wavelet)
+
+    return approx
+
+
+def band_shapes(shape: tuple[int, ...], levels: int) -> list[tuple[int, ...]]:
+    """
+    The shapes of the bands returned by wavedec2() for an array of a given shape
+
+    @param shape: the shape of the array
+    @param levels: the number of decomposition levels
+    @return: the shape of each band, ordered from coarse to fine
+    """
+    *leading, rows, cols = shape
+    shapes = []
+
+    for _ in range(levels):
+        lo_rows, hi_rows = (rows + 1) // 2, rows // 2
+        lo_cols, hi_cols = (cols + 1) // 2, cols // 2
+        shapes = [(*leading, hi_rows, lo_cols), (*leading, lo_rows, hi_cols), (*leading, hi_rows, hi_cols)] + shapes
+        rows, cols = lo_rows, lo_cols
+
+    return [(*leading, rows, cols)] + shapes
@@ -1 +1,12 @@
+from .abstract import *
+from .backend import *
 from .fourier import *
+from .rate_distortion import *
+from .spectral import *
+from .harmonic import *
+from .spherical import *
+from .wavelet import *
+from .float16 import *
+from .benchmark import *
+from .container import *
+from .eof import *
@@ -0,0 +1,169 @@
+import numpy as np
+
+import era5
+from era5.util.util import format_bytes
+from era5.variables.text import format_unit
+from era5.maths.error import *
+
+
+# The size of the stored archive: 25 variables at 721 x 1440 for every hour of the year, as uint16
+ARCHIVE_BYTES = 2 * 24 * 365 * 25 * 721 * 1440
+
+
+class CompressionModel:
+    """
+    A lossy model of a slice of a variable, selected with variable[*indices].
+    Subclasses encode the data in fft() and decode it in predict().
+    """
+
+    def __init__(self, variable: era5.AtmosphericVariable, indices: list, quantile: float = 0.75):
+        self._variable = variable
+        self._indices = indices.copy()
+        self._quantile = quantile
+
+        self._dset = None
+        self._data = None
+        self._load()
+
+        self._prediction = None
+
+    @classmethod
+    def _without_data(cls, variable: era5.AtmosphericVariable, indices: list, quantile: float):
+        """
+        Creates a model without reading its data, e.g. to decode stored coefficients. The data is read on demand.
+        """
+        model = cls.__new__(cls)
+        model._variable = variable
+        model._indices = indices.copy()
+        model._quantile = quantile
+        model._dset = None
+        model._data = None
+        model._prediction = None
+        return model
+
+    def _load(self) -> None:
+        self._dset = self._variable[*self._indices]
+        self._data = self._dset.to_dataarray().values.squeeze()
+
+    def fft(self):
+        raise NotImplementedError()
+
+    def predict(self) -> np.ndarray:
+        raise NotImplementedError()
+
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            self._load()
+        return self._data
+
+    def _reset(self) -> None:
+        self._prediction = None
+
+    def reset(self) -> None:
+        """
+        Discards the fitted coefficients & prediction, so that the next fft() & predict() start from scratch
+        """
+        self._reset()
+
+    @property
+    def nbytes(self) -> int:
+        raise NotImplementedError()
+
+    def describe(self):
+        evaluate_ft([self])
+
+    def std(self) -> float:
+        return self.data().std()
+
+    def var(self) -> float:
+        return self.data().var()
+
+    def mae(self) -> float:
+        prediction = self.predict()
+        return mae(self.data(), prediction)
+
+    def rmse(self) -> float:
+        prediction = self.predict()
+        return rmse(self.data(), prediction)
+
+    def mse(self) -> float:
+        prediction = self.predict()
+        return mse(self.data(), prediction)
+
+    def r2(self) -> float:
+        prediction = self.predict()
+        return r2(self.data(), prediction)
+
+    def metrics(self) -> MetricAccumulator:
+        return MetricAccumulator().update(self.data(), self.predict())
+
+    @property
+    def quantile(self) -> float:
+        return self._quantile
+
+    @quantile.setter
+    def quantile(self, quantile: float) -> None:
+        self._quantile = quantile
+        self._reset()
+
+    @property
+    def input_bytes(self) -> int:
+        return len(self.data().ravel()) * 2
+
+    @property
+    def variable(self) -> era5.AtmosphericVariable:
+        return self._variable
+
+    @property
+    def indices(self) -> list:
+        return self._indices
+
+
+def print_metrics(metrics: MetricAccumulator, variable: era5.AtmosphericVariable,
+                  original_size: int, compressed_size: int) -> None:
+    unit = format_unit(variable.unit)
+
+    print(f"""
+    Data stdev: {metrics.std:.4f}{unit}
+    Data range: {metrics.min:.3f} to {metrics.max:.3f}{unit} ({metrics.max - metrics.min:.4f}{unit})
+    
+    R: {(r := metrics.r2) ** 0.5:.4f}
+    R²: {r:.4f}
+    MAE: {metrics.mae:.4f}{unit}
+    RMSE: {metrics.rmse:.4f}{unit}
+    
+    MAPE: {100 * metrics.mape:.3f}%
+    wMAPE: {100 * metrics.wmape:.3f}%
+    SMAPE: {100 * metrics.smape:.3f}%
+    
+    Original size: {format_bytes(original_size)}
+    Compressed size: {format_bytes(compressed_size)}
+    """)
+
+
+def evaluate_ft(models: list[CompressionModel], total_bytes: int = ARCHIVE_BYTES) -> MetricAccumulator:
+    """
+    Fits & evaluates models, and prints the metrics along with the size the whole archive would have if compressed
+    at the same ratio
+
+    Args:
+        models: the models to evaluate
+        total_bytes: the size of the data the compression ratio is extrapolated to
+    """
+    model_size = 0
+    input_size = 0
+
+    metrics = MetricAccumulator()
+
+    for model in models:
+        model.fft()
+        metrics.update(model.data(), model.predict())
+
+        model_size += model.nbytes
+        input_size += model.input_bytes
+
+    print_metrics(metrics, models[0].variable, total_bytes, int(model_size / input_size * total_bytes))
+    return metrics
+
+
+__all__ = ["CompressionModel", "print_metrics", "evaluate_ft", "ARCHIVE_BYTES"]
@@ -0,0 +1,155 @@
+from contextlib import contextmanager
+from threading import Lock
+
+import numpy as np
+
+try:
+    import scipy.fft as scipy_fft
+except ImportError:
+    scipy_fft = None
+
+
+class FFTBackend:
+    """
+    The FFT implementation used by the models, with a pool of reusable workspaces for repeated same-shape transforms.
+
+    scipy.fft can be multithreaded over the leading axes of multidimensional transforms (e.g. the levels of a 3D slice)
+    and caches its plans. numpy.fft is used when scipy is not installed. Both keep single precision inputs in single
+    precision. Transforms can write into a workspace with out=: numpy.fft writes into it directly, while scipy.fft
+    has no output argument, so its result is copied into it.
+
+    Examples:
+        .. code-block:: python
+
+            set_fft_backend("scipy", workers=32)
+
+            with fft_backend().workspace((37, 721, 721), "complex64") as fft:
+                fft[...] = coefficients
+                data = fft_backend().irfftn(fft, (37, 721, 1440))
+    """
+
+    def __init__(self, name: str | None = None, workers: int = 1, pool_size: int = 4):
+        """
+        Args:
+            name: 'scipy' or 'numpy', defaults to scipy if it is installed
+            workers: the number of threads used by scipy, e.g. os.cpu_count()
+            pool_size: the maximum number of idle workspaces kept for each shape & dtype
+        """
+        if name is None:
+            name = "numpy" if scipy_fft is None else "scipy"
+
+        if name == "scipy" and scipy_fft is None:
+            raise ImportError("scipy is required for the scipy FFT backend")
+        if name not in ("scipy", "numpy"):
+            raise ValueError(f"Unknown FFT backend '{name}'")
+
+        self._name = name
+        self._workers = workers
+        self._pool_size = pool_size
+
+        self._pool: dict[tuple[tuple[int, ...], np.dtype], list[np.ndarray]] = {}
+        self._lock = Lock()
+
+    def rfftn(self, data: np.ndarray, norm: str = "forward", out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Args:
+            data: the real array to transform
+            norm: the normalisation mode
+            out: the array to write the half spectrum to (e.g. a workspace), defaults to a new array
+        """
+        if self._name == "scipy":
+            return self._write(scipy_fft.rfftn(data, norm=norm, workers=self._workers), out)
+        return np.fft.rfftn(data, norm=norm, out=out)
+
+    def irfftn(self, fft: np.ndarray, shape: tuple[int, ...], norm: str = "forward",
+               overwrite: bool = False, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Inverse of rfftn()
+
+        Args:
+            fft: the half spectrum
+            shape: the shape of the output
+            norm: the normalisation mode
+            overwrite: allow the input to be used as a scratch space
+            out: the array to write the output to, defaults to a new array
+        """
+        if self._name == "scipy":
+            return self._write(scipy_fft.irfftn(fft, shape, norm=norm, workers=self._workers, overwrite_x=overwrite),
+                               out)
+        return np.fft.irfftn(fft, shape, axes=range(len(shape)), norm=norm, out=out)
+
+    @staticmethod
+    def _write(result: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+        if out is None:
+            return result
+        out[...] = result
+        return out
+
+    @contextmanager
+    def workspace(self, shape: tuple[int, ...], dtype="complex64", zero: bool = True):
+        """
+        Borrows an array from the pool, which is returned to the pool afterwards, so it must not be kept
+
+        Args:
+            shape: the shape of the array
+            dtype: the data type of the array
+            zero: zero the array, which is not needed when it is used as the output of a transform
+        """
+        key = (tuple(shape), np.dtype(dtype))
+
+        with self._lock:
+            free = self._pool.setdefault(key, [])
+            array = free.pop() if free else None
+
+        if array is None:
+            array = np.zeros(key[0], dtype=key[1])
+        elif zero:
+            array.fill(0)
+
+        try:
+            yield array
+        finally:
+            with self._lock:
+                if len(free) < self._pool_size:
+                    free.append(array)
+
+    def clear(self) -> None:
+        """
+        Frees the pooled workspaces
+        """
+        with self._lock:
+            self._pool.clear()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for free in self._pool.values() for array in free)
+
+
+_backend = FFTBackend()
+
+
+def fft_backend() -> FFTBackend:
+    """
+    The FFT backend currently used by the models
+    """
+    return _backend
+
+
+def set_fft_backend(name: str | None = None, workers: int = 1, pool_size: int = 4) -> FFTBackend:
+    """
+    Changes the FFT backend used by the models, see FFTBackend
+    """
+    global _backend
+    _backend = FFTBackend(name, workers, pool_size)
+    return _backend
+
+
+__all__ = ["FFTBackend", "fft_backend", "set_fft_backend"]
@@ -0,0 +1,194 @@
+import json
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable
+
+import era5
+from era5.util.util import format_bytes
+from era5.maths.error import MetricAccumulator
+from .abstract import *
+from .float16 import Float16Storage
+from .fourier import FourierRegression
+
+
+_METRICS = ("me", "mae", "mape", "wmape", "smape", "mse", "rmse", "r2", "std", "min", "max")
+
+
+def default_codecs(quantiles: tuple[float, ...] = (0.75, 0.9, 0.99)) -> dict[str, Callable[..., CompressionModel]]:
+    """
+    The float16 baseline and FourierRegression at several quantiles
+
+    Args:
+        quantiles: the quantiles to run FourierRegression at
+    """
+    codecs = {"float16": Float16Storage}
+    for quantile in quantiles:
+        codecs[f"fourier-{quantile}"] = partial(FourierRegression, quantile=quantile)
+    return codecs
+
+
+def _metrics_dict(metrics: MetricAccumulator) -> dict[str, float]:
+    return {name: float(getattr(metrics, name)) for name in _METRICS}
+
+
+class Benchmark:
+    """
+    Compares compression models on the same slices of data, measuring encode & decode times, peak memory, sizes and
+    error metrics.
+
+    Each codec is a callable that builds a model from (variable, indices), e.g. a CompressionModel subclass or a
+    functools.partial of one with its extra arguments.
+
+    Examples:
+        .. code-block:: python
+
+            codecs = default_codecs() | {"wavelet-0.9": partial(WaveletRegression, quantile=0.9)}
+            benchmark = Benchmark(codecs, repeat=3)
+
+            for level in [250, 500, 850]:
+                benchmark.run(era5.UWind(), ["TAVG-01-01 00:00", level])
+
+            benchmark.print_summary()
+            benchmark.save("benchmark.json")
+    """
+
+    def __init__(self, codecs: dict[str, Callable[..., CompressionModel]], repeat: int = 1):
+        """
+        Args:
+            codecs: the models to compare, by name
+            repeat: the number of times to time each encode & decode, of which the fastest is kept
+        """
+        self._codecs = codecs
+        self._repeat = repeat
+
+        self._results: list[dict] = []
+        self._totals: dict[tuple[str, str], dict] = {}
+
+    def _measure(self, model: CompressionModel) -> dict:
+        encode_seconds = decode_seconds = float("inf")
+        model.data()  # the data is read once, outside the measurements
+
+        # tracemalloc slows down allocations several times over, so the timed runs are untraced
+        for _ in range(self._repeat):
+            model.reset()
+
+            start = time.perf_counter()
+            model.fft()
+            encode_seconds = min(encode_seconds, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            model.predict()
+            decode_seconds = min(decode_seconds, time.perf_counter() - start)
+
+        # and the peak memory is measured in a separate traced run
+        model.reset()
+        tracemalloc.start()
+        try:
+            model.fft()
+            model.predict()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {"encode_seconds": encode_seconds, "decode_seconds": decode_seconds, "peak_memory": peak_memory}
+
+    def run(self, variable: era5.AtmosphericVariable, indices: list) -> list[dict]:
+        """
+        Runs every codec on one slice of a variable
+
+        Args:
+            variable: the variable to compress
+            indices: the indices of the slice, as passed to the models
+
+        Returns:
+            the result of each codec
+        """
+        results = []
+
+        for name, codec in self._codecs.items():
+            model = codec(variable, indices)
+            result = {"codec": name, "variable": variable.name, "indices": [str(index) for index in indices]}
+            result |= self._measure(model)
+
+            metrics = model.metrics()
+            result |= {"input_bytes": model.input_bytes, "nbytes": model.nbytes,
+                       "ratio": model.input_bytes / model.nbytes}
+            result |= _metrics_dict(metrics)
+
+            total = self._totals.setdefault((name, variable.name), {
+                "metrics": MetricAccumulator(), "input_bytes": 0, "nbytes": 0,
+                "encode_seconds": 0.0, "decode_seconds": 0.0, "peak_memory": 0, "slices": 0})
+            total["metrics"].merge(metrics)
+            total["input_bytes"] += model.input_bytes
+            total["nbytes"] += model.nbytes
+            total["encode_seconds"] += result["encode_seconds"]
+            total["decode_seconds"] += result["decode_seconds"]
+            total["peak_memory"] = max(total["peak_memory"], result["peak_memory"])
+            total["slices"] += 1
+
+            results.append(result)
+
+        self._results += results
+        return results
+
+    @property
+    def results(self) -> list[dict]:
+        """
+        The result of every codec on every slice run so far
+        """
+        return self._results
+
+    def summary(self, total_bytes: int = ARCHIVE_BYTES) -> list[dict]:
+        """
+        Aggregates the results of each codec over all the slices of each variable
+
+        Args:
+            total_bytes: the size of the data the compression ratio is extrapolated to
+
+        Returns:
+            the total sizes & times, the peak memory, the metrics over all slices and the extrapolated archive size of
+            each codec and variable
+        """
+        summary = []
+
+        for (name, variable), total in self._totals.items():
+            ratio = total["input_bytes"] / total["nbytes"]
+
+            summary.append({"codec": name, "variable": variable, "slices": total["slices"],
+                            "input_bytes": total["input_bytes"], "nbytes": total["nbytes"], "ratio": ratio,
+                            "archive_bytes": int(total_bytes / ratio),
+                            "encode_seconds": total["encode_seconds"], "decode_seconds": total["decode_seconds"],
+                            "peak_memory": total["peak_memory"]} | _metrics_dict(total["metrics"]))
+
+        return summary
+
+    def print_summary(self, total_bytes: int = ARCHIVE_BYTES) -> None:
+        """
+        Prints a table of the summary()
+        """
+        header = (f"{'codec':<16} {'variable':<28} {'ratio':>8} {'archive':>14} {'encode':>9} {'decode':>9} "
+                  f"{'memory':>14} {'RMSE':>10} {'MAE':>10} {'R²':>8}")
+        print(header)
+        print("-" * len(header))
+
+        for row in self.summary(total_bytes):
+            print(f"{row['codec']:<16} {row['variable']:<28} {row['ratio']:>8.2f} "
+                  f"{format_bytes(row['archive_bytes']):>14} {row['encode_seconds']:>8.3f}s "
+                  f"{row['decode_seconds']:>8.3f}s {format_bytes(row['peak_memory']):>14} "
+                  f"{row['rmse']:>10.4f} {row['mae']:>10.4f} {row['r2']:>8.4f}")
+
+    def save(self, path: str, total_bytes: int = ARCHIVE_BYTES) -> None:
+        """
+        Writes the results & summary as JSON
+
+        Args:
+            path: the file to write to
+            total_bytes: the size of the data the compression ratio is extrapolated to
+        """
+        with open(path, "w") as f:
+            json.dump({"repeat": self._repeat, "results": self._results, "summary": self.summary(total_bytes)}, f,
+                      indent=2)
+
+
+__all__ = ["Benchmark", "default_codecs"]
@@ -0,0 +1,189 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from era5.variables import AtmosphericVariable
+from era5.util.datetime import parse_datetime
+from .fourier import FourierRegression, fourier_decode
+
+
+_MAGIC = b"ERA5FTC1"
+_HEADER = struct.Struct("<8sQ")
+
+_KEY = tuple[str, str | None, str | None, str | None]
+
+
+def _encode_index(index):
+    if isinstance(index, slice):
+        return {"slice": [_encode_index(index.start), _encode_index(index.stop), _encode_index(index.step)]}
+    if isinstance(index, np.generic):
+        return index.item()
+    if index is None or isinstance(index, (int, float)):
+        return index
+    return str(index)
+
+
+def _decode_index(index):
+    if isinstance(index, dict):
+        return slice(*map(_decode_index, index["slice"]))
+    return index
+
+
+def _key_part(index, is_time: bool = False) -> str | None:
+    if index is None:
+        return None
+    if isinstance(index, slice):
+        return json.dumps(_encode_index(index))
+    if is_time:
+        return f"{parse_datetime(index)}"
+    return f"{float(index):g}"
+
+
+def _key(variable, time=None, level=None, latitude=None) -> _KEY:
+    name = variable if isinstance(variable, str) else variable.name
+    return name, _key_part(time, is_time=True), _key_part(level), _key_part(latitude)
+
+
+class ModelContainer:
+    """
+    A file of many fitted FourierRegression models, indexed by (variable, time, level, latitude).
+
+    The file holds an 8 byte magic number and the length of a JSON header, the header (with the offset & length of
+    each encoded array), then the encoded arrays. The arrays are memory-mapped, so opening the file only reads the
+    header and decoding a model only reads the pages of that model.
+
+    Examples:
+        .. code-block:: python
+
+            models = [FourierRegression(era5.UWind(), [time, 250], 0.95) for time in times]
+            ModelContainer.write("uwind.ftc", models)
+
+            container = ModelContainer("uwind.ftc")
+            prediction = container["u_component_of_wind", "TAVG-01-01 00:00", 250]
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: the file written by ModelContainer.write()
+        """
+        with open(path, "rb") as f:
+            magic, header_size = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a model container")
+            header = json.loads(f.read(header_size))
+
+        self._path = path
+        self._entries: dict[_KEY, dict] = {tuple(entry["key"]): entry for entry in header["models"]}
+
+        # np.memmap cannot map an empty region, e.g. of a container of no models
+        offset = _HEADER.size + header_size
+        if os.path.getsize(path) > offset:
+            self._buffer = np.memmap(path, dtype="uint8", mode="r", offset=offset)
+        else:
+            self._buffer = np.zeros(0, dtype="uint8")
+
+    @staticmethod
+    def write(path: str, models: list[FourierRegression]) -> None:
+        """
+        Writes models to a container, fitting any that have not been fitted yet
+
+        Args:
+            path: the file to write to
+            models: the models to store, whose indices are (time, level, latitude, longitude) up to latitude
+        """
+        entries = []
+        arrays = []
+        offset = 0
+
+        for model in models:
+            if len(model.indices) > 3:
+                raise ValueError("Models are indexed by (variable, time, level, latitude), "
+                                 "so cannot be slices of longitude")
+
+            fft_real, fft_imag, fft_idxs = model.encoded()
+            segments = []
+            for array in (fft_real, fft_imag, *fft_idxs):
+                segments.append([offset, array.nbytes])
+                arrays.append(array)
+                offset += array.nbytes
+
+            key = _key(model.variable, *model.indices)
+            entries.append({"key": key, "indices": [_encode_index(index) for index in model.indices],
+                            "quantile": model.quantile, "shape": list(model.shape), "segments": segments})
+
+        if len({tuple(entry["key"]) for entry in entries}) != len(entries):
+            raise ValueError("Models must have unique (variable, time, level, latitude) keys")
+
+        header = json.dumps({"models": entries}).encode()
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(header)))
+            f.write(header)
+            for array in arrays:
+                f.write(array.tobytes())
+
+    def _entry(self, key: tuple) -> dict:
+        key = _key(*key)
+        if key not in self._entries:
+            raise KeyError(f"No model for {key} in {self._path}")
+        return self._entries[key]
+
+    def _encoded(self, entry: dict) -> tuple[np.ndarray, np.ndarray, tuple[np.ndarray, ...]]:
+        fft_real, fft_imag, *fft_idxs = [self._buffer[start:start + length] for start, length in entry["segments"]]
+        return fft_real, fft_imag, tuple(fft_idxs)
+
+    def model(self, variable, time=None, level=None, latitude=None) -> FourierRegression:
+        """
+        Loads a fitted model without reading its data
+
+        Args:
+            variable: the variable or its name
+            time: the time index the model was fitted on
+            level: the level index the model was fitted on
+            latitude: the latitude index the model was fitted on
+        """
+        entry = self._entry((variable, time, level, latitude))
+        name = entry["key"][0]
+
+        # the variable may not have been created yet, e.g. when a container is opened in a fresh session
+        if name in AtmosphericVariable._instances:
+            variable = AtmosphericVariable.get(name)
+        else:
+            variable = AtmosphericVariable[name]()
+
+        return FourierRegression.from_encoded(variable,
+                                              [_decode_index(index) for index in entry["indices"]],
+                                              entry["quantile"], self._encoded(entry), entry["shape"])
+
+    def predict(self, variable, time=None, level=None, latitude=None) -> np.ndarray:
+        """
+        Decodes the prediction of a single model, without creating it
+        """
+        entry = self._entry((variable, time, level, latitude))
+        return fourier_decode(*self._encoded(entry), entry["shape"])
+
+    def __getitem__(self, key: tuple) -> np.ndarray:
+        if not isinstance(key, tuple):
+            key = (key,)
+        return self.predict(*key)
+
+    def __contains__(self, key: tuple) -> bool:
+        if not isinstance(key, tuple):
+            key = (key,)
+        return _key(*key) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> list[_KEY]:
+        return list(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._buffer.nbytes
+
+
+__all__ = ["ModelContainer"]
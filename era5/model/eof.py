@@ -0,0 +1,227 @@
+import numpy as np
+
+import era5
+from era5.util.datetime import DateTime, parse_datetime
+from era5.maths.error import MetricAccumulator
+from .abstract import print_metrics
+
+
+class EOFDecomposition:
+    """
+    Computes the leading empirical orthogonal functions (EOFs) of a variable over time with a randomized SVD.
+
+    The (time x grid) matrix is never held in memory: every pass streams the variable one timestep at a time and only
+    keeps arrays of size (grid x components). The data is centred on its time mean and weighted by sqrt(cos(latitude))
+    so that each grid cell counts in proportion to its area. A fit takes 2 + power_iterations passes over the data.
+
+    The EOFs and principal components (PCs) also form a compressed model of the data: the reconstruction at each
+    fitted time is the mean plus the PCs of that time multiplied by the EOFs.
+
+    Examples:
+        .. code-block:: python
+
+            eof = EOFDecomposition(era5.UWind(), level=250, n_components=20)
+            eof.fit()
+
+            eof.explained_variance_ratio()
+            maps = eof.eofs()
+            eof.describe()
+    """
+
+    def __init__(self, variable: era5.AtmosphericVariable4D, level=None, latitude=None, longitude=None,
+                 n_components: int = 10, oversampling: int = 10, power_iterations: int = 1, seed: int = 0):
+        """
+        Args:
+            variable: the variable to decompose
+            level: level index of the variable (defaults to all levels)
+            latitude: latitude index of the variable (defaults to all latitudes)
+            longitude: longitude index of the variable (defaults to all longitudes)
+            n_components: the number of EOFs to compute
+            oversampling: the number of extra random vectors used to find the range of the data
+            power_iterations: the number of extra passes over the data, which improve the accuracy of the smaller EOFs
+            seed: the seed of the random projection
+        """
+        self._variable = variable
+        self._indices = [level, latitude, longitude]
+
+        self._n_components = n_components
+        self._oversampling = oversampling
+        self._power_iterations = power_iterations
+        self._rng = np.random.default_rng(seed)
+
+        self._shape = None
+        self._weights = None
+        self._mean = None
+        self._eofs = None
+        self._pcs = None
+        self._singular_values = None
+        self._total_variance = None
+        self._times: list[DateTime] = []
+
+    def _init_grid(self, time: slice) -> None:
+        ds = self._variable[time.start, *self._indices]
+        data = ds[self._variable.name]
+
+        # the polar rows have (almost) zero area, but are kept invertible to reconstruct the data there
+        cos_latitude = np.clip(np.cos(np.radians(data["latitude"])), 1e-3, None)
+        self._weights = np.sqrt(cos_latitude).broadcast_like(data).values.astype("float32").reshape(-1)
+        self._shape = data.shape
+
+    def _stream(self, time: slice):
+        for dt, data in self._variable.stream(time, *self._indices):
+            yield dt, data.reshape(-1).astype("float32")
+
+    def fit(self, time: slice | None = None) -> None:
+        """
+        Computes the EOFs by streaming through the variable
+
+        Args:
+            time: slice of times to fit over (defaults to the whole TAVG year)
+        """
+        if time is None:
+            time = slice("TAVG-01-01 00:00", "TAVG-12-31 23:00")
+
+        self._init_grid(time)
+        n_random = self._n_components + self._oversampling
+
+        # first pass: the mean, total variance and a random projection of the data onto the grid
+        # the projection of the centred data is X^T Ω - μ (1^T Ω), so the mean can be removed afterwards
+        total = np.zeros(len(self._weights))
+        sum_squares = 0.0
+        projection = np.zeros((len(self._weights), n_random), dtype="float32")
+        omega_sum = np.zeros(n_random)
+        self._times = []
+
+        for dt, data in self._stream(time):
+            data *= self._weights
+            omega = self._rng.standard_normal(n_random).astype("float32")
+
+            total += data
+            sum_squares += np.dot(data, data)
+            projection += np.multiply.outer(data, omega)
+            omega_sum += omega
+            self._times.append(dt)
+
+        n_times = len(self._times)
+        weighted_mean = total / n_times
+        projection -= np.multiply.outer(weighted_mean, omega_sum).astype("float32")
+
+        self._mean = (weighted_mean / self._weights).astype("float32")
+        self._total_variance = (sum_squares - n_times * np.dot(weighted_mean, weighted_mean)) / (n_times - 1)
+
+        basis, _ = np.linalg.qr(projection)
+
+        # power iterations: replace the basis with an orthonormal basis of X^T X Q
+        for _ in range(self._power_iterations):
+            projection = np.zeros_like(basis)
+            for _, data in self._stream(time):
+                data = (data - self._mean) * self._weights
+                projection += np.multiply.outer(data, data @ basis)
+            basis, _ = np.linalg.qr(projection)
+
+        # last pass: the data projected onto the basis, whose SVD gives the EOFs & PCs
+        reduced = np.zeros((n_times, basis.shape[1]), dtype="float32")
+        for i, (_, data) in enumerate(self._stream(time)):
+            reduced[i] = ((data - self._mean) * self._weights) @ basis
+
+        u, s, vt = np.linalg.svd(reduced, full_matrices=False)
+        k = self._n_components
+
+        self._pcs = (u[:, :k] * s[:k]).astype("float32")
+        self._eofs = (basis @ vt[:k].T).T.astype("float32")
+        self._singular_values = s[:k]
+
+    def transform(self, data: np.ndarray) -> np.ndarray:
+        """
+        Projects data of shape (..., *grid) onto the EOFs
+
+        Returns:
+            the principal components, of shape (..., component)
+        """
+        data = data.reshape(*data.shape[:data.ndim - len(self._shape)], -1)
+        return ((data - self._mean) * self._weights) @ self._eofs.T
+
+    def inverse_transform(self, pcs: np.ndarray) -> np.ndarray:
+        """
+        Reconstructs data from principal components of shape (..., component)
+
+        Returns:
+            the reconstructed data, of shape (..., *grid)
+        """
+        data = pcs @ self._eofs / self._weights + self._mean
+        return data.reshape(*pcs.shape[:-1], *self._shape)
+
+    def predict(self, time) -> np.ndarray:
+        """
+        Reconstructs the data at a fitted time, from the stored PCs
+
+        Args:
+            time: a datetime or a list of datetimes
+        """
+        if isinstance(time, (list, tuple)):
+            return np.stack([self.predict(t) for t in time])
+
+        index = self._times.index(parse_datetime(time))
+        return self.inverse_transform(self._pcs[index])
+
+    def evaluate(self, time: slice | None = None) -> MetricAccumulator:
+        """
+        Computes the reconstruction error by streaming through the variable again and projecting each timestep onto
+        the EOFs, so times that were not fitted can be evaluated too
+
+        Args:
+            time: slice of times to evaluate over (defaults to the whole TAVG year)
+        """
+        metrics = MetricAccumulator()
+        for _, data in self._stream(time):
+            metrics.update(data, self.inverse_transform(self.transform(data)).reshape(-1))
+        return metrics
+
+    def describe(self, time: slice | None = None) -> MetricAccumulator:
+        metrics = self.evaluate(time)
+        print_metrics(metrics, self._variable, self.input_bytes, self.nbytes)
+        return metrics
+
+    def eofs(self) -> np.ndarray:
+        """
+        The EOFs of the area weighted data, of shape (component, *grid), with unit norm
+        """
+        return self._eofs.reshape(-1, *self._shape)
+
+    def pcs(self) -> np.ndarray:
+        """
+        The principal component time series, of shape (time, component)
+        """
+        return self._pcs
+
+    def explained_variance(self) -> np.ndarray:
+        """
+        The variance of each principal component
+        """
+        return self._singular_values ** 2 / (len(self._times) - 1)
+
+    def explained_variance_ratio(self) -> np.ndarray:
+        """
+        The fraction of the total (area weighted) variance explained by each EOF
+        """
+        return self.explained_variance() / self._total_variance
+
+    @property
+    def times(self) -> list[DateTime]:
+        return self._times
+
+    @property
+    def nbytes(self) -> int:
+        # stored as float16
+        return (self._eofs.size + self._pcs.size + self._mean.size) * 2
+
+    @property
+    def input_bytes(self) -> int:
+        return len(self._times) * int(np.prod(self._shape)) * 2
+
+    @property
+    def variable(self) -> era5.AtmosphericVariable:
+        return self._variable
+
+
+__all__ = ["EOFDecomposition"]
@@ -0,0 +1,37 @@
+import numpy as np
+
+import era5
+from era5.util.encoding import *
+from .abstract import *
+
+
+class Float16Storage(CompressionModel):
+    """
+    The baseline that the other models are compared against: the data rounded to float16 and deflated with zlib.
+    The quantile is unused.
+    """
+
+    def __init__(self, variable: era5.AtmosphericVariable, indices: list, quantile: float = 0.75):
+        super().__init__(variable, indices, quantile)
+
+        self._encoded = None
+
+    def fft(self):
+        self._encoded = encode_zlib(np.ascontiguousarray(self._data, dtype="float16"))
+
+    def predict(self) -> np.ndarray:
+        if self._prediction is None:
+            self._prediction = decode_zlib(self._encoded).view("float16").astype("float32").reshape(self._data.shape)
+
+        return self._prediction
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._encoded = None
+
+    @property
+    def nbytes(self) -> int:
+        return self._encoded.nbytes
+
+
+__all__ = ["Float16Storage"]
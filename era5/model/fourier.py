@@ -1,129 +1,122 @@
+import numpy as np
+
 import era5
-from era5.util.util import format_bytes
-from era5.variables.text import format_unit
 from era5.util.encoding import *
-from era5.maths.error import *
+from .abstract import *
+from .backend import fft_backend
+from .rate_distortion import FourierRateDistortion
 
 
-class FourierRegression:
-    def __init__(self, variable: era5.AtmosphericVariable, indices: list, quantile: float = 0.75):
-        self._variable = variable
-        self._indices = indices.copy()
-        self._quantile = quantile
+def fourier_encode(data: np.ndarray, quantile: float) -> tuple[np.ndarray, np.ndarray, tuple[np.ndarray, ...]]:
+    """
+    Compresses an array by only keeping its largest Fourier coefficients
 
-        self._dset = variable[*indices]
-        self._data = self._dset.to_dataarray().values.squeeze()
+    Args:
+        data: the array to compress
+        quantile: the quantile of coefficient amplitudes below which coefficients are discarded
 
-        self._prediction = None
-        self._fft_idxs = None
-        self._fft_real = None
-        self._fft_imag = None
-
-    def fft(self):
-        fft = np.fft.rfftn(self._data, norm="forward")
+    Returns:
+        the zlib-encoded real & imaginary float16 coefficients and the encoded indices of each coefficient
+    """
+    backend = fft_backend()
+    with backend.workspace((*data.shape[:-1], data.shape[-1] // 2 + 1), np.result_type(data, np.complex64),
+                           zero=False) as fft:
+        backend.rfftn(data, norm="forward", out=fft)
 
         amplitudes = np.abs(fft)
 
-        cutoff_amp = np.quantile(amplitudes, self._quantile)
+        cutoff_amp = np.quantile(amplitudes, quantile)
         mask = amplitudes > cutoff_amp
 
         fft = fft[mask]
 
-        self._fft_real = encode_zlib(fft.real.astype("float16"))
-        self._fft_imag = encode_zlib(fft.imag.astype("float16"))
-        self._fft_idxs = np.argwhere(mask).T
-        self._fft_idxs = tuple(map(encode, self._fft_idxs))
+    fft_real = encode_zlib(fft.real.astype("float16"))
+    fft_imag = encode_zlib(fft.imag.astype("float16"))
+    fft_idxs = tuple(map(encode, np.argwhere(mask).T))
 
-    def predict(self) -> np.ndarray:
-        if self._prediction is None:
-            fft_idxs = np.array(list(map(decode, self._fft_idxs)))
-            fft_real = decode_zlib(self._fft_real).view("float16")
-            fft_imag = decode_zlib(self._fft_imag).view("float16")
+    return fft_real, fft_imag, fft_idxs
 
-            fft = np.zeros(self._data.shape, dtype="complex64")
-            fft[*fft_idxs] = fft_real + 1j * fft_imag.astype("float32")
-            self._prediction = np.fft.irfftn(fft, self._data.shape, norm="forward")
 
-        return self._prediction
+def fourier_decode(fft_real: np.ndarray, fft_imag: np.ndarray, fft_idxs: tuple[np.ndarray, ...],
+                   shape: tuple[int, ...], out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Reconstructs an array from the output of fourier_encode()
 
-    def data(self) -> np.ndarray:
-        return self._data
+    Args:
+        fft_real: the encoded real part of the coefficients
+        fft_imag: the encoded imaginary part of the coefficients
+        fft_idxs: the encoded indices of the coefficients
+        shape: the shape of the original array
+        out: the float32 array to write the reconstruction to, e.g. to reuse one buffer when decoding many arrays
+    """
+    fft_idxs = np.array(list(map(decode, fft_idxs)))
+    fft_real = decode_zlib(fft_real).view("float16")
+    fft_imag = decode_zlib(fft_imag).view("float16")
+
+    backend = fft_backend()
+    with backend.workspace((*shape[:-1], shape[-1] // 2 + 1), "complex64") as fft:
+        fft[*fft_idxs] = fft_real + 1j * fft_imag.astype("float32")
+        return backend.irfftn(fft, shape, norm="forward", overwrite=True, out=out)
 
-    @property
-    def nbytes(self) -> int:
-        return self._fft_real.nbytes + self._fft_imag.nbytes + sum(ar.nbytes for ar in self._fft_idxs)
 
-    def describe(self):
-        evaluate_ft([self])
+class FourierRegression(CompressionModel):
+    def __init__(self, variable: era5.AtmosphericVariable, indices: list, quantile: float = 0.75):
+        super().__init__(variable, indices, quantile)
 
-    def std(self) -> float:
-        return self._data.std()
+        self._shape = self._data.shape
+        self._fft_idxs = None
+        self._fft_real = None
+        self._fft_imag = None
 
-    def var(self) -> float:
-        return self._data.var()
+    @classmethod
+    def from_encoded(cls, variable: era5.AtmosphericVariable, indices: list, quantile: float,
+                     encoded: tuple[np.ndarray, np.ndarray, tuple[np.ndarray, ...]],
+                     shape: tuple[int, ...]) -> "FourierRegression":
+        """
+        Creates a fitted model from the output of fourier_encode() without reading the data
+
+        Args:
+            variable: the variable that was compressed
+            indices: the indices of the slice that was compressed
+            quantile: the quantile the slice was compressed with
+            encoded: the encoded coefficients & indices
+            shape: the shape of the slice
+        """
+        model = cls._without_data(variable, indices, quantile)
+        model._shape = tuple(shape)
+        model._fft_real, model._fft_imag, model._fft_idxs = encoded
+        return model
+
+    def encoded(self) -> tuple[np.ndarray, np.ndarray, tuple[np.ndarray, ...]]:
+        """
+        The encoded real & imaginary coefficients and indices, fitting the model if needed
+        """
+        if self._fft_real is None:
+            self.fft()
+        return self._fft_real, self._fft_imag, self._fft_idxs
 
-    def mae(self) -> float:
-        prediction = self.predict()
-        return mae(self._data, prediction)
+    def fft(self):
+        self._fft_real, self._fft_imag, self._fft_idxs = fourier_encode(self.data(), self._quantile)
+
+    def predict(self) -> np.ndarray:
+        if self._prediction is None:
+            self._prediction = fourier_decode(self._fft_real, self._fft_imag, self._fft_idxs, self._shape)
 
-    def rmse(self) -> float:
-        prediction = self.predict()
-        return rmse(self._data, prediction)
+        return self._prediction
 
-    def mse(self) -> float:
-        prediction = self.predict()
-        return mse(self._data, prediction)
+    def rate_distortion(self) -> FourierRateDistortion:
+        return FourierRateDistortion(self.data())
 
-    def r2(self) -> float:
-        prediction = self.predict()
-        return r2(self._data, prediction)
+    def _reset(self) -> None:
+        super()._reset()
+        self._fft_idxs = None
+        self._fft_real = None
+        self._fft_imag = None
 
     @property
-    def input_bytes(self) -> int:
-        return len(self._data.ravel()) * 2
+    def nbytes(self) -> int:
+        return self._fft_real.nbytes + self._fft_imag.nbytes + sum(ar.nbytes for ar in self._fft_idxs)
 
     @property
-    def variable(self) -> era5.AtmosphericVariable:
-        return self._variable
-
-
-def evaluate_ft(models: list[FourierRegression]) -> np.ndim:
-    total_bytes = 2 * 24 * 365 * 25 * 721 * 1440
-    model_size = 0
-    input_size = 0
-
-    predictions = []
-    data = []
-
-    for model in models:
-        model.fft()
-        predictions.append(model.predict())
-        data.append(model.data())
-
-        model_size += model.nbytes
-        input_size += model.input_bytes
-
-    predictions = np.array(predictions)
-    data = np.array(data)
-
-    variable = models[0].variable
-    unit = format_unit(variable.unit)
-
-    print(f"""
-    Data stdev: {data.std():.4f}{unit}
-    Data range: {data.min():.3f} to {data.max():.3f}{unit} ({data.max() - data.min():.4f}{unit})
-    
-    R: {(r := r2(data, predictions)) ** 0.5:.4f}
-    R²: {r:.4f}
-    MAE: {mae(data, predictions):.4f}{unit}
-    RMSE: {rmse(data, predictions):.4f}{unit}
-    
-    MAPE: {100 * mape(data, predictions):.3f}%
-    wMAPE: {100 * wmape(data, predictions):.3f}%
-    SMAPE: {100 * smape(data, predictions):.3f}%
-    
-    Original size: {format_bytes(total_bytes)}
-    Compressed size: {format_bytes(int(model_size / input_size * total_bytes))}
-    """)
-
-    return np.array(predictions)
+    def shape(self) -> tuple[int, ...]:
+        return self._shape
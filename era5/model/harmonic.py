@@ -0,0 +1,138 @@
+import numpy as np
+
+import era5
+from era5.util.datetime import parse_datetime, hour_of_year
+from era5.maths.error import MetricAccumulator
+from .abstract import print_metrics
+
+
+HOURS_PER_YEAR = 24 * 365
+
+
+class HarmonicRegression:
+    """
+    Models each grid cell as a sum of annual and diurnal harmonics of the hour of year.
+
+    The least-squares fit is accumulated through its normal equations while streaming the variable one timestep at a
+    time, so memory is bounded by the size of the coefficients rather than the number of timesteps.
+
+    Examples:
+        .. code-block:: python
+
+            model = HarmonicRegression(era5.UWind(), level=250, annual=4, diurnal=2)
+            model.fit()
+            model.predict("TAVG-07-04 13:00")
+            model.describe()
+    """
+
+    def __init__(self, variable: era5.AtmosphericVariable4D, level=None, latitude=None, longitude=None,
+                 annual: int = 3, diurnal: int = 2):
+        """
+        Args:
+            variable: the variable to model
+            level: level index of the variable to model (defaults to all levels)
+            latitude: latitude index of the variable to model (defaults to all latitudes)
+            longitude: longitude index of the variable to model (defaults to all longitudes)
+            annual: number of annual harmonics
+            diurnal: number of diurnal harmonics
+        """
+        self._variable = variable
+        self._indices = [level, latitude, longitude]
+
+        self._frequencies = np.concatenate([np.arange(1, annual + 1) / HOURS_PER_YEAR,
+                                            np.arange(1, diurnal + 1) / 24])
+
+        self._shape = None
+        self._coefficients = None
+        self._n_times = 0
+
+    def _basis(self, hours: np.ndarray) -> np.ndarray:
+        phase = 2 * np.pi * np.multiply.outer(hours, self._frequencies)
+        return np.concatenate([np.ones((*phase.shape[:-1], 1)), np.cos(phase), np.sin(phase)], axis=-1)
+
+    @staticmethod
+    def _hours(time) -> np.ndarray:
+        if isinstance(time, (int, float, np.number, np.ndarray)):
+            return np.asarray(time)
+        if isinstance(time, (list, tuple)):
+            return np.array([hour_of_year(parse_datetime(t)) for t in time])
+        return np.asarray(hour_of_year(parse_datetime(time)))
+
+    def fit(self, time: slice | None = None) -> None:
+        """
+        Fits the harmonics by streaming through the variable
+
+        Args:
+            time: slice of times to fit over (defaults to the whole TAVG year)
+        """
+        gram = np.zeros((self.n_harmonics, self.n_harmonics))
+        moments = None
+        self._n_times = 0
+
+        for dt, data in self._variable.stream(time, *self._indices):
+            basis = self._basis(self._hours(dt))
+
+            if moments is None:
+                self._shape = data.shape
+                moments = np.zeros((self.n_harmonics, data.size))
+
+            gram += np.outer(basis, basis)
+            moments += np.multiply.outer(basis, data.reshape(-1))
+            self._n_times += 1
+
+        self._coefficients = np.linalg.solve(gram, moments).astype("float32")
+
+    def predict(self, time) -> np.ndarray:
+        """
+        Predicts the variable at any time(s) of the year
+
+        Args:
+            time: a datetime, a list of datetimes or the hour(s) of the year
+
+        Returns:
+            an array of shape (*time, *grid)
+        """
+        basis = self._basis(self._hours(time)).astype("float32")
+        return (basis @ self._coefficients).reshape(*basis.shape[:-1], *self._shape)
+
+    def evaluate(self, time: slice | None = None) -> MetricAccumulator:
+        """
+        Computes the error of the model by streaming through the variable again
+
+        Args:
+            time: slice of times to evaluate over (defaults to the whole TAVG year)
+        """
+        metrics = MetricAccumulator()
+        for dt, data in self._variable.stream(time, *self._indices):
+            metrics.update(data, self.predict(dt))
+        return metrics
+
+    def describe(self, time: slice | None = None) -> MetricAccumulator:
+        metrics = self.evaluate(time)
+        print_metrics(metrics, self._variable, self.input_bytes, self.nbytes)
+        return metrics
+
+    def coefficients(self) -> np.ndarray:
+        """
+        The fitted coefficients, of shape (harmonic, *grid): the mean, then cosines & sines of each frequency
+        """
+        return self._coefficients.reshape(self.n_harmonics, *self._shape)
+
+    @property
+    def n_harmonics(self) -> int:
+        return 1 + 2 * len(self._frequencies)
+
+    @property
+    def nbytes(self) -> int:
+        return self._coefficients.nbytes
+
+    @property
+    def input_bytes(self) -> int:
+        return self._n_times * int(np.prod(self._shape)) * 2
+
+    @property
+    def variable(self) -> era5.AtmosphericVariable:
+        return self._variable
+
+
+__all__ = ["HarmonicRegression", "HOURS_PER_YEAR"]
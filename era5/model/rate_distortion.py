@@ -0,0 +1,155 @@
+import numpy as np
+
+from .backend import fft_backend
+
+
+class FourierRateDistortion:
+    """
+    The error of Fourier compression (as done by FourierRegression) for every possible quantile, from a single FFT.
+
+    By Parseval's theorem, the mean squared error of the reconstruction equals the sum of the squared magnitudes of the
+    discarded coefficients plus the float16 rounding error of the kept ones. Sorting the coefficient amplitudes once
+    then gives the exact MSE, RMSE & R² for every cutoff as a cumulative sum.
+
+    Examples:
+        .. code-block:: python
+
+            model = FourierRegression(era5.UWind(), ["TAVG-01-01 00:00", 250])
+            rd = model.rate_distortion()
+
+            curve = rd.curve(np.linspace(0.5, 0.99, 50))
+            model.quantile = rd.select(max_rmse=0.5)  # smallest model under 0.5 m/s RMSE
+            model.quantile = rd.select(max_nbytes=2000)  # most accurate model of at most 2000 bytes
+    """
+
+    def __init__(self, data: np.ndarray, bytes_per_coefficient: float | None = None):
+        """
+        Args:
+            data: the array to be compressed
+            bytes_per_coefficient: estimated encoded size of each kept coefficient.
+                                   Defaults to 2 float16s plus 1 byte per index dimension
+        """
+        self._shape = data.shape
+        self._bytes_per_coefficient = 4 + data.ndim if bytes_per_coefficient is None else bytes_per_coefficient
+
+        fft = fft_backend().rfftn(data, norm="forward")
+
+        # rfftn only stores half of the spectrum: all coefficients bar the 0 & Nyquist frequencies of the last axis
+        # have a conjugate pair that contributes the same energy to the signal
+        multiplicity = np.full(fft.shape[-1], 2.0)
+        multiplicity[0] = 1
+        if self._shape[-1] % 2 == 0:
+            multiplicity[-1] = 1
+        multiplicity = np.broadcast_to(multiplicity, fft.shape).reshape(-1)
+
+        fft = fft.reshape(-1)
+        amplitudes = np.abs(fft)
+        order = np.argsort(amplitudes, kind="stable")
+
+        quantised = fft.real.astype("float16") + 1j * fft.imag.astype("float16").astype("float32")
+        dropped_error = (multiplicity * amplitudes ** 2)[order]
+        kept_error = (multiplicity * np.abs(fft - quantised) ** 2)[order]
+
+        self._amplitudes = amplitudes[order]
+
+        # _mse[i] is the error when the i smallest coefficients are discarded
+        self._mse = np.zeros(len(fft) + 1)
+        self._mse[1:] = np.cumsum(dropped_error)
+        self._mse[:-1] += np.cumsum(kept_error[::-1])[::-1]
+
+        self._var = dropped_error.sum() - amplitudes[0] ** 2
+
+    def _n_discarded(self, quantile: np.ndarray) -> np.ndarray:
+        cutoff = np.quantile(self._amplitudes, quantile)
+        return np.searchsorted(self._amplitudes, cutoff, side="right")
+
+    def _quantile(self, n_discarded: np.ndarray) -> np.ndarray:
+        # halfway between the positions of the last discarded & first kept amplitudes, so that the interpolated cutoff
+        # falls strictly between them however np.quantile rounds
+        return np.clip((n_discarded - 0.5) / (len(self._amplitudes) - 1), 0, 1)
+
+    def _curve(self, n_discarded: np.ndarray, quantiles: np.ndarray) -> dict[str, np.ndarray]:
+        coefficients = len(self._amplitudes) - n_discarded
+        mse = self._mse[n_discarded]
+
+        return {"quantile": quantiles,
+                "coefficients": coefficients,
+                "nbytes": coefficients * self._bytes_per_coefficient,
+                "mse": mse,
+                "rmse": mse ** 0.5,
+                "r2": 1 - mse / self._var}
+
+    def curve(self, quantiles: np.ndarray | None = None) -> dict[str, np.ndarray]:
+        """
+        Computes the rate-distortion curve over a set of quantiles
+
+        Args:
+            quantiles: the quantiles that would be passed to FourierRegression (defaults to 100 between 0 and 1)
+
+        Returns:
+            a dictionary of arrays with the quantile, number of coefficients kept, estimated size in bytes, MSE,
+            RMSE and R² at each quantile
+        """
+        if quantiles is None:
+            quantiles = np.linspace(0, 1, 100, endpoint=False)
+        quantiles = np.asarray(quantiles)
+
+        return self._curve(self._n_discarded(quantiles), quantiles)
+
+    def curve_from_nbytes(self, nbytes: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Computes the rate-distortion curve over a set of byte budgets
+
+        Args:
+            nbytes: the (estimated) maximum sizes of the encoded model
+
+        Returns:
+            the same dictionary as curve(), with the quantile that meets each budget
+        """
+        kept = np.clip(np.asarray(nbytes) // self._bytes_per_coefficient, 0, len(self._amplitudes)).astype(int)
+        n_discarded = len(self._amplitudes) - kept
+
+        # coefficients with equal amplitudes are kept or discarded together, so round the cut up to a tie boundary
+        cutoff = self._amplitudes[np.clip(n_discarded - 1, 0, None)]
+        n_discarded = np.searchsorted(self._amplitudes, cutoff, side="right")
+
+        return self._curve(n_discarded, self._quantile(n_discarded))
+
+    def select(self, max_rmse: float | None = None, max_nbytes: float | None = None) -> float:
+        """
+        Selects a quantile that satisfies an error and/or size constraint: the best model that fits within max_nbytes
+        if it is given, otherwise the smallest model under max_rmse
+
+        Args:
+            max_rmse: the maximum permitted RMSE, in the units of the data
+            max_nbytes: the maximum permitted (estimated) model size
+
+        Returns:
+            the quantile to use in FourierRegression
+        """
+        n = len(self._amplitudes)
+        candidates = np.arange(n + 1)
+
+        # only cuts between distinct amplitudes can be reproduced by a quantile, which always discards a coefficient
+        valid = np.ones(n + 1, dtype=bool)
+        valid[0] = False
+        valid[1:-1] = self._amplitudes[:-1] < self._amplitudes[1:]
+
+        if max_rmse is not None:
+            valid &= self._mse <= max_rmse ** 2
+        if max_nbytes is not None:
+            valid &= (n - candidates) * self._bytes_per_coefficient <= max_nbytes
+
+        if not valid.any():
+            raise ValueError(f"No quantile satisfies max_rmse={max_rmse} and max_nbytes={max_nbytes}")
+
+        if max_nbytes is not None:
+            return float(self._quantile(candidates[valid].min()))
+        return float(self._quantile(candidates[valid].max()))
+
+    @property
+    def var(self) -> float:
+        return self._var
+
+
+__all__ = ["FourierRateDistortion"]
@@ -0,0 +1,257 @@
+from collections import OrderedDict
+import json
+
+import numpy as np
+import xarray as xr
+
+from era5.variables import AtmosphericVariable, AtmosphericVariable4D
+from era5.dataset import select_slice
+from era5.util.datetime import datetime_range, parse_datetime, timedelta
+from era5.util.util import format_bytes
+from .fourier import fourier_encode, fourier_decode
+
+
+_TILE = tuple[np.ndarray, np.ndarray, tuple[np.ndarray, ...]]
+
+
+class SpectralStore:
+    """
+    A store of Fourier-compressed latitude/longitude tiles, one tile per (variable, time, level)
+
+    Examples:
+        .. code-block:: python
+
+            store = SpectralStore(quantile=0.95)
+            store.encode(era5.UWind(), slice("TAVG-01-01 00:00", "TAVG-01-31 23:00"))
+            store.save("uwind.npz")
+
+            uwind = SpectralStore.load("uwind.npz").variable("u_component_of_wind")
+            era5.plot(uwind, ["TAVG-01-15 12:00", 250])
+    """
+
+    def __init__(self, quantile: float = 0.75, cache_size: int = 64):
+        """
+        Args:
+            quantile: the quantile of Fourier amplitudes below which coefficients are discarded
+            cache_size: the number of decoded tiles to keep in memory
+        """
+        self._quantile = quantile
+        self._cache_size = cache_size
+
+        self._keys: set[tuple[str, str, int]] = set()
+        self._tiles: dict[tuple[str, str, int], _TILE] = {}
+        self._levels: dict[str, set[int]] = {}
+        self._cache: OrderedDict[tuple[str, str, int], np.ndarray] = OrderedDict()
+
+        self._latitude: None | np.ndarray = None
+        self._longitude: None | np.ndarray = None
+        self._attrs: dict = {}
+        self._archive = None
+
+    @staticmethod
+    def _key(variable: str, time, level: int) -> tuple[str, str, int]:
+        return variable, f"{parse_datetime(time)}", int(level)
+
+    def encode(self, variable: AtmosphericVariable4D, time=None, level=None, verbose: bool = True) -> None:
+        """
+        Reads a variable one timestep at a time and compresses every (time, level) slice into a tile
+
+        Args:
+            variable: the variable to compress
+            time: a single time or slice of times (defaults to the whole TAVG year)
+            level: a single level or slice of levels (defaults to all levels)
+            verbose: print debugging information?
+        """
+        if time is None:
+            time = slice("TAVG-01-01 00:00", "TAVG-12-31 23:00")
+
+        if isinstance(time, slice):
+            times = datetime_range(time.start, time.stop, time.step if time.step else timedelta(hours=1))
+        else:
+            times = [time]
+
+        for dt in times:
+            ds = variable[dt, level]
+            self._attrs = dict(ds.attrs)
+
+            data = ds[variable.name].transpose(..., "latitude", "longitude")
+            if "level" not in data.dims:
+                data = data.expand_dims("level")
+
+            for lev, tile in zip(data["level"].values, data.values):
+                self.add(variable.name, dt, lev, tile, ds["latitude"].values, ds["longitude"].values)
+
+        if verbose:
+            print(f"Spectral store size: {format_bytes(self.nbytes)}")
+
+    def add(self, variable: str, time, level: int, data: np.ndarray,
+            latitude: np.ndarray, longitude: np.ndarray) -> None:
+        """
+        Compresses a single latitude/longitude slice into the store
+
+        Args:
+            variable: name of the variable
+            time: time of the slice
+            level: level of the slice (in hPa)
+            data: 2D latitude/longitude array
+            latitude: latitude coordinates of the slice
+            longitude: longitude coordinates of the slice
+        """
+        if self._latitude is None:
+            self._latitude = np.asarray(latitude)
+            self._longitude = np.asarray(longitude)
+        elif data.shape != self.shape:
+            raise ValueError(f"Tile of shape {data.shape} does not match store shape {self.shape}")
+
+        key = self._key(variable, time, level)
+        self._keys.add(key)
+        self._tiles[key] = fourier_encode(data, self._quantile)
+        self._levels.setdefault(variable, set()).add(key[2])
+        self._cache.pop(key, None)
+
+    def tile(self, variable: str, time, level: int) -> np.ndarray:
+        """
+        Decodes a single latitude/longitude tile, using the cache if the tile was recently decoded
+        """
+        key = self._key(variable, time, level)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        if key not in self._keys:
+            raise KeyError(f"No tile for {key} in spectral store")
+        if key not in self._tiles:
+            self._tiles[key] = self._read_tile(key)
+
+        tile = fourier_decode(*self._tiles[key], self.shape).astype("float32")
+
+        self._cache[key] = tile
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return tile
+
+    def levels(self, variable: str) -> np.ndarray:
+        return np.array(sorted(self._levels[variable]))
+
+    def variable(self, variable: str) -> "SpectralVariable":
+        return SpectralVariable(self, AtmosphericVariable[variable])
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self._latitude), len(self._longitude)
+
+    @property
+    def latitude(self) -> np.ndarray:
+        return self._latitude
+
+    @property
+    def longitude(self) -> np.ndarray:
+        return self._longitude
+
+    @property
+    def attrs(self) -> dict:
+        return self._attrs
+
+    @property
+    def nbytes(self) -> int:
+        return sum(real.nbytes + imag.nbytes + sum(idx.nbytes for idx in idxs)
+                   for real, imag, idxs in map(self._get_encoded_tile, self._keys))
+
+    @staticmethod
+    def _archive_name(key: tuple[str, str, int], part: str) -> str:
+        return "/".join(map(str, key)) + "/" + part
+
+    def _get_encoded_tile(self, key: tuple[str, str, int]) -> _TILE:
+        return self._tiles[key] if key in self._tiles else self._read_tile(key)
+
+    def _read_tile(self, key: tuple[str, str, int]) -> _TILE:
+        real = self._archive[self._archive_name(key, "real")]
+        imag = self._archive[self._archive_name(key, "imag")]
+        idxs = tuple(self._archive[self._archive_name(key, f"idx{i}")] for i in range(2))
+        return real, imag, idxs
+
+    def save(self, path: str) -> None:
+        """
+        Saves the store as a .npz archive
+        """
+        arrays = {}
+        for key in self._keys:
+            real, imag, idxs = self._get_encoded_tile(key)
+            arrays[self._archive_name(key, "real")] = real
+            arrays[self._archive_name(key, "imag")] = imag
+            for i, idx in enumerate(idxs):
+                arrays[self._archive_name(key, f"idx{i}")] = idx
+
+        header = {"quantile": self._quantile, "attrs": self._attrs, "tiles": sorted(self._keys)}
+
+        np.savez(path, header=json.dumps(header, default=lambda obj: obj.item()), latitude=self._latitude,
+                 longitude=self._longitude, **arrays)
+
+    @staticmethod
+    def load(path: str, cache_size: int = 64) -> "SpectralStore":
+        """
+        Opens a store saved with save(). Tiles are only read from disk when they are first decoded.
+        """
+        archive = np.load(path)
+        header = json.loads(str(archive["header"]))
+
+        store = SpectralStore(header["quantile"], cache_size)
+        store._archive = archive
+        store._attrs = header["attrs"]
+        for variable, time, level in header["tiles"]:
+            store._keys.add((variable, time, level))
+            store._levels.setdefault(variable, set()).add(level)
+        store._latitude = archive["latitude"]
+        store._longitude = archive["longitude"]
+        return store
+
+
+class SpectralVariable(AtmosphericVariable4D):
+    """
+    A read-only variable served from the tiles of a SpectralStore instead of the ERA5 files
+    """
+
+    # noinspection PyMissingConstructor
+    def __init__(self, store: SpectralStore, variable: AtmosphericVariable):
+        # AtmosphericVariable.__init__() is deliberately not called so that the wrapped variable keeps its instance
+        self._store = store
+        self._variable = variable
+
+        self.name = variable.name
+        self.title = variable.title
+        self.unit = variable.unit
+        self.cmap = variable.cmap
+        self._diverging = variable._diverging
+
+    def __getitem__(self, item) -> xr.Dataset:
+        time, level, latitude, longitude = self.get_full_index(item)
+
+        if time is None:
+            time = slice("TAVG-01-01 00:00", "TAVG-12-31 23:00")
+
+        if isinstance(time, slice):
+            dts = datetime_range(time.start, time.stop, time.step if time.step else timedelta(hours=1))
+            return xr.concat([self[dt, level, latitude, longitude] for dt in dts], "time")
+
+        levels = self._store.levels(self.name)
+        if level is not None:
+            levels = xr.DataArray(levels, coords={"level": levels}).sel(level=level).values.reshape(-1)
+
+        data = np.stack([self._store.tile(self.name, time, lev) for lev in levels])
+
+        ds = xr.Dataset({self.name: (("level", "latitude", "longitude"), data)},
+                        coords={"time": np.datetime64(parse_datetime(time)), "level": levels,
+                                "latitude": self._store.latitude, "longitude": self._store.longitude},
+                        attrs=self._store.attrs)
+
+        if level is not None and not isinstance(level, slice):
+            ds = ds.sel(level=level)
+        return select_slice(ds, latitude=latitude, longitude=longitude)
+
+    @property
+    def store(self) -> SpectralStore:
+        return self._store
+
+
+__all__ = ["SpectralStore", "SpectralVariable"]
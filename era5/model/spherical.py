@@ -0,0 +1,83 @@
+import numpy as np
+
+import era5
+from era5.util.encoding import *
+from era5.maths.spherical_harmonics import *
+from .abstract import *
+
+
+class SphericalHarmonicRegression(CompressionModel):
+    """
+    Compresses a latitude/longitude slice by only keeping its largest spherical harmonic coefficients.
+
+    Unlike FourierRegression, the basis functions are defined on the sphere itself, so no coefficients are spent on
+    the converging polar rows of the latitude/longitude grid or on the discontinuity between the poles.
+    """
+
+    def __init__(self, variable: era5.AtmosphericVariable, indices: list, quantile: float = 0.75,
+                 lmax: int | None = None, grid: str = "regular"):
+        """
+        Args:
+            variable: the variable to compress
+            indices: the indices of the slice, which must span all latitudes & longitudes
+            quantile: the quantile of coefficient amplitudes below which coefficients are discarded
+            lmax: the maximum degree (truncation) of the transform, defaults to the highest degree the grid resolves
+            grid: 'regular' or 'gaussian' latitudes
+        """
+        super().__init__(variable, indices, quantile)
+
+        self._latitudes = self._dset["latitude"].values
+        self._lmax = (len(self._latitudes) - 1) // 2 if lmax is None else lmax
+        self._mmax = min(self._lmax, self._data.shape[-1] // 2)
+        self._grid = grid
+
+        self._sht_idxs = None
+        self._sht_real = None
+        self._sht_imag = None
+
+    def fft(self):
+        coefficients = spherical_harmonic_analysis(self._data, self._latitudes, self._lmax, self._grid)
+
+        amplitudes = np.abs(coefficients)
+
+        cutoff_amp = np.quantile(amplitudes, self._quantile)
+        mask = amplitudes > cutoff_amp
+
+        *idxs, packed = np.argwhere(mask).T
+        degree, order = legendre_index(self._lmax, self._mmax)
+
+        coefficients = coefficients[mask]
+
+        self._sht_real = encode_zlib(coefficients.real.astype("float16"))
+        self._sht_imag = encode_zlib(coefficients.imag.astype("float16"))
+        self._sht_idxs = tuple(map(encode, [*idxs, order[packed], degree[packed] - order[packed]]))
+
+    def predict(self) -> np.ndarray:
+        if self._prediction is None:
+            *idxs, order, degree_minus_order = map(decode, self._sht_idxs)
+            sht_real = decode_zlib(self._sht_real).view("float16")
+            sht_imag = decode_zlib(self._sht_imag).view("float16")
+
+            packed = legendre_offsets(self._lmax, self._mmax)[order] + degree_minus_order
+
+            coefficients = np.zeros((*self._data.shape[:-2], len(legendre_index(self._lmax, self._mmax)[0])),
+                                    dtype="complex64")
+            coefficients[*idxs, packed] = sht_real + 1j * sht_imag.astype("float32")
+
+            self._prediction = spherical_harmonic_synthesis(coefficients, self._latitudes, self._data.shape[-1],
+                                                            self._lmax)
+
+        return self._prediction
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._sht_idxs = None
+        self._sht_real = None
+        self._sht_imag = None
+
+    @property
+    def nbytes(self) -> int:
+        return self._sht_real.nbytes + self._sht_imag.nbytes + sum(ar.nbytes for ar in self._sht_idxs)
+
+
+__all__ = ["SphericalHarmonicRegression"]
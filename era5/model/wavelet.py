@@ -0,0 +1,104 @@
+import numpy as np
+
+import era5
+from era5.util.encoding import *
+from era5.maths.wavelets import *
+from .abstract import *
+
+
+class WaveletRegression(CompressionModel):
+    """
+    Compresses a latitude/longitude slice by only keeping its largest 2D wavelet coefficients.
+
+    Wavelets are localised, so sharp features such as fronts and jet cores need far fewer coefficients than with global
+    Fourier modes. The encoded bands are ordered from coarse to fine, so a reader can stop early and decode a
+    low-resolution preview with predict(depth).
+    """
+
+    def __init__(self, variable: era5.AtmosphericVariable, indices: list, quantile: float = 0.75,
+                 levels: int | None = None, wavelet: str = "cdf97"):
+        """
+        Args:
+            variable: the variable to compress
+            indices: the indices of the slice, the last two dimensions of which are transformed
+            quantile: the quantile of detail coefficient amplitudes below which coefficients are discarded
+            levels: the number of decomposition levels, defaults to coarsening the grid to about 8 points
+            wavelet: 'haar' or 'cdf97'
+        """
+        super().__init__(variable, indices, quantile)
+
+        if levels is None:
+            levels = max(1, int(np.log2(min(self._data.shape[-2:]) / 8)))
+
+        self._levels = levels
+        self._wavelet = wavelet
+
+        self._bands: None | list[tuple[np.ndarray, tuple[np.ndarray, ...]]] = None
+
+    def fft(self):
+        bands = wavedec2(self._data, self._levels, self._wavelet)
+        details = np.concatenate([np.abs(band).reshape(-1) for band in bands[1:]])
+        cutoff_amp = np.quantile(details, self._quantile)
+
+        # the approximation band is always kept whole, in float32 as it holds the (2 ** levels scaled) mean of the data
+        self._bands = [(encode_zlib(bands[0].astype("float32")), ())]
+
+        for i, band in enumerate(bands[1:]):
+            mask = np.abs(band) > cutoff_amp
+            values = band[mask] / self._detail_scale(i)
+            self._bands.append((encode_zlib(values.astype("float16")), tuple(map(encode, np.argwhere(mask).T))))
+
+    def _detail_scale(self, i: int) -> float:
+        """
+        The factor by which each level of 2D approximation above the i-th detail band scales it, which is removed
+        before detail bands are stored as float16 so that they don't overflow
+        """
+        return 2. ** (self._levels - 1 - i // 3)
+
+    def predict(self, depth: int | None = None) -> np.ndarray:
+        """
+        Decodes the model
+
+        Args:
+            depth: the number of detail levels to decode, defaults to all of them. Smaller depths only read the start
+                   of the encoded stream and return a preview at a coarser resolution.
+        """
+        if depth is None or depth >= self._levels:
+            if self._prediction is None:
+                self._prediction = self._decode(self._levels)
+            return self._prediction
+
+        return self._decode(depth)
+
+    def _decode(self, depth: int) -> np.ndarray:
+        shapes = band_shapes(self._data.shape, self._levels)[:1 + 3 * depth]
+        bands = [decode_zlib(self._bands[0][0]).view("float32").reshape(shapes[0])]
+
+        for i, ((values, idxs), shape) in enumerate(zip(self._bands[1:], shapes[1:])):
+            band = np.zeros(shape, dtype="float32")
+            band[*map(decode, idxs)] = decode_zlib(values).view("float16") * np.float32(self._detail_scale(i))
+            bands.append(band)
+
+        # each remaining level of 2D approximation scales the mean of the data by 2
+        return waverec2(bands, self._wavelet) / 2 ** (self._levels - depth)
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._bands = None
+
+    def nbytes_at(self, depth: int) -> int:
+        """
+        The number of bytes that must be read to decode a preview at a given depth
+        """
+        return sum(values.nbytes + sum(idx.nbytes for idx in idxs) for values, idxs in self._bands[:1 + 3 * depth])
+
+    @property
+    def nbytes(self) -> int:
+        return self.nbytes_at(self._levels)
+
+    @property
+    def levels(self) -> int:
+        return self._levels
+
+
+__all__ = ["WaveletRegression"]
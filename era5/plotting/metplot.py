@@ -45,10 +45,10 @@ class MetPlot:
         self._indices = indices.copy()
 
         if isinstance(variable, tuple):
-            self._dset = xr.Dataset({var.name: (dset := var[*indices])[var.name] for var in variable})
+            self._dset = xr.Dataset({var.name: (dset := self._read(var))[var.name] for var in variable})
             self._dset.attrs = dset.attrs
         else:
-            self._dset = variable[*indices]
+            self._dset = self._read(variable)
 
         self._data = self._dset.to_dataarray().values
         self._data = self._reshape_data(self._data)
@@ -62,6 +62,9 @@ class MetPlot:
         self.save = plt.savefig
         self._plotted = False
 
+    def _read(self, variable: AtmosphericVariable) -> xr.Dataset:
+        return variable[*self._indices]
+
     def _get_title(self) -> str:
         if isinstance(self._variable, tuple):
             title = ", ".join(var.title for var in self._variable)
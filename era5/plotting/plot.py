@@ -8,6 +8,8 @@ from .lev2D import _LonLev2D, _LatLev2D
 from .time2D import _TimeLon2D, _TimeLat2D
 from .latlon import _MapContour
 from .plot1D import _Lon1D
+from .section import _PathLev2D
+from era5.maths.section import GreatCirclePath
 
 
 def plot(variable: AtmosphericVariable | tuple[AtmosphericVariable, ...], indices: list,
@@ -41,4 +43,21 @@ def plot(variable: AtmosphericVariable | tuple[AtmosphericVariable, ...], indice
     return graph(variable, indices, transform, **kwargs)
 
 
-__all__ = ["plot", "MetFigure"]
+def plot_section(variable: AtmosphericVariable | tuple[AtmosphericVariable, ...], time, latitude, longitude,
+                 spacing: float = 50, method: str = "linear", transform=lambda data: data, **kwargs) -> MetPlot:
+    """
+    Plots a vertical cross-section of a variable along the great circles between waypoints (e.g. a flight route)
+
+    Args:
+        variable: the variable(s) to plot
+        time: time index
+        latitude: the latitudes of the waypoints (in degrees)
+        longitude: the longitudes of the waypoints (in degrees)
+        spacing: the maximum distance between the sampled points (in kilometers)
+        method: the horizontal interpolation method, see GridInterpolator
+    """
+    path = latitude if isinstance(latitude, GreatCirclePath) else GreatCirclePath(latitude, longitude, spacing)
+    return _PathLev2D(variable, [time], path, method, transform=transform, **kwargs)
+
+
+__all__ = ["plot", "plot_section", "MetFigure"]
@@ -0,0 +1,33 @@
+import cartopy.crs as projections
+
+from era5.maths.section import GreatCirclePath
+from era5.variables.text import format_time, format_latitude, format_longitude
+from .lev2D import _Lev2D
+
+
+class _PathLev2D(_Lev2D):
+    _xunit = "km"
+
+    def __init__(self, variable, indices: list, path: GreatCirclePath, method: str = "linear", **kwargs):
+        self._path = path
+        self._method = method
+        self._axes_lims = (0, float(path.distance[-1])), (1000, 150)
+        super().__init__(variable, indices, **kwargs)
+
+    def _read(self, variable):
+        time = variable.get_full_index(self._indices)[0]
+        ds = variable[time]
+        return ds.map(lambda data: self._path(data, self._method)).assign_attrs(ds.attrs)
+
+    def _get_title_slice_substring(self) -> str:
+        (lat1, lon1), (lat2, lon2) = self._path.waypoints[[0, -1]]
+        return (f" from {format_latitude(lat1)} {format_longitude(lon1)}"
+                f" to {format_latitude(lat2)} {format_longitude(lon2)}"
+                f" {format_time(self._dset['time'].values, self._dset.attrs['is_tavg'])}")
+
+    def _reshape_data(self, data):
+        return super()._reshape_data(data)[::-1]
+
+    def _plot_map_slice(self, ax, **kwargs) -> None:
+        ax.plot(self._path.longitude, self._path.latitude, transform=projections.Geodetic(),
+                **(kwargs | {"linewidth": 0.4}))
@@ -43,40 +43,54 @@ def datetime_func(*args: str):
 
 
 class DateTime(datetime):
-    def __new__(cls, month: int, day: int, hour: int, year: int | str = "tavg"):
-        return datetime.__new__(cls, year=1980 if year == "tavg" else year, month=month, day=day, hour=hour)
+    def __new__(cls, month: int, day: int, hour: int, year: int | str = "tavg", minute: int = 0):
+        return datetime.__new__(cls, year=1980 if year == "tavg" else year, month=month, day=day, hour=hour,
+                                minute=minute)
 
-    def __init__(self, month: int, day: int, hour: int, year: int | str = "tavg"):
+    def __init__(self, month: int, day: int, hour: int, year: int | str = "tavg", minute: int = 0):
         self.tavg = year == "tavg"
         super().__init__()
 
     def __repr__(self) -> str:
-        return f"DateTime({'TAVG' if self.tavg else self.year}-{self.month:02}{self.day:02} {self.hour:02}:00:00)"
+        return (f"DateTime({'TAVG' if self.tavg else self.year}-{self.month:02}{self.day:02} "
+                f"{self.hour:02}:{self.minute:02}:00)")
 
     def __str__(self) -> str:
-        return f"{'TAVG' if self.tavg else self.year}-{self.month:02}-{self.day:02} {self.hour:02}:00:00"
+        return f"{'TAVG' if self.tavg else self.year}-{self.month:02}-{self.day:02} {self.hour:02}:{self.minute:02}:00"
 
     def __format__(self, format_spec) -> str:
         if format_spec == "date":
             return f"{'TAVG' if self.tavg else self.year}-{self.month:02}-{self.day:02}"
-        return f"{'tavg' if self.tavg else self.year}-{self.month:02}{self.day:02}-{self.hour:02}00"
+        return f"{'tavg' if self.tavg else self.year}-{self.month:02}{self.day:02}-{self.hour:02}{self.minute:02}"
 
     def __hash__(self):
-        return hash((self.year, self.month, self.day, self.hour))
+        return hash((self.year, self.month, self.day, self.hour, self.minute))
 
-    @datetime_func("other")
-    def __add__(self, other):
+    def _arithmetic(self, other, operator):
         tavg = self.tavg or (isinstance(other, DateTime) and other.tavg)
 
-        result = datetime(year=1981 if tavg else self.year, month=self.month, day=self.day, hour=self.hour) + other
-        return DateTime(month=result.month, day=result.day, hour=result.hour, year="tavg" if tavg else result.year)
+        result = operator(datetime(year=1981 if tavg else self.year, month=self.month, day=self.day, hour=self.hour,
+                                   minute=self.minute), other)
+        return DateTime(month=result.month, day=result.day, hour=result.hour, year="tavg" if tavg else result.year,
+                        minute=result.minute)
+
+    @datetime_func("other")
+    def __add__(self, other):
+        return self._arithmetic(other, lambda a, b: a + b)
 
     @datetime_func("other")
     def __sub__(self, other):
-        tavg = self.tavg or (isinstance(other, DateTime) and other.tavg)
+        return self._arithmetic(other, lambda a, b: a - b)
 
-        result = datetime(year=1981 if tavg else self.year, month=self.month, day=self.day, hour=self.hour) - other
-        return DateTime(month=result.month, day=result.day, hour=result.hour, year="tavg" if tavg else result.year)
+    @property
+    def on_the_hour(self) -> bool:
+        return self.minute == 0 and self.second == 0
+
+    def floor_hour(self) -> "DateTime":
+        """
+        The datetime rounded down to the hour
+        """
+        return DateTime(self.month, self.day, self.hour, "tavg" if self.tavg else self.year)
 
 
 def date_to_dayofyear(day: int, month: int) -> int:
@@ -102,6 +116,13 @@ def dayofyear_to_date(i: int) -> tuple[int, int]:
     return i + 1, month + 1
 
 
+def hour_of_year(dt: datetime) -> int:
+    """
+    Converts a datetime to the hour of a 365-day year (starting at 0)
+    """
+    return 24 * (sum(MONTH_DAYS[:dt.month - 1]) + dt.day - 1) + dt.hour
+
+
 def date_as_number(day: int, month: int, year: int) -> int:
     """
     Returns a date as a number in the format 'YYYYMMDD'
@@ -121,7 +142,7 @@ def parse_datetime(dt: DATETIME_TYPE) -> None | DateTime | timedelta:
         dt = datetime.utcfromtimestamp(dt)
 
     if isinstance(dt, datetime):
-        return DateTime(month=dt.month, day=dt.day, hour=dt.hour, year=dt.year)
+        return DateTime(month=dt.month, day=dt.day, hour=dt.hour, year=dt.year, minute=dt.minute)
 
     if not isinstance(dt, str):
         raise ValueError(f"Unknown date format '{dt}'")
@@ -142,7 +163,7 @@ def parse_datetime(dt: DATETIME_TYPE) -> None | DateTime | timedelta:
     else:
         raise ValueError(f"Unknown date format '{dt}'")
 
-    return DateTime(dt.month, dt.day, dt.hour, "tavg" if is_tavg else dt.year)
+    return DateTime(dt.month, dt.day, dt.hour, "tavg" if is_tavg else dt.year, dt.minute)
 
 
 @datetime_func("start", "end")
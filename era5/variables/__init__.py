@@ -1,5 +1,7 @@
 from .abstract import *
 from .coordinates import *
+from .altitude import *
 
 from .wind import *
 from .barometric import *
+from .turbulence import *
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Type, Hashable, Final
+from typing import Type, Hashable, Final, Generator
 
 import numpy as np
 import xarray as xr
@@ -10,7 +10,10 @@ from tqdm import tqdm
 import cmasher as cmr
 from matplotlib.colors import LinearSegmentedColormap, Colormap
 
-from era5.util.datetime import datetime_range, timedelta
+from datetime import datetime
+
+from era5.util.datetime import datetime_range, timedelta, DateTime, parse_datetime
+from era5.maths.interpolation import INTERPOLATION_WEIGHTS
 
 
 class _AtmosphericVariableMetaclass(type):
@@ -91,10 +94,106 @@ class AtmosphericVariable(metaclass=_AtmosphericVariableMetaclass):
         raise NotImplementedError()
 
 
+def _index_key(index) -> Hashable:
+    """
+    A hashable key of an index of a variable
+    """
+    if isinstance(index, slice):
+        return "slice", _index_key(index.start), _index_key(index.stop), str(index.step)
+    if isinstance(index, (list, tuple, np.ndarray)):
+        return tuple(np.asarray(index).tolist())
+    if isinstance(index, (str, datetime)):
+        return str(parse_datetime(index))
+    return index
+
+
 # time, level, latitude, longitude
 class AtmosphericVariable4D(AtmosphericVariable):
+    # Derived variables that need the whole of some dimensions (e.g. integrals over pressure, horizontal derivatives)
+    # read those dimensions in full and are post-processed, then the index of those dimensions is selected
+    _full_dims: tuple[str, ...] = ()
+
+    # Derived variables whose _getitem_post() is vectorised over time are post-processed once for a whole time slice,
+    # rather than once per timestep
+    _batch_time: bool = False
+
+    # Times between the stored (hourly) timesteps are interpolated from the surrounding timesteps, the most recently
+    # read of which are cached
+    _time_method: str = "linear"
+    _time_tension: float = 0
+    _time_bias: float = 0
+    _time_cache_size: int = 8
+
+    def set_time_interpolation(self, method: str = "linear", tension: float = 0,
+                               bias: float = 0) -> AtmosphericVariable4D:
+        """
+        Sets how times between the stored timesteps (e.g. "TAVG-01-01 00:30") are interpolated
+
+        Args:
+            method: 'nearest', 'linear', 'cosine', 'cubic', 'catmull_rom' or 'hermite'
+            tension: the tension of the hermite method
+            bias: the bias of the hermite method
+
+        Returns:
+            the variable itself
+        """
+        if method not in INTERPOLATION_WEIGHTS:
+            raise ValueError(f"Unknown interpolation method '{method}'")
+
+        self._time_method = method
+        self._time_tension = tension
+        self._time_bias = bias
+        return self
+
+    def _time_weights(self, t: float) -> np.ndarray:
+        """
+        The weights of the timesteps 1 hour before, on, 1 hour after & 2 hours after the hour preceding a time
+        """
+        if self._time_method == "hermite":
+            return INTERPOLATION_WEIGHTS["hermite"](np.array(t), self._time_tension, self._time_bias)
+        return INTERPOLATION_WEIGHTS[self._time_method](np.array(t))
+
+    def _read_timestep(self, time: DateTime, level, latitude, longitude) -> xr.Dataset:
+        if not hasattr(self, "_time_cache"):
+            self._time_cache: dict[tuple, xr.Dataset] = {}
+
+        key = (str(time), _index_key(level), _index_key(latitude), _index_key(longitude))
+        if key not in self._time_cache:
+            if len(self._time_cache) >= self._time_cache_size:
+                del self._time_cache[next(iter(self._time_cache))]
+            self._time_cache[key] = self[time, level, latitude, longitude]
+        return self._time_cache[key]
+
+    def _interpolate_time(self, time: DateTime, level, latitude, longitude) -> xr.Dataset:
+        """
+        Blends the stored timesteps around a time that falls between them
+        """
+        hour = time.floor_hour()
+        weights = self._time_weights(time.minute / 60)
+
+        blended = None
+        for offset, weight in zip(range(-1, 3), weights.tolist()):
+            if weight == 0:
+                continue
+
+            ds = self._read_timestep(hour + timedelta(hours=offset), level, latitude, longitude)
+            term = ds.drop_vars("time", errors="ignore") * np.float32(weight)
+            blended = term if blended is None else blended + term
+
+        return blended.assign_coords(time=np.datetime64(time.strftime("%Y-%m-%dT%H:%M"))).assign_attrs(ds.attrs)
+
     def __getitem__(self, item) -> xr.Dataset:
         time, level, latitude, longitude = self.get_full_index(item)
+        if isinstance(level, Altitude):
+            return level.select(self, time, latitude, longitude)
+
+        if time is not None and not isinstance(time, slice):
+            time = parse_datetime(time)
+            if not time.on_the_hour:
+                return self._interpolate_time(time, level, latitude, longitude)
+
+        index = {"level": level, "latitude": latitude, "longitude": longitude}
+        read = {dim: None if dim in self._full_dims else value for dim, value in index.items()}
 
         # If the time index is a slice, extract data from each time in slice and concatenate result
         if isinstance(time, slice):
@@ -103,26 +202,22 @@ class AtmosphericVariable4D(AtmosphericVariable):
             dsets = []
 
             # TODO restructure some of this code
-            dts = datetime_range(time.start, time.stop, time.step if time.step else timedelta(hours=1))
+            dts = list(datetime_range(time.start, time.stop, time.step if time.step else timedelta(hours=1)))
+            if not all(dt.on_the_hour for dt in dts):
+                return xr.concat([self[dt, level, latitude, longitude] for dt in dts], "time")
+
             for dt in dts:
                 dsets.append(open_variable(self._requires, dt))
 
             def read_file_thread(i):
                 dset = dsets[i]
-                dset = select_slice(dset, level, latitude, longitude)
+                dset = select_slice(dset, **read)
                 dset = uncompress_dataset(dset)
 
-                val = self._getitem_post(dset)
-
-                if isinstance(val, xr.Dataset):
-                    data[i] = val
-                    return
-                elif isinstance(val, xr.DataArray):
-                    val = {self.name: val}
-                elif not isinstance(val, dict):
-                    val = {self.name: (ds.dims, val)}
-
-                data[i] = xr.Dataset(val, coords=dset.coords, attrs=dset.attrs)
+                if self._batch_time:
+                    data[i] = dset
+                else:
+                    data[i] = self._post(dset, index)
 
             for ds in range(len(dsets)):
                 thread = threading.Thread(target=read_file_thread, args=(ds,))
@@ -132,29 +227,58 @@ class AtmosphericVariable4D(AtmosphericVariable):
             for thread in tqdm(threads):
                 thread.join()
 
-            return xr.concat([data[i] for i in range(len(dsets))], "time")
+            ds = xr.concat([data[i] for i in range(len(dsets))], "time")
+            if self._batch_time:
+                return self._post(ds, index)
+            return ds
 
         if time is None:
             return self["TAVG-01-01 00:00":"TAVG-12-31 23:00", level, latitude, longitude]
 
         ds = open_variable(self._requires, time)
-        ds = select_slice(ds, level, latitude, longitude)
+        ds = select_slice(ds, **read)
         ds = uncompress_dataset(ds)
 
+        return self._post(ds, index)
+
+    def _post(self, ds: xr.Dataset, index: dict) -> xr.Dataset:
         vals = self._getitem_post(ds)
 
-        if isinstance(vals, xr.Dataset):
-            return vals
-        elif isinstance(vals, xr.DataArray):
+        if isinstance(vals, xr.DataArray):
             vals = {self.name: vals}
-        elif not isinstance(vals, dict):
+        elif not isinstance(vals, (xr.Dataset, dict)):
             vals = {self.name: (ds.dims, vals)}
 
-        return xr.Dataset(vals, coords=ds.coords, attrs=ds.attrs)
+        if not isinstance(vals, xr.Dataset):
+            vals = xr.Dataset(vals, coords=ds.coords, attrs=ds.attrs)
+
+        if self._full_dims:
+            vals = select_slice(vals, **{dim: index[dim] for dim in self._full_dims})
+        return vals
 
     def _getitem_post(self, ds: xr.Dataset) -> np.ndarray | xr.DataArray | xr.Dataset:
         return ds
 
+    def stream(self, time: slice | None = None, level=None, latitude=None,
+               longitude=None) -> Generator[tuple[DateTime, np.ndarray], None, None]:
+        """
+        Reads the variable one timestep at a time, so that only a single timestep is held in memory
+
+        Args:
+            time: slice of times to read (defaults to the whole TAVG year)
+            level: level index passed to __getitem__()
+            latitude: latitude index passed to __getitem__()
+            longitude: longitude index passed to __getitem__()
+
+        Yields:
+            the datetime and data of each timestep
+        """
+        if time is None:
+            time = slice("TAVG-01-01 00:00", "TAVG-12-31 23:00")
+
+        for dt in datetime_range(time.start, time.stop, time.step if time.step else timedelta(hours=1)):
+            yield dt, self[dt, level, latitude, longitude][self.name].values
+
     @staticmethod
     def get_full_index(item):
         level = None
@@ -190,6 +314,7 @@ class AtmosphericVariable2D(AtmosphericVariable):
 
 from era5.dataset import uncompress_dataset, select_slice
 from era5.io import open_variable
+from .altitude import Altitude
 
 
 __all__ = ["AtmosphericVariable", "AtmosphericVariable4D", "AtmosphericVariable3D", "AtmosphericVariable2D"]
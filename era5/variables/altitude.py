@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+import xarray as xr
+
+from era5.maths.barometric import height_bracket, height_from_pressure, isa_pressure
+from era5.maths.constants import FEET
+from era5.util.datetime import parse_datetime
+from .abstract import AtmosphericVariable, _index_key
+
+
+# the brackets of the most recently used (altitude, time, latitude, longitude) indices, with hypsometric heights
+_HYPSOMETRIC_BRACKETS: dict[tuple, tuple[xr.DataArray, xr.DataArray, xr.DataArray]] = {}
+_MAX_CACHED_BRACKETS = 16
+
+
+@lru_cache(maxsize=64)
+def _isa_bracket(levels: tuple[float, ...], altitude: float) -> tuple[int, int, float]:
+    lower, upper, _ = height_bracket(height_from_pressure(np.array(levels) * 100), altitude)
+
+    # ISA heights are not linear in log-pressure across the tropopause, so the weight is found in log-pressure
+    log_levels = np.log(levels)
+    weight = (np.log(isa_pressure(altitude) / 100) - log_levels[lower]) / (log_levels[upper] - log_levels[lower])
+    return int(lower), int(upper), float(np.clip(weight, 0, 1))
+
+
+class Altitude:
+    """
+    An altitude index for 4D variables, in place of a pressure level.
+
+    Each column is interpolated in log-pressure between the two levels bracketing the altitude. The heights of the
+    levels are either their ISA heights, which bracket the same two levels everywhere, or their hypsometric heights
+    (see GeopotentialHeight), which follow the temperature of each column. The brackets & weights are cached, so maps
+    at an altitude only read the bracketing levels and blend them.
+
+    Examples:
+        .. code-block:: python
+
+            era5.UWind()["TAVG-01-01 00:00", FlightLevel(350)]
+            era5.Temperature()["TAVG-01-01 00:00", Altitude(10000, heights="hypsometric"), 51.5, -0.5]
+            era5.VWind()["TAVG-01-01 05:30", FlightLevel(350)]  # interpolated between 05:00 & 06:00
+    """
+
+    def __init__(self, meters: float, heights: str = "isa"):
+        """
+        Args:
+            meters: the altitude (in meters)
+            heights: the heights of the pressure levels, 'isa' or 'hypsometric'
+        """
+        if heights not in ("isa", "hypsometric"):
+            raise ValueError(f"Unknown heights '{heights}', expected 'isa' or 'hypsometric'")
+
+        self._meters = float(meters)
+        self._heights = heights
+
+    def __repr__(self) -> str:
+        return f"Altitude({self._meters:g} m, {self._heights})"
+
+    def _levels(self, variable: AtmosphericVariable, time) -> np.ndarray:
+        if isinstance(time, slice):
+            time = time.start
+        if time is None:
+            time = "TAVG-01-01 00:00"
+
+        # the levels don't depend on the time, so times between the stored timesteps read the preceding one
+        return open_variable(variable._requires, parse_datetime(time).floor_hour())["level"].values.astype("float64")
+
+    def _bracket(self, variable: AtmosphericVariable, time, latitude, longitude):
+        """
+        The indices of the lower & upper levels (into the level coordinate of the variable), and the weight of the
+        upper level, of each column
+        """
+        if self._heights == "isa":
+            lower, upper, weight = _isa_bracket(tuple(self._levels(variable, time).tolist()), self._meters)
+            return xr.DataArray(lower), xr.DataArray(upper), xr.DataArray(weight)
+
+        key = (self._meters, _index_key(time), _index_key(latitude), _index_key(longitude))
+        if key not in _HYPSOMETRIC_BRACKETS:
+            heights = AtmosphericVariable["geopotential_height"]()[time, None, latitude, longitude]
+            heights = heights["geopotential_height"]
+
+            lower, upper, weight = height_bracket(heights.values, self._meters, axis=heights.dims.index("level"))
+            dims = [dim for dim in heights.dims if dim != "level"]
+            coords = heights.isel(level=0, drop=True).coords
+
+            if len(_HYPSOMETRIC_BRACKETS) >= _MAX_CACHED_BRACKETS:
+                del _HYPSOMETRIC_BRACKETS[next(iter(_HYPSOMETRIC_BRACKETS))]
+            _HYPSOMETRIC_BRACKETS[key] = tuple(xr.DataArray(x, dims=dims, coords=coords)
+                                               for x in (lower, upper, weight))
+
+        return _HYPSOMETRIC_BRACKETS[key]
+
+    def select(self, variable: AtmosphericVariable, time, latitude, longitude) -> xr.Dataset:
+        """
+        Reads a variable at the altitude, reading only the levels that bracket it
+        """
+        levels = self._levels(variable, time)
+        lower, upper, weight = self._bracket(variable, time, latitude, longitude)
+        weight = weight.astype(variable.dtype)
+
+        # read the bracketing levels, and map their indices onto the levels that were read
+        needed = np.union1d(np.unique(lower.values), np.unique(upper.values))
+        subset = np.zeros(len(levels), dtype=int)
+        subset[needed] = np.arange(len(needed))
+
+        ds = variable[time, levels[needed].tolist(), latitude, longitude]
+        lower = lower.copy(data=subset[lower.values])
+        upper = upper.copy(data=subset[upper.values])
+
+        blended = (1 - weight) * ds.isel(level=lower) + weight * ds.isel(level=upper)
+        blended = blended.drop_vars("level", errors="ignore").assign_coords(altitude=self._meters)
+        if self._heights == "isa":
+            blended = blended.assign_coords(level=float(isa_pressure(self._meters)) / 100)
+        return blended.assign_attrs(ds.attrs)
+
+    @property
+    def meters(self) -> float:
+        return self._meters
+
+    @property
+    def heights(self) -> str:
+        return self._heights
+
+
+class FlightLevel(Altitude):
+    """
+    A flight level (the altitude in hundreds of feet) index for 4D variables, see Altitude
+    """
+
+    def __init__(self, flight_level: float, heights: str = "isa"):
+        super().__init__(flight_level * 100 * FEET, heights)
+        self._flight_level = flight_level
+
+    def __repr__(self) -> str:
+        return f"FL{self._flight_level:g}"
+
+
+FL = FlightLevel
+
+
+from era5.io import open_variable
+
+
+__all__ = ["Altitude", "FlightLevel", "FL"]
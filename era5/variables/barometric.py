@@ -1,3 +1,7 @@
+import numpy as np
+import xarray as xr
+
+from era5.maths.barometric import hypsometric_height, pressure_at_height
 from .abstract import AtmosphericVariable4D
 
 
@@ -40,4 +44,44 @@ class VerticalVelocity(AtmosphericVariable4D, name="vertical_velocity", unit="Pa
         return super().get_vlims(indices)
 
 
-__all__ = ["Temperature", "VerticalVelocity"]
+class GeopotentialHeight(AtmosphericVariable4D, name="geopotential_height", unit="m", requires=["temperature"]):
+    """
+    The height of each pressure level, from integrating the hypsometric equation up each column of temperature.
+    The highest pressure level is placed at its ISA height.
+    """
+    _full_dims = ("level",)
+    _batch_time = True
+
+    def _getitem_post(self, ds):
+        temperature = ds["temperature"]
+        if "level" not in temperature.dims:
+            raise ValueError("Geopotential height needs every level of the column")
+
+        heights = hypsometric_height(temperature.values, temperature["level"].values.astype("float64") * 100,
+                                     axis=temperature.dims.index("level"))
+        return xr.DataArray(heights, coords=temperature.coords, dims=temperature.dims)
+
+    def pressure_at_height(self, time, altitude: float, latitude=None, longitude=None) -> xr.DataArray:
+        """
+        Finds the pressure at an altitude in each column, interpolating in log-pressure between levels
+
+        Args:
+            time: time index
+            altitude: the altitude (in meters)
+            latitude: latitude index (defaults to all latitudes)
+            longitude: longitude index (defaults to all longitudes)
+
+        Returns:
+            the pressure (in hPa) of each column
+        """
+        heights = self[time, None, latitude, longitude][self.name]
+        pressure = pressure_at_height(heights.values, heights["level"].values.astype("float64"), altitude,
+                                      axis=heights.dims.index("level"))
+        return xr.DataArray(pressure, coords=heights.isel(level=0, drop=True).coords,
+                            dims=[dim for dim in heights.dims if dim != "level"])
+
+    def get_vlims(self, indices):
+        return np.percentile(self.slice(indices), [1, 99])
+
+
+__all__ = ["Temperature", "VerticalVelocity", "GeopotentialHeight"]
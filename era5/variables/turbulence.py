@@ -0,0 +1,94 @@
+import numpy as np
+import xarray as xr
+
+from era5.maths.barometric import hypsometric_height
+from era5.maths.turbulence import ellrod_index, richardson_number, vertical_wind_shear
+from .abstract import AtmosphericVariable4D
+from .wind import _WindDerivative
+
+
+def _column(ds: xr.Dataset, title: str, dims: tuple[str, ...] | None = None):
+    """
+    The wind, temperature, pressure (in Pascals) & hypsometric heights of whole columns, and the index of their level
+    axis
+    """
+    u = ds["u_component_of_wind"]
+    if "level" not in u.dims:
+        raise ValueError(f"{title} needs every level of the column")
+
+    dims = u.dims if dims is None else dims
+    u, v, temperature = (ds[name].transpose(*dims).values
+                         for name in ("u_component_of_wind", "v_component_of_wind", "temperature"))
+
+    axis = dims.index("level")
+    pressure = ds["level"].values.astype("float64") * 100
+    return u, v, temperature, pressure, hypsometric_height(temperature, pressure, axis=axis), axis
+
+
+class _ColumnDiagnostic(AtmosphericVariable4D):
+    """
+    A diagnostic of the vertical derivatives of a column, computed from the differences between adjacent levels in
+    geometric (hypsometric) height. Whole columns are read, and a time slice is differentiated in a single pass.
+    """
+    _full_dims = ("level",)
+    _batch_time = True
+
+    def _diagnostic(self, u: np.ndarray, v: np.ndarray, temperature: np.ndarray, pressure: np.ndarray,
+                    heights: np.ndarray, axis: int) -> np.ndarray:
+        raise NotImplementedError()
+
+    def _getitem_post(self, ds):
+        u = ds["u_component_of_wind"]
+        values = self._diagnostic(*_column(ds, self.title))
+        return xr.DataArray(values.astype(self.dtype), coords=u.coords, dims=u.dims)
+
+    def get_vlims(self, indices):
+        return np.nanpercentile(self.slice(indices), [1, 99])
+
+
+class VerticalWindShear(_ColumnDiagnostic, name="vertical_wind_shear", unit="s⁻¹",
+                        requires=["u_component_of_wind", "v_component_of_wind", "temperature"]):
+    def _diagnostic(self, u, v, temperature, pressure, heights, axis):
+        return vertical_wind_shear(u, v, heights, axis)
+
+
+class RichardsonNumber(_ColumnDiagnostic, name="richardson_number", unit="",
+                       requires=["u_component_of_wind", "v_component_of_wind", "temperature"]):
+    """
+    The gradient Richardson number, where values below 1/4 indicate turbulence from shear instability
+    """
+
+    def _diagnostic(self, u, v, temperature, pressure, heights, axis):
+        return richardson_number(u, v, temperature, pressure, heights, axis)
+
+    def get_vlims(self, _):
+        return 0, 10
+
+
+class TurbulenceIndex(_WindDerivative, name="turbulence_index", unit="s⁻²",
+                      requires=["u_component_of_wind", "v_component_of_wind", "temperature"]):
+    """
+    The Ellrod turbulence index, the product of the vertical wind shear & the horizontal deformation (TI1), plus the
+    convergence (TI2). Whole columns & latitude/longitude grids are read.
+    """
+    _diverging = False
+    _full_dims = ("level", "latitude", "longitude")
+
+    def __init__(self, version: int = 1):
+        if version not in (1, 2):
+            raise ValueError(f"Unknown turbulence index version '{version}', expected 1 or 2")
+
+        super().__init__()
+        self._version = version
+
+    def _diagnostic(self, grid, u, v, ds, dims):
+        _, _, _, _, heights, axis = _column(ds, self.title, dims)
+        shear = vertical_wind_shear(u, v, heights, axis)
+        divergence = grid.divergence(u, v) if self._version == 2 else None
+        return ellrod_index(shear, grid.total_deformation(u, v), divergence)
+
+    def get_vlims(self, indices):
+        return 0, np.nanpercentile(self.slice(indices), 99)
+
+
+__all__ = ["VerticalWindShear", "RichardsonNumber", "TurbulenceIndex"]
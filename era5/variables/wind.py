@@ -1,6 +1,8 @@
 import numpy as np
+import xarray as xr
 
-from .abstract import AtmosphericVariable4D
+from era5.maths.kinematics import SphericalGrid, spherical_grid
+from .abstract import AtmosphericVariable, AtmosphericVariable4D
 
 
 class UWind(AtmosphericVariable4D, name="u_component_of_wind", unit="ms⁻¹", title="East Wind"):
@@ -63,13 +65,79 @@ class WindSpeed(AtmosphericVariable4D, name="wind_speed", unit="ms⁻¹",
         return np.sqrt(ds["u_component_of_wind"] ** 2 + ds["v_component_of_wind"] ** 2)
 
 
-class Divergence(AtmosphericVariable4D, name="divergence", unit="s⁻¹",
-                 requires=["u_component_of_wind", "v_component_of_wind"]):
+class _WindDerivative(AtmosphericVariable4D):
+    """
+    A diagnostic of the horizontal derivatives of the wind, computed with centred differences on the sphere.
+    Whole latitude/longitude grids are read, and a time slice is differentiated in a single pass.
+    """
+    _diverging = True
+    _full_dims = ("latitude", "longitude")
+    _batch_time = True
+
+    def _diagnostic(self, grid: SphericalGrid, u: np.ndarray, v: np.ndarray, ds: xr.Dataset,
+                    dims: tuple[str, ...]) -> np.ndarray:
+        raise NotImplementedError()
+
     def _getitem_post(self, ds):
-        dudx, _ = np.gradient(ds["u_component_of_wind"])
-        _, dvdy = np.gradient(ds["v_component_of_wind"])
+        u = ds["u_component_of_wind"]
+        if "latitude" not in u.dims or "longitude" not in u.dims:
+            raise ValueError(f"{self.title} needs the whole latitude/longitude grid")
+
+        dims = (*(dim for dim in u.dims if dim not in ("latitude", "longitude")), "latitude", "longitude")
+        u = u.transpose(*dims)
+        v = ds["v_component_of_wind"].transpose(*dims)
+
+        grid = spherical_grid(u["latitude"].values, u["longitude"].values)
+        values = self._diagnostic(grid, u.values, v.values, ds, dims)
+        return xr.DataArray(values.astype(self.dtype), coords=u.coords, dims=dims)
+
+
+class Divergence(_WindDerivative, name="divergence", unit="s⁻¹",
+                 requires=["u_component_of_wind", "v_component_of_wind"]):
+    def _diagnostic(self, grid, u, v, ds, dims):
+        return grid.divergence(u, v)
+
+
+class RelativeVorticity(_WindDerivative, name="relative_vorticity", unit="s⁻¹",
+                        requires=["u_component_of_wind", "v_component_of_wind"]):
+    def _diagnostic(self, grid, u, v, ds, dims):
+        return grid.vorticity(u, v)
+
+
+class StretchingDeformation(_WindDerivative, name="stretching_deformation", unit="s⁻¹",
+                            requires=["u_component_of_wind", "v_component_of_wind"]):
+    def _diagnostic(self, grid, u, v, ds, dims):
+        return grid.stretching_deformation(u, v)
+
+
+class ShearingDeformation(_WindDerivative, name="shearing_deformation", unit="s⁻¹",
+                          requires=["u_component_of_wind", "v_component_of_wind"]):
+    def _diagnostic(self, grid, u, v, ds, dims):
+        return grid.shearing_deformation(u, v)
+
+
+class Deformation(_WindDerivative, name="deformation", unit="s⁻¹",
+                  requires=["u_component_of_wind", "v_component_of_wind"]):
+    _diverging = False
+
+    def _diagnostic(self, grid, u, v, ds, dims):
+        return grid.total_deformation(u, v)
+
+
+class Advection(_WindDerivative, name="advection", requires=["u_component_of_wind", "v_component_of_wind"]):
+    """
+    The horizontal advection of a scalar variable by the wind, -(u ∂s/∂x + v ∂s/∂y)
+    """
+
+    def __init__(self, scalar: str = "temperature"):
+        super().__init__()
+        self._scalar = scalar
+        self._requires = ["u_component_of_wind", "v_component_of_wind", scalar]
+        self.unit = f"{AtmosphericVariable[scalar].unit} s⁻¹"
 
-        return dudx + dvdy
+    def _diagnostic(self, grid, u, v, ds, dims):
+        return grid.advection(u, v, ds[self._scalar].transpose(*dims).values)
 
 
-__all__ = ["UWind", "VWind", "WindDirection", "WindSpeed", "Divergence"]
+__all__ = ["UWind", "VWind", "WindDirection", "WindSpeed", "Divergence", "RelativeVorticity",
+           "StretchingDeformation", "ShearingDeformation", "Deformation", "Advection"]